@@ -1,39 +1,42 @@
-# __init__.py
-# This file makes the assistant directory a Python package
-
-# Import modules that are essential first
-from . import text_to_speech
-from . import voice_recognition
-from . import weather_service
-from . import alarm_clock
-
-# Try to import OpenCV-based facial recognition
-try:
-    import cv2
-    print("OpenCV imported successfully. Using full facial recognition.")
-    try:
-        from . import facial_recognition
-    except ImportError:
-        print("Facial recognition module not available. Using simplified version.")
-        from . import facial_recognition_simple as facial_recognition
-    except Exception as e:
-        print(f"Error importing facial recognition: {e}. Using simplified version.")
-        from . import facial_recognition_simple as facial_recognition
-except ImportError:
-    print("OpenCV (cv2) not found. Using simplified facial recognition.")
-    from . import facial_recognition_simple as facial_recognition
-except Exception as e:
-    print(f"Error importing OpenCV: {e}. Using simplified facial recognition.")
-    from . import facial_recognition_simple as facial_recognition
-
-# Try to import camera utilities
-try:
-    from . import camera_utils_debug
-except ImportError:
-    print("Camera utilities module not available.")
-except Exception as e:
-    print(f"Error importing camera utilities: {e}")
-
-# Import core and commands last, as they may depend on the other modules
-from . import core
-from . import commands
\ No newline at end of file
+# __init__.py
+# This file makes the assistant directory a Python package
+
+# Submodules are imported on first use rather than here, so importing one module
+# (or a bulk enrollment worker process) doesn't start text-to-speech, the camera
+# and the Windows audio APIs. `from assistant.core import Assistant` still pulls
+# in everything core needs.
+import importlib
+
+_SUBMODULES = (
+    "text_to_speech", "voice_recognition", "weather_service", "alarm_clock",
+    "camera_utils_debug", "core", "commands",
+)
+
+
+def _load_facial_recognition():
+    # Try to import OpenCV-based facial recognition
+    try:
+        import cv2
+        print("OpenCV imported successfully. Using full facial recognition.")
+        try:
+            return importlib.import_module(".facial_recognition", __name__)
+        except ImportError:
+            print("Facial recognition module not available. Using simplified version.")
+        except Exception as e:
+            print(f"Error importing facial recognition: {e}. Using simplified version.")
+    except ImportError:
+        print("OpenCV (cv2) not found. Using simplified facial recognition.")
+    except Exception as e:
+        print(f"Error importing OpenCV: {e}. Using simplified facial recognition.")
+    return importlib.import_module(".facial_recognition_simple", __name__)
+
+
+def __getattr__(name):
+    if name == "facial_recognition":
+        module = _load_facial_recognition()
+    elif name in _SUBMODULES:
+        module = importlib.import_module("." + name, __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = module
+    return module
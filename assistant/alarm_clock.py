@@ -1,231 +1,333 @@
-# alarm_clock.py
-
-import threading
-import time
-import datetime
-import json
-import os
-from assistant.text_to_speech import speak
-from assistant.weather_service import WeatherService
-
-class AlarmClock:
-    def __init__(self):
-        self.alarms = {}
-        self.alarm_threads = {}
-        self.alarm_file = "alarms.json"
-        self.weather_service = WeatherService()
-        self.load_alarms()
-        self.start_alarm_threads()
-
-    def load_alarms(self):
-        """Load saved alarms from file"""
-        if os.path.exists(self.alarm_file):
-            try:
-                with open(self.alarm_file, 'r') as f:
-                    self.alarms = json.load(f)
-                print(f"Loaded {len(self.alarms)} alarms from file")
-            except Exception as e:
-                print(f"Error loading alarms: {e}")
-                self.alarms = {}
-        else:
-            print("No alarm file found. Starting with empty alarms.")
-            self.alarms = {}
-
-    def save_alarms(self):
-        """Save alarms to file"""
-        try:
-            with open(self.alarm_file, 'w') as f:
-                json.dump(self.alarms, f)
-            print(f"Saved {len(self.alarms)} alarms to file")
-        except Exception as e:
-            print(f"Error saving alarms: {e}")
-
-    def set_alarm(self, hour, minute, days="everyday"):
-        """
-        Set an alarm for specified time and days
-        days can be: "everyday", "weekdays", "weekends", or a comma-separated list of days
-        like "monday,wednesday,friday"
-        """
-        # Validate input
-        try:
-            hour = int(hour)
-            minute = int(minute)
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                raise ValueError("Invalid time values")
-        except ValueError:
-            speak("Invalid time format. Please provide a valid hour (0-23) and minute (0-59).")
-            return False
-
-        # Format time for display and as key
-        time_key = f"{hour:02d}:{minute:02d}"
-        
-        # Handle days parameter
-        valid_days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
-        
-        if days == "everyday":
-            alarm_days = valid_days
-        elif days == "weekdays":
-            alarm_days = ["monday", "tuesday", "wednesday", "thursday", "friday"]
-        elif days == "weekends":
-            alarm_days = ["saturday", "sunday"]
-        else:
-            # Parse custom days
-            alarm_days = []
-            for day in days.lower().split(","):
-                day = day.strip()
-                if day in valid_days:
-                    alarm_days.append(day)
-            
-            if not alarm_days:
-                speak("No valid days specified. Alarm not set.")
-                return False
-        
-        # Save the alarm
-        self.alarms[time_key] = {
-            "hour": hour,
-            "minute": minute,
-            "days": alarm_days,
-            "active": True
-        }
-        
-        # Create a thread for this alarm
-        self.start_alarm_thread(time_key)
-        
-        # Save to file
-        self.save_alarms()
-        
-        # Provide feedback
-        days_str = ", ".join(alarm_days) if len(alarm_days) <= 3 else f"{len(alarm_days)} days"
-        speak(f"Alarm set for {time_key} on {days_str}")
-        return True
-
-    def remove_alarm(self, hour, minute):
-        """Remove an alarm by hour and minute"""
-        time_key = f"{int(hour):02d}:{int(minute):02d}"
-        
-        if time_key in self.alarms:
-            # Stop the thread if it's running
-            if time_key in self.alarm_threads:
-                self.alarm_threads[time_key]["stop"] = True
-                del self.alarm_threads[time_key]
-            
-            # Remove the alarm
-            del self.alarms[time_key]
-            self.save_alarms()
-            speak(f"Alarm for {time_key} has been removed")
-            return True
-        else:
-            speak(f"No alarm found for {time_key}")
-            return False
-
-    def list_alarms(self):
-        """List all active alarms"""
-        if not self.alarms:
-            speak("You have no alarms set")
-            return []
-        
-        alarm_list = []
-        for time_key, alarm in self.alarms.items():
-            days_str = ", ".join(alarm["days"]) if len(alarm["days"]) <= 3 else f"{len(alarm['days'])} days"
-            status = "active" if alarm["active"] else "inactive"
-            alarm_info = f"Alarm at {time_key} on {days_str}, {status}"
-            alarm_list.append(alarm_info)
-            
-        # Speak the alarms
-        speak(f"You have {len(alarm_list)} alarms set.")
-        for alarm in alarm_list:
-            speak(alarm)
-            
-        return alarm_list
-
-    def start_alarm_threads(self):
-        """Start threads for all alarms"""
-        for time_key in self.alarms:
-            self.start_alarm_thread(time_key)
-
-    def start_alarm_thread(self, time_key):
-        """Start a thread for a specific alarm"""
-        # Stop existing thread if it exists
-        if time_key in self.alarm_threads:
-            self.alarm_threads[time_key]["stop"] = True
-        
-        # Create thread data structure
-        thread_data = {"stop": False}
-        self.alarm_threads[time_key] = thread_data
-        
-        # Create and start the thread
-        thread = threading.Thread(
-            target=self._alarm_monitor,
-            args=(time_key, thread_data),
-            daemon=True
-        )
-        thread.start()
-
-    def _alarm_monitor(self, time_key, thread_data):
-        """Monitor function that runs in its own thread for each alarm"""
-        alarm = self.alarms[time_key]
-        
-        while not thread_data["stop"]:
-            # Check if alarm should trigger
-            now = datetime.datetime.now()
-            current_day = now.strftime("%A").lower()
-            
-            if (alarm["active"] and 
-                now.hour == alarm["hour"] and 
-                now.minute == alarm["minute"] and
-                current_day in alarm["days"]):
-                
-                # Trigger the alarm
-                self._trigger_alarm(time_key)
-                
-                # Sleep for 60 seconds to avoid multiple triggers
-                time.sleep(60)
-            
-            # Check every 15 seconds
-            time.sleep(15)
-
-    def _trigger_alarm(self, time_key):
-        """Trigger the alarm sound and notification with weather information"""
-        alarm = self.alarms[time_key]
-        now = datetime.datetime.now()
-        
-        # Determine greeting based on time of day
-        hour = now.hour
-        if 5 <= hour < 12:
-            greeting = "Good morning"
-        elif 12 <= hour < 18:
-            greeting = "Good afternoon"
-        else:
-            greeting = "Good evening"
-            
-        # Format time in 12-hour format with AM/PM
-        formatted_time = now.strftime("%I:%M %p")
-        
-        # Get weather information
-        weather_data = self.weather_service.get_weather()
-        forecast_data = self.weather_service.get_forecast()
-        
-        # Create the weather part of the message
-        if weather_data["success"]:
-            location = weather_data["location"]
-            temperature = weather_data["temperature"]
-            condition = weather_data["description"]
-            
-            weather_message = f"The weather in {location} is {temperature} degrees Celsius with {condition}."
-            
-            # Add forecast information if available
-            if forecast_data["success"]:
-                if forecast_data["rain_expected"]:
-                    weather_message += " There is a chance of rain today."
-                    
-                weather_message += f" Today's temperatures will range from {forecast_data['min_temp']} to {forecast_data['max_temp']} degrees Celsius."
-        else:
-            # Fallback if weather service is not available
-            weather_message = "Weather information is currently unavailable."
-        
-        # Construct the full alarm message
-        message = f"{greeting}! It's {formatted_time}. {weather_message}"
-        print(f"\n{message}")
-        
-        # Speak the alarm message
+# alarm_clock.py
+
+import threading
+import time
+import datetime
+import copy
+import os
+from assistant.text_to_speech import speak
+from assistant.weather_service import WeatherService
+from assistant.weather_prefetch import WeatherPrefetcher
+from assistant.alarm_scheduler import AlarmScheduler
+from assistant.recurrence import RecurrenceRule, parse_recurrence
+from assistant.state_store import JournaledStore
+
+class AlarmClock:
+    def __init__(self, catch_up_window=30 * 60, clock=time.time):
+        self.alarms = {}
+        self.catch_up_window = catch_up_window  # Alarms missed by up to this many seconds still ring
+        self.clock = clock  # Wall clock alarms are scheduled against
+        self._lock = threading.RLock()  # Guards self.alarms against the scheduler thread
+        self.alarm_file = "alarms.json"
+        self.store = JournaledStore(self.alarm_file)  # Snapshot plus append-only journal of changes
+        self._rules = {}  # alarm key -> compiled RecurrenceRule
+        self._reported_missed = set()  # (alarm key, due time) already logged as missed
+        self.weather_service = WeatherService()
+        self.load_alarms()
+
+        # One thread fires every alarm at its next occurrence
+        self.scheduler = AlarmScheduler(self._on_alarm_due, self._on_clock_change, clock=clock)
+        self.schedule_all()
+
+        # Fetch weather a few minutes before each alarm so the wake-up message needs no network
+        self.weather_prefetcher = WeatherPrefetcher(self.weather_service, self.next_weather_alarm_time)
+        self.weather_prefetcher.start()
+        self.scheduler.start()
+
+    def load_alarms(self):
+        """Load saved alarms from file"""
+        if os.path.exists(self.alarm_file) or os.path.exists(self.store.journal_path):
+            try:
+                self.alarms = self.store.load()
+                print(f"Loaded {len(self.alarms)} alarms from file")
+            except Exception as e:
+                print(f"Error loading alarms: {e}")
+                self.alarms = {}
+        else:
+            print("No alarm file found. Starting with empty alarms.")
+            self.alarms = {}
+
+    def save_alarm(self, alarm_key):
+        """Persist one added, changed or removed alarm by appending it to the journal"""
+        try:
+            with self._lock:
+                alarm = copy.deepcopy(self.alarms.get(alarm_key))
+            if alarm is None:
+                self.store.delete(alarm_key)
+            else:
+                self.store.set(alarm_key, alarm)
+        except Exception as e:
+            print(f"Error saving alarm {alarm_key}: {e}")
+
+    def set_alarm(self, hour, minute, days="everyday", message=None):
+        """
+        Set an alarm for specified time and days
+        days can be: "everyday", "weekdays", "weekends", or a comma-separated list of days
+        like "monday,wednesday,friday", or any repeat phrase parse_recurrence understands,
+        e.g. "every month on the 15th", "every 2 hours", "tomorrow", "december 25th"
+        or "everyday except december 25th". With a message the alarm is a reminder.
+        """
+        # Validate input
+        try:
+            hour = int(hour)
+            minute = int(minute)
+            if not (0 <= hour <= 23 and 0 <= minute <= 59):
+                raise ValueError("Invalid time values")
+        except ValueError:
+            speak("Invalid time format. Please provide a valid hour (0-23) and minute (0-59).")
+            return False
+
+        # Format time for display and as key
+        time_key = f"{hour:02d}:{minute:02d}"
+
+        # Work out when the alarm repeats
+        try:
+            rule = parse_recurrence(days, hour, minute)
+        except ValueError as e:
+            print(e)
+            speak("I couldn't understand when the alarm should ring. Alarm not set.")
+            return False
+
+        alarm_key = f"{time_key} {message}" if message else time_key
+        alarm = {
+            "hour": hour,
+            "minute": minute,
+            "days": rule.day_names(),
+            "rule": rule.to_dict(),
+            "active": True,
+            "created": self.clock()
+        }
+        if message:
+            alarm["message"] = message
+
+        # Save the alarm
+        with self._lock:
+            self.alarms[alarm_key] = alarm
+            self._rules[alarm_key] = rule
+        
+        # Schedule its next occurrence
+        self.schedule_alarm(alarm_key)
+        
+        # Save to file
+        self.save_alarm(alarm_key)
+        self.weather_prefetcher.reschedule()
+        
+        # Provide feedback
+        kind = "Reminder" if message else "Alarm"
+        speak(f"{kind} set for {time_key} {rule.describe()}")
+        return True
+
+    def set_reminder(self, message, hour, minute, when="once"):
+        """Set a reminder that speaks a message instead of the weather"""
+        return self.set_alarm(hour, minute, when, message=message)
+
+    def remove_alarm(self, hour, minute):
+        """Remove the alarms and reminders set for an hour and minute"""
+        time_key = f"{int(hour):02d}:{int(minute):02d}"
+        
+        with self._lock:
+            removed = [key for key, alarm in self.alarms.items()
+                       if alarm["hour"] == int(hour) and alarm["minute"] == int(minute)]
+            for key in removed:
+                del self.alarms[key]
+                self._rules.pop(key, None)
+
+        if removed:
+            for key in removed:
+                self.scheduler.cancel(key)
+                self.save_alarm(key)
+            self.weather_prefetcher.reschedule()
+            speak(f"Alarm for {time_key} has been removed")
+            return True
+        else:
+            speak(f"No alarm found for {time_key}")
+            return False
+
+    def list_alarms(self):
+        """List all active alarms"""
+        if not self.alarms:
+            speak("You have no alarms set")
+            return []
+        
+        alarm_list = []
+        with self._lock:
+            alarms = list(self.alarms.items())
+        for alarm_key, alarm in alarms:
+            time_key = f"{alarm['hour']:02d}:{alarm['minute']:02d}"
+            status = "active" if alarm["active"] else "inactive"
+            if "message" in alarm:
+                alarm_info = f"Reminder to {alarm['message']} at {time_key} {self._rule(alarm_key).describe()}, {status}"
+            else:
+                alarm_info = f"Alarm at {time_key} {self._rule(alarm_key).describe()}, {status}"
+            alarm_list.append(alarm_info)
+            
+        # Speak the alarms
+        speak(f"You have {len(alarm_list)} alarms set.")
+        for alarm in alarm_list:
+            speak(alarm)
+            
+        return alarm_list
+
+    def _rule(self, alarm_key):
+        """Return the compiled recurrence rule for an alarm, converting old weekday-only alarms"""
+        with self._lock:
+            rule = self._rules.get(alarm_key)
+            if rule is None:
+                alarm = self.alarms[alarm_key]
+                if "rule" in alarm:
+                    rule = RecurrenceRule.from_dict(alarm["rule"])
+                else:
+                    rule = RecurrenceRule.from_days(alarm["hour"], alarm["minute"], alarm["days"])
+                self._rules[alarm_key] = rule
+            return rule
+
+    def next_occurrence(self, alarm_key, after):
+        """Return the first datetime after the given one at which an alarm rings, or None"""
+        with self._lock:
+            alarm = self.alarms.get(alarm_key)
+            if alarm is None or not alarm["active"]:
+                return None
+            return self._rule(alarm_key).next_after(after)
+
+    def next_alarm_time(self):
+        """Return the datetime of the next scheduled alarm, or None"""
+        head = self.scheduler.next_deadline()
+        if head is None:
+            return None
+        return datetime.datetime.fromtimestamp(head[0])
+
+    def next_weather_alarm_time(self):
+        """Return the datetime of the next alarm that announces the weather, or None
+
+        Reminders only speak their message, so a reminder every few minutes
+        must not trigger a weather download each time.
+        """
+        with self._lock:
+            time_keys = [time_key for time_key, alarm in self.alarms.items() if not alarm.get("message")]
+        deadlines = [d for d in (self.scheduler.deadline(time_key) for time_key in time_keys) if d is not None]
+        if not deadlines:
+            return None
+        return datetime.datetime.fromtimestamp(min(deadlines))
+
+    def schedule_all(self):
+        """Schedule the next occurrence of every alarm"""
+        with self._lock:
+            time_keys = list(self.alarms)
+        for time_key in time_keys:
+            self.schedule_alarm(time_key)
+
+    def schedule_alarm(self, time_key, after=None):
+        """Put an alarm's next occurrence on the scheduler, or drop it if it has none
+
+        Without an explicit start, the search begins where the alarm last rang
+        (or was created), but no earlier than catch_up_window ago. Occurrences
+        missed while the computer slept or the assistant was closed then still
+        ring once if they are recent, and an occurrence never rings twice.
+        """
+        if after is None:
+            now = self.clock()
+            with self._lock:
+                alarm = self.alarms.get(time_key, {})
+                reference = max(alarm.get("last_fired", 0), alarm.get("created", now))
+            if reference < now - self.catch_up_window:
+                missed = self.next_occurrence(time_key, datetime.datetime.fromtimestamp(reference))
+                if missed is not None and missed.timestamp() < now - self.catch_up_window \
+                        and (time_key, missed) not in self._reported_missed:
+                    self._reported_missed.add((time_key, missed))
+                    print(f"Missed alarm {time_key} due at {missed.strftime('%Y-%m-%d %H:%M')}; too late to ring it now")
+            after = datetime.datetime.fromtimestamp(max(reference, now - self.catch_up_window))
+
+        next_time = self.next_occurrence(time_key, after)
+        if next_time is None:
+            self.scheduler.cancel(time_key)
+        else:
+            self.scheduler.schedule(time_key, next_time.timestamp())
+
+    def _on_alarm_due(self, time_key, deadline):
+        """Called by the scheduler thread when an alarm is due"""
+        now = self.clock()
+        with self._lock:
+            alarm = self.alarms.get(time_key)
+            if alarm is None or deadline <= alarm.get("last_fired", 0):
+                return  # Removed, or this occurrence already rang
+            alarm["last_fired"] = deadline
+
+        # Queue the following occurrence first so a slow announcement can't delay it.
+        # A late alarm rings once, not once for every occurrence it missed.
+        self.schedule_alarm(time_key, after=datetime.datetime.fromtimestamp(max(deadline, now)))
+        if self.scheduler.deadline(time_key) is None:
+            # One-shot alarms and finished date lists stay listed but inactive
+            with self._lock:
+                if time_key in self.alarms:
+                    self.alarms[time_key]["active"] = False
+        # Persist last_fired before announcing so a restart can't ring it again
+        self.save_alarm(time_key)
+        self.weather_prefetcher.reschedule()
+
+        lateness = now - deadline
+        if lateness > self.catch_up_window:
+            print(f"Missed alarm {time_key} by {lateness / 60:.0f} minutes; too late to ring it now")
+            return
+        due = datetime.datetime.fromtimestamp(deadline) if lateness > 60 else None
+        threading.Thread(target=self._trigger_alarm, args=(time_key, due), daemon=True).start()
+
+    def _on_clock_change(self, drift):
+        """Recompute every deadline after the wall clock jumped or the computer resumed"""
+        self.schedule_all()
+        self.weather_prefetcher.reschedule()
+
+    def _trigger_alarm(self, time_key, missed_at=None):
+        """Trigger the alarm sound and notification with weather information"""
+        now = datetime.datetime.now()
+        late_note = f" Sorry, this was due at {missed_at.strftime('%I:%M %p')}." if missed_at else ""
+
+        with self._lock:
+            message = self.alarms.get(time_key, {}).get("message")
+        if message:
+            print(f"\nReminder: {message}{late_note}")
+            speak(f"Reminder: {message}.{late_note}")
+            return
+        
+        # Determine greeting based on time of day
+        hour = now.hour
+        if 5 <= hour < 12:
+            greeting = "Good morning"
+        elif 12 <= hour < 18:
+            greeting = "Good afternoon"
+        else:
+            greeting = "Good evening"
+            
+        # Format time in 12-hour format with AM/PM
+        formatted_time = now.strftime("%I:%M %p")
+        
+        # Use the weather prefetched before this alarm if it is recent; otherwise fall back to
+        # cached data without touching the network so the alarm is never delayed
+        weather_data = self.weather_prefetcher.get_snapshot()
+        if weather_data is None:
+            weather_data = self.weather_service.get_weather_bundle(cached_only=True)
+        forecast_data = weather_data["forecast"]
+        
+        # Create the weather part of the message
+        if weather_data["success"]:
+            location = weather_data["location"]
+            temperature = weather_data["temperature"]
+            condition = weather_data["description"]
+            
+            weather_message = f"The weather in {location} is {temperature} degrees Celsius with {condition}."
+            
+            # Add forecast information if available
+            if forecast_data["success"]:
+                if forecast_data["rain_expected"]:
+                    weather_message += " There is a chance of rain today."
+                    
+                weather_message += f" Today's temperatures will range from {forecast_data['min_temp']} to {forecast_data['max_temp']} degrees Celsius."
+        else:
+            # Fallback if weather service is not available
+            weather_message = "Weather information is currently unavailable."
+        
+        # Construct the full alarm message
+        message = f"{greeting}! It's {formatted_time}.{late_note} {weather_message}"
+        print(f"\n{message}")
+        
+        # Speak the alarm message
         speak(message)
\ No newline at end of file
@@ -0,0 +1,153 @@
+# alarm_scheduler.py
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class AlarmScheduler:
+    """Fires callbacks at absolute unix times from a single thread.
+
+    Deadlines are kept in a min-heap; the thread sleeps on a condition
+    variable until the earliest one and is woken early whenever the head of
+    the heap changes. Rescheduling or cancelling a key marks its old heap
+    entry as stale instead of searching for it, so every operation is
+    O(log n) and nothing runs while no deadline is due.
+
+    Deadlines are absolute wall-clock times, but sleeps are measured on the
+    monotonic clock. While anything is scheduled the thread wakes at least
+    every max_sleep seconds and compares how far both clocks moved; a
+    difference means the wall clock was changed or the machine was
+    suspended, and on_clock_change(drift_seconds) is called so owners can
+    recompute their deadlines. Deadlines that are already past fire
+    immediately and on_due can tell how late they are.
+    """
+
+    def __init__(self, on_due, on_clock_change=None, max_sleep=60, jump_threshold=5,
+                 clock=time.time, monotonic=time.monotonic):
+        self.on_due = on_due  # Called as on_due(key, deadline) from the scheduler thread
+        self.on_clock_change = on_clock_change  # Called as on_clock_change(drift) after a clock jump
+        self.max_sleep = max_sleep  # Longest single sleep, bounds how late a clock jump is noticed
+        self.jump_threshold = jump_threshold  # Seconds of drift between the two clocks that count as a jump
+        self.clock = clock  # Wall clock the deadlines refer to
+        self.monotonic = monotonic
+        self._cond = threading.Condition()
+        self._heap = []  # (deadline, seq, key), may contain stale entries
+        self._live = {}  # key -> (deadline, seq) of its current heap entry
+        self._seq = itertools.count()
+        self._stop = False
+        self._thread = None
+
+    def __len__(self):
+        with self._cond:
+            return len(self._live)
+
+    def start(self):
+        """Start the scheduler thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._scheduler_worker, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the scheduler thread"""
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+
+    def schedule(self, key, deadline):
+        """Fire key at the unix time deadline, replacing any earlier schedule for it"""
+        with self._cond:
+            seq = next(self._seq)
+            self._live[key] = (deadline, seq)
+            heapq.heappush(self._heap, (deadline, seq, key))
+            self._compact()
+            if self._heap[0][1] == seq:
+                self._cond.notify()
+
+    def cancel(self, key):
+        """Forget a key; returns False if it wasn't scheduled"""
+        with self._cond:
+            entry = self._live.pop(key, None)
+            if entry is None:
+                return False
+            if self._heap and self._heap[0][1] == entry[1]:
+                self._cond.notify()
+            return True
+
+    def clear(self):
+        """Cancel everything"""
+        with self._cond:
+            self._heap = []
+            self._live = {}
+            self._cond.notify()
+
+    def deadline(self, key):
+        """Return the scheduled unix time for a key, or None"""
+        with self._cond:
+            entry = self._live.get(key)
+            return entry[0] if entry else None
+
+    def next_deadline(self):
+        """Return (deadline, key) of the earliest scheduled key, or None"""
+        with self._cond:
+            self._drop_stale()
+            if not self._heap:
+                return None
+            deadline, seq, key = self._heap[0]
+            return deadline, key
+
+    def _drop_stale(self):
+        """Pop cancelled or rescheduled entries off the top of the heap"""
+        while self._heap:
+            deadline, seq, key = self._heap[0]
+            if self._live.get(key) == (deadline, seq):
+                return
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        """Rebuild the heap once stale entries outnumber live ones"""
+        if len(self._heap) > 2 * len(self._live) + 32:
+            self._heap = [(deadline, seq, key) for key, (deadline, seq) in self._live.items()]
+            heapq.heapify(self._heap)
+
+    def _scheduler_worker(self):
+        while True:
+            drift = None
+            with self._cond:
+                while True:
+                    if self._stop:
+                        return
+                    self._drop_stale()
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    deadline, seq, key = self._heap[0]
+                    delay = deadline - self.clock()
+                    if delay <= 0:
+                        heapq.heappop(self._heap)
+                        del self._live[key]
+                        break
+
+                    wall, mono = self.clock(), self.monotonic()
+                    self._cond.wait(min(delay, self.max_sleep))
+                    drift = (self.clock() - wall) - (self.monotonic() - mono)
+                    if abs(drift) > self.jump_threshold:
+                        break
+                    drift = None
+
+            if drift is not None:
+                print(f"Wall clock jumped by {drift:+.0f} seconds; rescheduling alarms")
+                if self.on_clock_change:
+                    try:
+                        self.on_clock_change(drift)
+                    except Exception as e:
+                        print(f"Error handling clock change: {e}")
+                continue
+
+            try:
+                self.on_due(key, deadline)
+            except Exception as e:
+                print(f"Error firing alarm {key}: {e}")
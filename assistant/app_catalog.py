@@ -0,0 +1,420 @@
+# app_catalog.py
+
+import difflib
+import json
+import os
+import platform
+import re
+import shlex
+import subprocess
+import threading
+from assistant.state_store import atomic_write_json
+
+# Spoken names that don't resemble the installed application's name.
+# Each alias maps to candidate executables/launcher names, tried in order.
+DEFAULT_ALIASES = {
+    "notepad": ["notepad", "gedit", "gnome-text-editor", "kate"],
+    "calculator": ["calc", "gnome-calculator", "kcalc"],
+    "google": ["chrome", "google-chrome", "chromium"],
+    "chrome": ["chrome", "google-chrome", "chromium"],
+    "disc": ["discord"],
+    "spotify": ["spotify"],
+    "word": ["winword", "libreoffice"],
+    "excel": ["excel", "libreoffice"],
+    "vs code": ["code"],
+    "vscode": ["code"],
+    "visual studio code": ["code"],
+    "terminal": ["wt", "gnome-terminal", "konsole", "xterm"],
+    "file explorer": ["explorer", "nautilus", "dolphin"],
+}
+
+# Desktop entry Exec field codes (%f, %U, ...) that must be dropped before launching
+DESKTOP_FIELD_CODE = re.compile(r"%[fFuUdDnNickvm]")
+
+
+def normalize_app_name(name):
+    """Normalize an application name for alias lookups"""
+    name = name.lower().strip()
+    if name.endswith((".exe", ".lnk", ".desktop", ".app")):
+        name = name.rsplit(".", 1)[0]
+    name = re.sub(r"[^a-z0-9+]+", " ", name)
+    return " ".join(name.split())
+
+
+class ApplicationCatalog:
+    """Index of installed applications built from the platform's launchers.
+
+    Sources are scanned per directory and cached on disk together with the
+    directory mtime, so a later startup only rescans directories whose
+    contents changed. Lookups go through a prebuilt alias map with a fuzzy
+    fallback and never touch the filesystem.
+    """
+
+    def __init__(self, cache_file="app_catalog.json"):
+        self.cache_file = cache_file
+        self.os_name = platform.system()
+
+        self._lock = threading.Lock()
+        self._sources = {}  # directory -> {"mtime": float, "entries": [entry, ...]}
+        self._aliases = {}  # normalized alias -> entry
+        self._alias_names = []  # alias keys for fuzzy matching
+        self._token_index = {}  # word -> set of alias keys containing it
+
+        self.ready = threading.Event()
+        self._scan_thread = None
+
+        self.load_cache()
+
+    def load_cache(self):
+        """Load the previously scanned catalog from disk"""
+        if not os.path.exists(self.cache_file):
+            self._rebuild_index()
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            self._sources = data.get("sources", {})
+            print(f"Loaded application catalog with {len(self._sources)} sources")
+        except Exception as e:
+            print(f"Error loading application catalog: {e}")
+            self._sources = {}
+        self._rebuild_index()
+
+    def save_cache(self):
+        """Save the scanned catalog to disk"""
+        try:
+            with self._lock:
+                data = {"sources": self._sources}
+            atomic_write_json(self.cache_file, data)
+        except Exception as e:
+            print(f"Error saving application catalog: {e}")
+
+    def start(self):
+        """Scan for changed launcher directories in a background thread"""
+        if self._scan_thread and self._scan_thread.is_alive():
+            return
+        self._scan_thread = threading.Thread(target=self.refresh, daemon=True)
+        self._scan_thread.start()
+
+    def refresh(self):
+        """Rescan launcher directories whose mtime changed since the last scan"""
+        try:
+            with self._lock:
+                previous = dict(self._sources)
+            sources = {}
+            changed = False
+            for directory, scanner in self._source_directories():
+                try:
+                    mtime = os.stat(directory).st_mtime
+                except OSError:
+                    continue
+
+                cached = previous.get(directory)
+                if cached and cached.get("mtime") == mtime:
+                    sources[directory] = cached
+                    continue
+
+                sources[directory] = {"mtime": mtime, "entries": scanner(directory)}
+                changed = True
+
+            if changed or set(sources) != set(previous):
+                with self._lock:
+                    self._sources = sources
+                self._rebuild_index()
+                self.save_cache()
+                print(f"Application catalog updated with {len(self._aliases)} names")
+        except Exception as e:
+            print(f"Error scanning applications: {e}")
+        finally:
+            self.ready.set()
+
+    def _source_directories(self):
+        """Return (directory, scanner) pairs for the current platform"""
+        directories = []
+
+        if self.os_name == "Windows":
+            start_menus = [
+                os.path.join(os.environ.get("APPDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
+                os.path.join(os.environ.get("PROGRAMDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
+            ]
+            for start_menu in start_menus:
+                # Directory mtimes only reflect direct children, so every subfolder is its own source
+                for root, _, _ in os.walk(start_menu):
+                    directories.append((root, self._scan_start_menu))
+        elif self.os_name == "Darwin":
+            for apps_dir in ["/Applications", "/System/Applications", os.path.expanduser("~/Applications")]:
+                directories.append((apps_dir, self._scan_mac_applications))
+        else:
+            data_home = os.environ.get("XDG_DATA_HOME", os.path.expanduser("~/.local/share"))
+            data_dirs = os.environ.get("XDG_DATA_DIRS", "/usr/local/share:/usr/share").split(":")
+            for data_dir in [data_home] + data_dirs:
+                if data_dir:
+                    directories.append((os.path.join(data_dir, "applications"), self._scan_desktop_files))
+
+        seen = set()
+        for path_dir in os.environ.get("PATH", "").split(os.pathsep):
+            if path_dir and path_dir not in seen:
+                seen.add(path_dir)
+                directories.append((path_dir, self._scan_path_directory))
+
+        return directories
+
+    def _scan_path_directory(self, directory):
+        """Collect executables from a PATH directory"""
+        entries = []
+        if self.os_name == "Windows":
+            extensions = os.environ.get("PATHEXT", ".EXE;.BAT;.CMD").lower().split(";")
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    try:
+                        if not item.is_file():
+                            continue
+                        if self.os_name == "Windows":
+                            stem, ext = os.path.splitext(item.name)
+                            if ext.lower() not in extensions:
+                                continue
+                        else:
+                            stem = item.name
+                            if not os.access(item.path, os.X_OK):
+                                continue
+                    except OSError:
+                        continue
+                    entries.append({
+                        "name": stem,
+                        "command": [item.path],
+                        "process": stem,
+                        "source": "path",
+                        "aliases": [stem],
+                    })
+        except OSError as e:
+            print(f"Error scanning {directory}: {e}")
+        return entries
+
+    def _scan_desktop_files(self, directory):
+        """Collect applications from XDG .desktop files"""
+        entries = []
+        try:
+            file_names = os.listdir(directory)
+        except OSError:
+            return entries
+
+        for file_name in file_names:
+            if not file_name.endswith(".desktop"):
+                continue
+            entry = self._parse_desktop_file(os.path.join(directory, file_name))
+            if entry:
+                entries.append(entry)
+        return entries
+
+    def _parse_desktop_file(self, path):
+        """Parse the [Desktop Entry] group of a .desktop file"""
+        fields = {}
+        in_entry = False
+        try:
+            with open(path, 'r', encoding="utf-8", errors="ignore") as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("["):
+                        in_entry = line == "[Desktop Entry]"
+                        continue
+                    if in_entry and "=" in line:
+                        key, value = line.split("=", 1)
+                        fields.setdefault(key.strip(), value.strip())
+        except OSError:
+            return None
+
+        if fields.get("Type", "Application") != "Application":
+            return None
+        if fields.get("NoDisplay") == "true" or fields.get("Hidden") == "true":
+            return None
+        if "Name" not in fields or "Exec" not in fields:
+            return None
+
+        try:
+            command = [part for part in shlex.split(DESKTOP_FIELD_CODE.sub("", fields["Exec"])) if part]
+        except ValueError:
+            return None
+        if not command:
+            return None
+
+        # "env FOO=1 app" style Exec lines launch the last non-assignment word
+        executable = command[0]
+        if os.path.basename(executable) == "env":
+            words = [part for part in command[1:] if "=" not in part]
+            executable = words[0] if words else executable
+        process = os.path.basename(executable)
+
+        # org.gnome.Calculator.desktop -> "calculator"
+        stem = os.path.basename(path)[:-len(".desktop")]
+        aliases = [fields["Name"], stem, stem.split(".")[-1], process]
+        if fields.get("GenericName"):
+            aliases.append(fields["GenericName"])
+
+        return {
+            "name": fields["Name"],
+            "command": command,
+            "process": process,
+            "source": "desktop",
+            "aliases": aliases,
+        }
+
+    def _scan_start_menu(self, directory):
+        """Collect applications from Windows Start Menu shortcuts"""
+        entries = []
+        try:
+            file_names = os.listdir(directory)
+        except OSError:
+            return entries
+
+        shell = None
+        try:
+            import win32com.client
+            shell = win32com.client.Dispatch("WScript.Shell")
+        except Exception:
+            pass
+
+        for file_name in file_names:
+            if not file_name.lower().endswith(".lnk"):
+                continue
+            path = os.path.join(directory, file_name)
+            name = file_name[:-4]
+            process = name
+
+            # Resolve the shortcut target so running instances can be detected by process name
+            if shell is not None:
+                try:
+                    target = shell.CreateShortcut(path).TargetPath
+                    if target:
+                        process = os.path.splitext(os.path.basename(target))[0]
+                except Exception:
+                    pass
+
+            entries.append({
+                "name": name,
+                "command": [path],
+                "process": process,
+                "source": "startmenu",
+                "aliases": [name, process],
+            })
+        return entries
+
+    def _scan_mac_applications(self, directory):
+        """Collect .app bundles from a macOS Applications folder"""
+        entries = []
+        try:
+            file_names = os.listdir(directory)
+        except OSError:
+            return entries
+
+        for file_name in file_names:
+            if not file_name.endswith(".app"):
+                continue
+            name = file_name[:-4]
+            entries.append({
+                "name": name,
+                "command": ["open", "-a", os.path.join(directory, file_name)],
+                "process": name,
+                "source": "macapp",
+                "aliases": [name],
+            })
+        return entries
+
+    def _rebuild_index(self):
+        """Build the alias map and fuzzy-match structures from the scanned sources"""
+        aliases = {}
+        by_process = {}
+
+        with self._lock:
+            sources = list(self._sources.values())
+
+        # Launcher entries win over bare PATH executables with the same alias
+        ordered = sorted(
+            (entry for source in sources for entry in source.get("entries", [])),
+            key=lambda entry: entry.get("source") == "path",
+        )
+        for entry in ordered:
+            by_process.setdefault(normalize_app_name(entry["process"]), entry)
+            for alias in entry.get("aliases", []):
+                key = normalize_app_name(alias)
+                if not key:
+                    continue
+                aliases.setdefault(key, entry)
+                aliases.setdefault(key.replace(" ", ""), entry)
+
+        # Spoken aliases point at the first candidate that is actually installed.
+        # Before the first scan finishes they fall back to launching the name directly.
+        for alias, candidates in DEFAULT_ALIASES.items():
+            if alias in aliases:
+                continue
+            for candidate in candidates:
+                entry = by_process.get(normalize_app_name(candidate))
+                if entry:
+                    aliases[alias] = entry
+                    break
+            else:
+                if not sources:
+                    aliases[alias] = {
+                        "name": alias,
+                        "command": [candidates[0]],
+                        "process": candidates[0],
+                        "source": "alias",
+                        "aliases": [alias],
+                    }
+
+        token_index = {}
+        for key in aliases:
+            for token in key.split():
+                token_index.setdefault(token, set()).add(key)
+
+        with self._lock:
+            self._aliases = aliases
+            self._alias_names = list(aliases)
+            self._token_index = token_index
+
+    def resolve(self, query):
+        """Return the catalog entry that best matches a spoken application name, or None"""
+        key = normalize_app_name(query)
+        if not key:
+            return None
+
+        with self._lock:
+            aliases = self._aliases
+            alias_names = self._alias_names
+            token_index = self._token_index
+
+        # Exact and space-insensitive matches
+        entry = aliases.get(key) or aliases.get(key.replace(" ", ""))
+        if entry:
+            return entry
+
+        # Every spoken word appears in the alias ("studio code" -> "visual studio code")
+        tokens = key.split()
+        candidates = None
+        for token in tokens:
+            keys = token_index.get(token, set())
+            candidates = set(keys) if candidates is None else candidates & keys
+            if not candidates:
+                break
+        if candidates:
+            return aliases[min(candidates, key=len)]
+
+        # Misheard names ("pyhton" -> "python"); very short names are too ambiguous
+        if len(key) >= 4:
+            matches = difflib.get_close_matches(key, alias_names, n=1, cutoff=0.8)
+            if matches:
+                return aliases[matches[0]]
+        return None
+
+    def launch(self, entry):
+        """Launch a catalog entry"""
+        command = entry["command"]
+        if entry.get("source") == "startmenu" and hasattr(os, "startfile"):
+            os.startfile(command[0])
+        else:
+            subprocess.Popen(command)
+
+    def list_applications(self):
+        """Return the display names of all known applications"""
+        with self._lock:
+            return sorted({entry["name"] for entry in self._aliases.values()})
@@ -0,0 +1,154 @@
+# bulk_enrollment.py
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from assistant.face_detection import FaceDetector
+from assistant.face_samples import normalize_face
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+MIN_FACE_FRACTION = 1 / 8  # Enrollment photos are portraits; smaller faces are background people
+
+_detector = None  # FaceDetector of the current worker process
+
+
+def find_images(directory):
+    """Return {name: [image paths]} for a directory laid out as name/*.jpg"""
+    people = {}
+    for name in sorted(os.listdir(directory)):
+        person_dir = os.path.join(directory, name)
+        if not os.path.isdir(person_dir):
+            continue
+        images = [os.path.join(person_dir, f) for f in sorted(os.listdir(person_dir))
+                  if f.lower().endswith(IMAGE_EXTENSIONS)]
+        if images:
+            people[name] = images
+    return people
+
+
+def _load_detector(detection_settings):
+    """Load the cascade into the detector extract_face() uses"""
+    global _detector
+    cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    # Each image is unrelated to the previous one, so always search the whole picture
+    settings = dict(detection_settings or {}, full_detect_interval=1)
+    _detector = FaceDetector(cascade, **settings)
+
+
+def _init_worker(detection_settings):
+    """Load the cascade once per worker process"""
+    _load_detector(detection_settings)
+    cv2.setNumThreads(1)  # Parallelism comes from the process pool
+
+
+def extract_face(path):
+    """Decode an image, find exactly one face and normalize it; returns (path, sample or None, reject reason)"""
+    gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return path, None, "could not be decoded"
+
+    # Skipping the small scales makes the cascade several times faster on portraits
+    min_face = max(30, int(min(gray.shape[:2]) * MIN_FACE_FRACTION))
+    _detector.min_size = (min_face, min_face)
+    _detector.reset()
+    faces = _detector.detect(gray)
+    if len(faces) == 0:
+        return path, None, "no face found"
+    if len(faces) > 1:
+        return path, None, f"{len(faces)} faces found"
+
+    x, y, w, h = faces[0]
+    return path, normalize_face(gray[y:y+h, x:x+w]), None
+
+
+def extract_faces(paths, workers=None, detection_settings=None):
+    """Run extract_face over many images on all cores; yields results in input order"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        # A pool of one only adds process start-up and pickling
+        _load_detector(detection_settings)
+        for path in paths:
+            yield extract_face(path)
+        return
+
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(detection_settings,)) as executor:
+        for result in executor.map(extract_face, paths, chunksize=chunksize):
+            yield result
+
+
+def enroll_directory(recognizer, directory, workers=None):
+    """Enroll everyone in a name/*.jpg directory tree into a FacialRecognizer
+
+    Faces are extracted in a process pool, stored in the recognizer's sample
+    store and added to the LBPH model in a single train or update call.
+    Returns a report with per-user counts, rejected images and throughput.
+    """
+    if not os.path.isdir(directory):
+        return {"success": False, "error": f"{directory} is not a directory"}
+
+    start = time.time()
+    people = find_images(directory)
+    paths = [path for images in people.values() for path in images]
+    if not paths:
+        return {"success": False, "error": f"No images found under {directory}"}
+    name_of = {path: name for name, images in people.items() for path in images}
+
+    samples_by_name = {name: [] for name in people}
+    rejects = []
+    for path, sample, reason in extract_faces(paths, workers):
+        if sample is None:
+            rejects.append({"image": path, "reason": reason})
+        else:
+            samples_by_name[name_of[path]].append(sample)
+    extract_seconds = time.time() - start
+
+    result = recognizer.enroll_samples(samples_by_name)
+    if not result["success"]:
+        return dict(result, images=len(paths), rejects=rejects)
+
+    seconds = time.time() - start
+    return {
+        "success": True,
+        "users": result["users"],
+        "images": len(paths),
+        "accepted": len(paths) - len(rejects),
+        "rejects": rejects,
+        "extract_seconds": round(extract_seconds, 2),
+        "train_seconds": result["seconds"],
+        "seconds": round(seconds, 2),
+        "images_per_second": round(len(paths) / seconds, 1) if seconds > 0 else 0.0,
+    }
+
+
+def print_report(report):
+    """Print an enrollment report"""
+    for reject in report.get("rejects", []):
+        print(f"Rejected {reject['image']}: {reject['reason']}")
+    if not report["success"]:
+        print(f"Enrollment failed: {report['error']}")
+        return
+    for name, user in report["users"].items():
+        status = f"{user['samples']} samples, ID {user['id']}" if user["samples"] else "no usable images, skipped"
+        print(f"  {name}: {status}")
+    print(f"Enrolled {report['accepted']} of {report['images']} images in {report['seconds']}s "
+          f"({report['images_per_second']} images/s; extraction {report['extract_seconds']}s, "
+          f"training {report['train_seconds']}s)")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m assistant.bulk_enrollment <directory with one folder of photos per person> [workers]")
+        return
+    from assistant.facial_recognition import FacialRecognizer
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    print_report(enroll_directory(FacialRecognizer(headless=True), sys.argv[1], workers))
+
+
+if __name__ == "__main__":
+    main()
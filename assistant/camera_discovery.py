@@ -0,0 +1,280 @@
+# camera_discovery.py
+
+import glob
+import hashlib
+import os
+import platform
+import threading
+import time
+
+import cv2
+
+from assistant.state_store import atomic_write_json, load_json
+
+CACHE_FILE = "camera_cache.json"
+PROBE_TIMEOUT = 4.0  # Seconds one open-and-read attempt may take before it is abandoned
+PROBE_THREAD_PREFIX = "camera-probe"  # Name prefix of every thread discovery starts
+MAX_CAMERA_INDEX = 3  # Indices 0 .. MAX_CAMERA_INDEX - 1 are probed
+
+_cache_lock = threading.Lock()
+_last_choice = None  # Camera found earlier in this process
+
+
+def camera_backends():
+    """Return the (api, name) backends worth trying on this OS, most reliable first"""
+    os_name = platform.system()
+    if os_name == "Windows":
+        backends = [("CAP_DSHOW", "DirectShow"), ("CAP_MSMF", "Microsoft Media Foundation")]
+    elif os_name == "Darwin":
+        backends = [("CAP_AVFOUNDATION", "AVFoundation")]
+    else:
+        backends = [("CAP_V4L2", "V4L2")]
+    found = [(getattr(cv2, api), name) for api, name in backends if hasattr(cv2, api)]
+    return found + [(None, "Default")]
+
+
+def camera_candidates(indices=None):
+    """Return every (index, backend) combination to try, as dicts with index, api and name"""
+    indices = range(MAX_CAMERA_INDEX) if indices is None else indices
+    return [{"index": index, "api": api, "name": name}
+            for index in indices for api, name in camera_backends()]
+
+
+def device_fingerprint():
+    """Identify the machine and its attached cameras, so a cached choice isn't reused after a change"""
+    parts = [platform.system(), platform.node(), cv2.__version__]
+    # Linux names each video device in sysfs; other systems only get the host-level fingerprint
+    for path in sorted(glob.glob("/sys/class/video4linux/video*/name")):
+        try:
+            with open(path, 'r') as f:
+                parts.append(f"{os.path.basename(os.path.dirname(path))}={f.read().strip()}")
+        except OSError:
+            pass
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _open_capture(index, api):
+    if api is None:
+        return cv2.VideoCapture(index)
+    return cv2.VideoCapture(index, api)
+
+
+class _Probe:
+    """One open-and-read attempt on a worker thread, abandoned if it takes too long.
+
+    A driver call that hangs can't be interrupted, so an abandoned probe's
+    thread is left to finish on its own and releases whatever it opened.
+    """
+
+    def __init__(self, candidate):
+        self.candidate = candidate
+        self.capture = None
+        self.resolution = None  # (width, height) of the test frame
+        self.error = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._abandoned = False
+        self._thread = threading.Thread(target=self._probe_worker, daemon=True,
+                                        name=f"{PROBE_THREAD_PREFIX}-{candidate['index']}-{candidate['name']}")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _probe_worker(self):
+        capture = None
+        try:
+            capture = _open_capture(self.candidate["index"], self.candidate["api"])
+            if not capture.isOpened():
+                self.error = "could not be opened"
+            else:
+                ret, frame = capture.read()
+                if ret and frame is not None:
+                    self.resolution = (frame.shape[1], frame.shape[0])
+                else:
+                    self.error = "opened but returned no frames"
+        except Exception as e:
+            self.error = str(e)
+
+        with self._lock:
+            if self.error is None and not self._abandoned:
+                self.capture = capture
+                capture = None
+            self._done.set()
+        if capture is not None:
+            capture.release()
+
+    def wait(self, timeout):
+        """Wait for the result; returns True if the camera works"""
+        if not self._done.wait(timeout):
+            with self._lock:
+                if not self._done.is_set():
+                    self._abandoned = True
+                    self.error = f"timed out after {timeout:.1f}s"
+                    return False
+        return self.error is None
+
+    def release(self):
+        """Release the capture, or make an unfinished probe release it when done"""
+        with self._lock:
+            self._abandoned = True
+            capture, self.capture = self.capture, None
+        if capture is not None:
+            capture.release()
+
+    def describe(self):
+        return f"camera index {self.candidate['index']} with {self.candidate['name']} backend"
+
+
+def _probe_index_group(candidates, timeout, results, search):
+    """Try one camera index with each backend in turn; two backends can't open the same device at once"""
+    for candidate in candidates:
+        if search["closed"]:
+            return
+        probe = _Probe(candidate).start()
+        if probe.wait(timeout):
+            with search["lock"]:
+                if search["closed"]:
+                    probe.release()
+                else:
+                    results.append(probe)
+            return
+        print(f"Camera probe failed for {probe.describe()}: {probe.error}")
+        probe.release()
+
+
+def _choice_from_probe(probe, cached):
+    return {
+        "success": True,
+        "index": probe.candidate["index"],
+        "api": probe.candidate["api"],
+        "name": probe.candidate["name"],
+        "width": probe.resolution[0],
+        "height": probe.resolution[1],
+        "cached": cached,
+    }
+
+
+def _load_cached_choice(fingerprint, cache_file):
+    with _cache_lock:
+        try:
+            cache = load_json(cache_file, {}) or {}
+        except Exception as e:
+            print(f"Error reading camera cache: {e}")
+            return None
+    return cache.get(fingerprint)
+
+
+def _save_cached_choice(fingerprint, choice, cache_file):
+    entry = {key: choice[key] for key in ("index", "api", "name", "width", "height")}
+    entry["verified"] = time.time()
+    with _cache_lock:
+        try:
+            cache = load_json(cache_file, {}) or {}
+        except Exception:
+            cache = {}
+        cache[fingerprint] = entry
+        try:
+            atomic_write_json(cache_file, cache, indent=2)
+        except Exception as e:
+            print(f"Error saving camera cache: {e}")
+
+
+def discover_camera(timeout=PROBE_TIMEOUT, refresh=False, keep_open=False, cache_file=CACHE_FILE):
+    """Find a working camera; returns a dict with index, api, name, width and height
+
+    The choice cached on disk for this device fingerprint is tried first.
+    Otherwise every camera index is probed in parallel (backends for the same
+    index in order), each attempt limited to timeout seconds, and the lowest
+    working index wins and is cached. With keep_open=True the probe's
+    already-open cv2.VideoCapture is returned under "capture". The answer is
+    also remembered for the rest of the process; refresh=True ignores both
+    the memo and the disk cache.
+    """
+    global _last_choice
+
+    if not refresh and not keep_open and _last_choice is not None:
+        return dict(_last_choice)
+
+    fingerprint = device_fingerprint()
+    cached = None if refresh else _load_cached_choice(fingerprint, cache_file)
+    if cached:
+        probe = _Probe({"index": cached["index"], "api": cached["api"], "name": cached["name"]}).start()
+        if probe.wait(timeout):
+            choice = _choice_from_probe(probe, cached=True)
+            print(f"Using cached camera: {probe.describe()} at {choice['width']}x{choice['height']}")
+            return _finish(choice, probe, keep_open)
+        print(f"Cached {probe.describe()} no longer works ({probe.error}); searching again")
+        probe.release()
+
+    start = time.time()
+    candidates = camera_candidates()
+    indices = sorted(set(candidate["index"] for candidate in candidates))
+    search = {"lock": threading.Lock(), "closed": False}
+    groups = []
+    for index in indices:
+        results = []
+        group = [c for c in candidates if c["index"] == index]
+        thread = threading.Thread(target=_probe_index_group, args=(group, timeout, results, search), daemon=True,
+                                  name=f"{PROBE_THREAD_PREFIX}-group-{index}")
+        thread.start()
+        groups.append((thread, results, len(group)))
+
+    # Take the lowest index that works without waiting for the higher ones
+    chosen = None
+    for thread, results, attempts in groups:
+        thread.join(timeout * attempts + 1)
+        if results:
+            chosen = results[0]
+            break
+
+    # Groups still running release what they open from now on; release what they already found
+    with search["lock"]:
+        search["closed"] = True
+        found = [results[0] for thread, results, attempts in groups if results]
+    for probe in found:
+        if probe is not chosen:
+            probe.release()
+
+    if chosen is None:
+        print(f"No working camera found ({time.time() - start:.1f}s)")
+        _last_choice = None
+        return {"success": False, "error": "Could not access any camera with any method"}
+
+    choice = _choice_from_probe(chosen, cached=False)
+    print(f"Found {chosen.describe()} at {choice['width']}x{choice['height']} ({time.time() - start:.1f}s)")
+    _save_cached_choice(fingerprint, choice, cache_file)
+    return _finish(choice, chosen, keep_open)
+
+
+def _finish(choice, probe, keep_open):
+    global _last_choice
+    _last_choice = dict(choice)
+    if keep_open:
+        with probe._lock:
+            choice["capture"], probe.capture = probe.capture, None
+    else:
+        probe.release()
+    return choice
+
+
+def open_camera(timeout=PROBE_TIMEOUT):
+    """Return an opened cv2.VideoCapture for the discovered camera, or None"""
+    choice = discover_camera(timeout=timeout, keep_open=True)
+    if not choice["success"]:
+        return None
+    return choice["capture"]
+
+
+def forget_camera(cache_file=CACHE_FILE):
+    """Drop the cached choice for this device, e.g. after the camera was replaced"""
+    global _last_choice
+    _last_choice = None
+    fingerprint = device_fingerprint()
+    with _cache_lock:
+        try:
+            cache = load_json(cache_file, {}) or {}
+            if cache.pop(fingerprint, None) is not None:
+                atomic_write_json(cache_file, cache, indent=2)
+        except Exception as e:
+            print(f"Error updating camera cache: {e}")
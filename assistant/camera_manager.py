@@ -0,0 +1,237 @@
+# camera_manager.py
+
+import threading
+
+from assistant.camera_discovery import discover_camera, open_camera
+from assistant.camera_stream import CameraStream
+from assistant.capture_settings import DEFAULT_PRESET, get_preset, apply_capture_settings
+
+IDLE_TIMEOUT = 10.0  # Seconds the device stays open after the last consumer is done
+
+
+class FrameSubscription:
+    """One consumer's handle on the shared camera.
+
+    read() returns the newest frame this subscription hasn't seen yet.
+    Frames are shared with every other subscriber, so copy one before
+    drawing on it. close() (or leaving a with block) hands the device back.
+    """
+
+    def __init__(self, manager, name):
+        self.manager = manager
+        self.name = name
+        self.closed = False
+        self._stream = None
+        self._seq = 0
+
+    def read(self, timeout=1.0):
+        """Return (frame, seq, timestamp), or (None, seq, 0.0) if no new frame arrived in time"""
+        stream = self.manager._stream
+        if self.closed or stream is None:
+            return None, self._seq, 0.0
+        if stream is not self._stream:
+            # The device was reopened; its frame numbers start again
+            self._stream, self._seq = stream, 0
+        frame, self._seq, timestamp = stream.read(self._seq, timeout)
+        return frame, self._seq, timestamp
+
+    def is_running(self):
+        stream = self.manager._stream
+        return not self.closed and stream is not None and stream.is_running()
+
+    def stats(self):
+        return self.manager.stats()
+
+    def as_capture(self):
+        """Wrap the subscription in a cv2.VideoCapture-like object (isOpened/read/release)"""
+        return SharedCapture(self)
+
+    def close(self):
+        """Stop using the camera"""
+        if not self.closed:
+            self.closed = True
+            self.manager._release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SharedCapture:
+    """A FrameSubscription behind the cv2.VideoCapture interface, for code written against captures"""
+
+    def __init__(self, subscription):
+        self.subscription = subscription
+
+    def isOpened(self):
+        return self.subscription.is_running()
+
+    def read(self):
+        frame, seq, timestamp = self.subscription.read()
+        return frame is not None, frame
+
+    def release(self):
+        self.subscription.close()
+
+
+class CameraManager:
+    """Owns the camera device and shares its frames between consumers.
+
+    acquire() opens the device on first use (through camera discovery),
+    negotiates a capture preset (format, resolution and frame rate) once,
+    and starts a single CameraStream; every caller gets its own
+    FrameSubscription to it. A caller asking for a different preset gets
+    it only while nobody else is subscribed; otherwise it shares the
+    current format. The device is reference counted: when the last
+    subscription is closed it stays open for idle_timeout seconds, so
+    switching from recognition to registration or the camera test doesn't
+    pay device initialization again, and is then released.
+    """
+
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, preset=DEFAULT_PRESET):
+        self.idle_timeout = idle_timeout
+        self.default_preset = preset
+        self.preset = None  # Name of the preset the open device was negotiated with
+        self.settings = {}  # What the driver actually granted
+
+        self._lock = threading.RLock()
+        self._stream = None
+        self._subscribers = []
+        self._idle_timer = None
+        self.opens = 0  # Times the device was opened, for diagnostics
+
+    def acquire(self, name="consumer", preset=None):
+        """Return a FrameSubscription to the shared camera, or None if no camera works"""
+        preset = preset or self.default_preset
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._stream is None or not self._stream.is_running():
+                if self._stream is not None:
+                    self._stream.stop()
+                    self._stream = None
+                if not self._open(preset):
+                    if not self._subscribers:
+                        self._schedule_idle_release()
+                    return None
+            elif preset != self.preset:
+                if self._subscribers:
+                    print(f"Camera is shared in '{self.preset}' mode; '{name}' can't switch it to '{preset}'")
+                else:
+                    self._renegotiate(preset)
+            subscription = FrameSubscription(self, name)
+            self._subscribers.append(subscription)
+            return subscription
+
+    def _open(self, preset):
+        """Open the device and start the capture thread; the caller holds the lock"""
+        capture = open_camera()
+        if capture is None:
+            return False
+        self._negotiate(capture, preset)
+        self._stream = CameraStream(capture).start()
+        self.opens += 1
+        print(f"Camera opened for shared use: {self.settings}")
+        return True
+
+    def _negotiate(self, capture, preset):
+        """Request a preset's format, resolution and frame rate, then record what the driver granted"""
+        settings = get_preset(preset)
+        try:
+            granted = apply_capture_settings(capture, settings["fourcc"], settings["width"],
+                                             settings["height"], settings["fps"])
+        except Exception as e:
+            print(f"Error applying capture preset '{settings['name']}': {e}")
+            granted = {}
+        self.preset = settings["name"]
+        self.settings = dict(granted, preset=settings["name"])
+
+    def _renegotiate(self, preset):
+        """Switch the open device to another preset; the caller holds the lock and nobody is subscribed"""
+        capture = self._stream.capture
+        self._stream.stop(release=False)
+        self._negotiate(capture, preset)
+        self._stream = CameraStream(capture).start()
+        print(f"Camera switched to '{self.preset}' mode: {self.settings}")
+
+    def _release(self, subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+            if not self._subscribers:
+                self._schedule_idle_release()
+
+    def _schedule_idle_release(self):
+        self._cancel_idle_timer()
+        if self._stream is None:
+            return
+        self._idle_timer = threading.Timer(self.idle_timeout, self._release_if_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _release_if_idle(self):
+        with self._lock:
+            if self._subscribers or self._stream is None:
+                return
+            print("Camera idle, releasing device")
+            self._stream.stop()
+            self._stream = None
+            self._idle_timer = None
+
+    def is_available(self):
+        """True if the camera is open already or camera discovery finds one"""
+        with self._lock:
+            if self._stream is not None and self._stream.is_running():
+                return True
+        return discover_camera()["success"]
+
+    def is_open(self):
+        with self._lock:
+            return self._stream is not None
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def stats(self):
+        """Return capture counters and the negotiated settings"""
+        with self._lock:
+            stream = self._stream
+            stats = {
+                "subscribers": len(self._subscribers),
+                "opens": self.opens,
+                "settings": dict(self.settings),
+            }
+        if stream is not None:
+            stats.update(stream.stats())
+        return stats
+
+    def close(self):
+        """Release the device now, whoever is still subscribed"""
+        with self._lock:
+            self._cancel_idle_timer()
+            for subscription in self._subscribers:
+                subscription.closed = True
+            self._subscribers = []
+            if self._stream is not None:
+                self._stream.stop()
+                self._stream = None
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_camera_manager():
+    """Return the camera manager shared by the whole application"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = CameraManager()
+        return _manager
@@ -0,0 +1,129 @@
+# camera_stream.py
+
+import threading
+import time
+
+
+class CameraStream:
+    """Grabs frames on a background thread into a single-slot latest-frame buffer.
+
+    The grab loop never waits for consumers: each new frame replaces the
+    previous one, so slow processing (detection, recognition, speech) always
+    continues with the freshest image instead of draining a backlog from the
+    driver. Frames that were replaced before anyone read them are counted as
+    dropped. Frames handed out are shared; copy one before drawing on it if
+    another consumer may read it too.
+    """
+
+    def __init__(self, capture, max_failures=50):
+        self.capture = capture  # An opened cv2.VideoCapture (or anything with read()/release())
+        self.max_failures = max_failures  # Consecutive failed reads before the stream gives up
+
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0  # Sequence number of the frame in the buffer, 0 = none yet
+        self._timestamp = 0.0  # time.time() when the buffered frame was grabbed
+        self._delivered_seq = 0  # Newest sequence number handed to a consumer
+        self._running = False
+        self._thread = None
+
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+        self.fps = 0.0  # Smoothed capture rate
+
+    def start(self):
+        """Start the capture thread"""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_worker, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, release=True):
+        """Stop the capture thread and optionally release the device"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+        if release:
+            try:
+                self.capture.release()
+            except Exception as e:
+                print(f"Error releasing camera: {e}")
+
+    def is_running(self):
+        return self._running
+
+    def _capture_worker(self):
+        failures = 0
+        last_time = None
+
+        while self._running:
+            ret, frame = self.capture.read()
+            now = time.time()
+
+            if not ret or frame is None:
+                self.read_failures += 1
+                failures += 1
+                if failures >= self.max_failures:
+                    print("Camera stopped delivering frames")
+                    with self._cond:
+                        self._running = False
+                        self._cond.notify_all()
+                    return
+                time.sleep(0.01)
+                continue
+            failures = 0
+
+            if last_time is not None and now > last_time:
+                self.fps = 0.9 * self.fps + 0.1 * (1.0 / (now - last_time)) if self.fps else 1.0 / (now - last_time)
+            last_time = now
+
+            with self._cond:
+                if self._seq > self._delivered_seq:
+                    self.frames_dropped += 1
+                self._frame = frame
+                self._seq += 1
+                self._timestamp = now
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    def read(self, after_seq=0, timeout=1.0):
+        """Return (frame, seq, timestamp) for the newest frame newer than after_seq
+
+        Waits up to timeout seconds for such a frame; returns (None, after_seq, 0.0)
+        if none arrives or the stream stopped. Pass the seq from the previous
+        call to never process the same frame twice.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._seq <= after_seq:
+                remaining = deadline - time.monotonic()
+                if not self._running or remaining <= 0:
+                    return None, after_seq, 0.0
+                self._cond.wait(remaining)
+            self._delivered_seq = max(self._delivered_seq, self._seq)
+            return self._frame, self._seq, self._timestamp
+
+    def latest(self):
+        """Return (frame, seq, timestamp) of the buffered frame without waiting"""
+        with self._cond:
+            if self._seq:
+                self._delivered_seq = max(self._delivered_seq, self._seq)
+            return self._frame, self._seq, self._timestamp
+
+    def stats(self):
+        """Return capture counters for diagnostics"""
+        with self._cond:
+            age = time.time() - self._timestamp if self._seq else None
+        return {
+            "frames_captured": self.frames_captured,
+            "frames_dropped": self.frames_dropped,
+            "read_failures": self.read_failures,
+            "fps": round(self.fps, 1),
+            "latest_frame_age": round(age, 3) if age is not None else None,
+        }
@@ -0,0 +1,108 @@
+# capture_settings.py
+
+import time
+
+import cv2
+
+# Capture formats requested from the driver; None leaves a setting at the driver default.
+# MJPG is compressed on the camera, so 640x480 or 720p at full frame rate fits in USB 2.0
+# bandwidth, where uncompressed YUYV at the same size often drops to 5-10 fps
+CAPTURE_PRESETS = {
+    "detection": {
+        "label": "low-CPU detection",
+        "fourcc": "MJPG", "width": 640, "height": 480, "fps": 30,
+    },
+    "registration": {
+        "label": "registration quality",
+        "fourcc": "MJPG", "width": 1280, "height": 720, "fps": 15,
+    },
+    "default": {
+        "label": "driver default",
+        "fourcc": None, "width": None, "height": None, "fps": None,
+    },
+}
+DEFAULT_PRESET = "detection"
+
+
+def decode_fourcc(value):
+    """Turn the number from CAP_PROP_FOURCC into its four-letter code"""
+    value = int(value)
+    if value <= 0:
+        return None
+    code = "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+    return code if code.isprintable() else None
+
+
+def get_preset(name):
+    """Return the preset settings, falling back to the default preset for unknown names"""
+    if name not in CAPTURE_PRESETS:
+        print(f"Unknown capture preset '{name}', using '{DEFAULT_PRESET}'")
+        name = DEFAULT_PRESET
+    return dict(CAPTURE_PRESETS[name], name=name)
+
+
+def read_capture_settings(capture):
+    """Return the format the driver reports for an open capture"""
+    return {
+        "fourcc": decode_fourcc(capture.get(cv2.CAP_PROP_FOURCC)),
+        "width": int(capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        "height": int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        "fps": round(capture.get(cv2.CAP_PROP_FPS), 1),
+    }
+
+
+def apply_capture_settings(capture, fourcc=None, width=None, height=None, fps=None):
+    """Request a capture format, then report what the driver actually granted
+
+    The FOURCC is set first because many drivers only offer some sizes and
+    rates in a given format. Returns the granted settings plus "mismatches",
+    a list of the requested settings the driver didn't honour.
+    """
+    if fourcc:
+        capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+    if width and height:
+        capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+    if fps:
+        capture.set(cv2.CAP_PROP_FPS, fps)
+
+    granted = read_capture_settings(capture)
+    mismatches = []
+    if fourcc and granted["fourcc"] != fourcc:
+        mismatches.append(f"format {fourcc} -> {granted['fourcc']}")
+    if width and height and (granted["width"], granted["height"]) != (width, height):
+        mismatches.append(f"size {width}x{height} -> {granted['width']}x{granted['height']}")
+    # Drivers often report 0 or a rounded rate; only a clearly lower rate counts
+    if fps and granted["fps"] and granted["fps"] < fps * 0.9:
+        mismatches.append(f"fps {fps} -> {granted['fps']}")
+    if mismatches:
+        print(f"Camera driver didn't grant the requested format: {', '.join(mismatches)}")
+    granted["mismatches"] = mismatches
+    return granted
+
+
+def measure_throughput(capture, frames=60, warmup=5):
+    """Read frames as fast as the camera delivers them; returns fps and frame size"""
+    for _ in range(warmup):
+        capture.read()
+
+    read_count = failures = 0
+    shape = None
+    start = time.perf_counter()
+    while read_count + failures < frames:
+        ret, frame = capture.read()
+        if ret and frame is not None:
+            read_count += 1
+            shape = frame.shape
+        else:
+            failures += 1
+            if failures >= frames // 2:
+                break
+    elapsed = time.perf_counter() - start
+    return {
+        "frames": read_count,
+        "failures": failures,
+        "seconds": round(elapsed, 3),
+        "fps": round(read_count / elapsed, 1) if elapsed > 0 else 0.0,
+        "frame_size": (shape[1], shape[0]) if shape else None,
+    }
@@ -0,0 +1,124 @@
+# face_detection.py
+
+import cv2
+import numpy as np
+
+
+def box_iou(a, b):
+    """Intersection over union of two (x, y, w, h) boxes"""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    inter_w = min(ax + aw, bx + bw) - max(ax, bx)
+    inter_h = min(ay + ah, by + bh) - max(ay, by)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    return inter / float(aw * ah + bw * bh - inter)
+
+
+def _dedupe(boxes, iou_threshold=0.4):
+    """Drop boxes that overlap an earlier, larger box"""
+    kept = []
+    for box in sorted(boxes, key=lambda b: b[2] * b[3], reverse=True):
+        if all(box_iou(box, other) < iou_threshold for other in kept):
+            kept.append(box)
+    return kept
+
+
+class FaceDetector:
+    """Haar cascade face detection tuned for a live camera feed.
+
+    The cascade runs on a copy of the frame scaled down to detect_width
+    pixels wide, and boxes are mapped back to full resolution. Every
+    full_detect_interval frames (or whenever no face is known) the whole
+    frame is searched; in between, only a padded region around each known
+    face is searched, at scales close to that face's size and at a resolution
+    where it is roi_face_size pixels wide. New faces
+    entering the picture are therefore found within full_detect_interval
+    frames.
+    """
+
+    def __init__(self, cascade, detect_width=480, scale_factor=1.15, min_neighbors=5,
+                 min_size=(30, 30), full_detect_interval=6, roi_padding=0.5, roi_face_size=64):
+        self.cascade = cascade  # cv2.CascadeClassifier
+        # Width the frame is scaled to before the full search; None = full size. The cascade's
+        # smallest face is 24 pixels at this width, e.g. 64 pixels in a 1280 pixel wide frame at 480
+        self.detect_width = detect_width
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size  # Smallest face, in full-resolution pixels
+        self.full_detect_interval = full_detect_interval  # 1 = search the whole frame every time
+        self.roi_padding = roi_padding  # Search margin around a known face, as a fraction of its size
+        self.roi_face_size = roi_face_size  # Width a known face is scaled to for the region search
+
+        self.faces = []  # Last detected boxes, full resolution
+        self.frames_since_full = 0
+        self.full_detections = 0
+        self.roi_detections = 0
+
+    def reset(self):
+        """Forget known faces so the next frame gets a full detection"""
+        self.faces = []
+        self.frames_since_full = 0
+
+    def _scale_for(self, gray):
+        width = gray.shape[1]
+        if not self.detect_width or width <= self.detect_width:
+            return 1.0
+        return self.detect_width / float(width)
+
+    def _run_cascade(self, image, min_size, max_size=None):
+        min_size = (max(int(min_size[0]), 1), max(int(min_size[1]), 1))
+        kwargs = {"scaleFactor": self.scale_factor, "minNeighbors": self.min_neighbors, "minSize": min_size}
+        if max_size is not None:
+            kwargs["maxSize"] = (int(max_size[0]), int(max_size[1]))
+        return self.cascade.detectMultiScale(image, **kwargs)
+
+    def _full_detection(self, small, scale):
+        self.full_detections += 1
+        found = self._run_cascade(small, (self.min_size[0] * scale, self.min_size[1] * scale))
+        return [tuple(int(round(v / scale)) for v in box) for box in found]
+
+    def _roi_detection(self, gray):
+        self.roi_detections += 1
+        height, width = gray.shape[:2]
+        found = []
+        for (x, y, w, h) in self.faces:
+            # Known face padded on every side, cut from the full-resolution frame
+            pad_w, pad_h = w * self.roi_padding, h * self.roi_padding
+            x0, y0 = max(int(x - pad_w), 0), max(int(y - pad_h), 0)
+            x1, y1 = min(int(x + w + pad_w), width), min(int(y + h + pad_h), height)
+            if x1 - x0 < 24 or y1 - y0 < 24:
+                continue
+
+            # Scale the region so the face is roi_face_size pixels wide; the cascade is
+            # unreliable on faces close to its 24 pixel window, so small faces are not shrunk
+            scale = min(1.0, self.roi_face_size / float(w))
+            roi = gray[y0:y1, x0:x1]
+            if scale < 1.0:
+                roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+            # Only look for faces of roughly the same size as before
+            min_size = (max(w * 0.7, self.min_size[0]) * scale, max(h * 0.7, self.min_size[1]) * scale)
+            max_size = (min(w * 1.4 * scale, roi.shape[1]), min(h * 1.4 * scale, roi.shape[0]))
+            if max_size[0] < min_size[0] or max_size[1] < min_size[1]:
+                max_size = None
+            for (fx, fy, fw, fh) in self._run_cascade(roi, min_size, max_size):
+                found.append((int(round(fx / scale)) + x0, int(round(fy / scale)) + y0,
+                              int(round(fw / scale)), int(round(fh / scale))))
+        return _dedupe(found)
+
+    def detect(self, gray):
+        """Return the faces in a grayscale frame as an (n, 4) array of full-resolution boxes"""
+        if not self.faces or self.frames_since_full + 1 >= self.full_detect_interval:
+            scale = self._scale_for(gray)
+            small = gray
+            if scale < 1.0:
+                small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            self.faces = self._full_detection(small, scale)
+            self.frames_since_full = 0
+        else:
+            self.faces = self._roi_detection(gray)
+            self.frames_since_full += 1
+
+        return np.array(self.faces, dtype=np.int32).reshape(-1, 4)
@@ -0,0 +1,187 @@
+# face_samples.py
+
+import os
+import threading
+
+import cv2
+import numpy as np
+
+from assistant.state_store import atomic_write_json, load_json
+
+SAMPLE_SIZE = (100, 100)  # (width, height) every stored face is scaled to
+
+
+def normalize_face(gray_face, size=SAMPLE_SIZE):
+    """Scale a grayscale face crop to the stored sample size and equalize its histogram"""
+    interpolation = cv2.INTER_AREA if gray_face.shape[1] > size[0] else cv2.INTER_LINEAR
+    face = cv2.resize(gray_face, size, interpolation=interpolation)
+    return cv2.equalizeHist(np.ascontiguousarray(face, dtype=np.uint8))
+
+
+class FaceSampleStore:
+    """Normalized face samples kept on disk so the model can be rebuilt without recapturing anyone.
+
+    Samples live in one memory-mapped .npy array of shape (capacity, height,
+    width) uint8; an index file lists the user ID of each used row and
+    names the current array file. Adding samples writes into spare rows
+    and then rewrites the index, so the index is the commit point: rows it
+    doesn't count are ignored after a crash. Growing the array or removing
+    a user writes a new generation of the array file and switches the
+    index to it, leaving the old file intact until the switch is done.
+    """
+
+    def __init__(self, directory, size=SAMPLE_SIZE, initial_capacity=256):
+        self.directory = directory
+        self.size = tuple(size)
+        self.initial_capacity = initial_capacity
+        self.index_path = os.path.join(directory, "face_samples.json")
+        self._lock = threading.Lock()
+        self._array = None  # np.memmap of shape (capacity, height, width)
+        self._file = None  # Current array file name, relative to directory
+        self._generation = 0
+        self._user_ids = []  # User ID per used row
+        self._rows_by_user = {}
+        self._load()
+
+    def _load(self):
+        try:
+            index = load_json(self.index_path)
+        except Exception as e:
+            print(f"Error reading face sample index: {e}")
+            index = None
+        if not index:
+            return
+        if tuple(index.get("size", ())) != self.size:
+            print(f"Stored face samples are {index.get('size')}, expected {list(self.size)}; ignoring them")
+            return
+        path = os.path.join(self.directory, index["file"])
+        if not os.path.exists(path):
+            print(f"Face sample file {path} is missing")
+            return
+        self._array = np.load(path, mmap_mode="r+")
+        self._file = index["file"]
+        self._generation = index.get("generation", 0)
+        self._user_ids = [int(user_id) for user_id in index["user_ids"]][:len(self._array)]
+        self._rebuild_user_index()
+
+        # Generations left behind by a crash during a switch
+        for name in os.listdir(self.directory):
+            if name.startswith("face_samples_") and name.endswith(".npy") and name != self._file:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _rebuild_user_index(self):
+        self._rows_by_user = {}
+        for row, user_id in enumerate(self._user_ids):
+            self._rows_by_user.setdefault(user_id, []).append(row)
+
+    def _write_index(self):
+        atomic_write_json(self.index_path, {
+            "size": list(self.size),
+            "file": self._file,
+            "generation": self._generation,
+            "user_ids": self._user_ids,
+        })
+
+    def _new_array(self, capacity, rows=None):
+        """Create the next generation of the array file, optionally filled with rows; returns (name, array)"""
+        self._generation += 1
+        name = f"face_samples_{self._generation}.npy"
+        array = np.lib.format.open_memmap(os.path.join(self.directory, name), mode="w+", dtype=np.uint8,
+                                          shape=(capacity, self.size[1], self.size[0]))
+        if rows is not None and len(rows):
+            array[:len(rows)] = rows
+        array.flush()
+        return name, array
+
+    def _switch_to(self, name, array, user_ids):
+        old_file = self._file
+        self._array, self._file, self._user_ids = array, name, user_ids
+        self._write_index()
+        self._rebuild_user_index()
+        if old_file and old_file != name:
+            try:
+                os.remove(os.path.join(self.directory, old_file))
+            except OSError as e:
+                print(f"Could not remove old face sample file {old_file}: {e}")
+
+    def add(self, user_id, faces, normalized=False):
+        """Store face crops for a user; returns how many were stored"""
+        faces = [face if normalized else normalize_face(face, self.size) for face in faces]
+        if not faces:
+            return 0
+        with self._lock:
+            count = len(self._user_ids)
+            needed = count + len(faces)
+            if self._array is None or needed > len(self._array):
+                capacity = max(self.initial_capacity, len(self._array) * 2 if self._array is not None else 0)
+                while capacity < needed:
+                    capacity *= 2
+                rows = self._array[:count] if self._array is not None else None
+                name, array = self._new_array(capacity, rows)
+                rows = None  # Drop the view so the old file can be deleted on Windows
+                self._switch_to(name, array, self._user_ids)
+
+            self._array[count:needed] = np.stack(faces)
+            self._array.flush()
+            self._user_ids = self._user_ids + [int(user_id)] * len(faces)
+            self._write_index()
+            self._rebuild_user_index()
+        return len(faces)
+
+    def remove_user(self, user_id):
+        """Delete every sample of a user; returns how many were removed"""
+        with self._lock:
+            rows = self._rows_by_user.get(int(user_id), [])
+            if not rows:
+                return 0
+            keep = [row for row, uid in enumerate(self._user_ids) if uid != int(user_id)]
+            name, array = self._new_array(max(len(self._array), self.initial_capacity), self._array[keep])
+            self._switch_to(name, array, [self._user_ids[row] for row in keep])
+            return len(rows)
+
+    def user_ids(self):
+        """Return the IDs of users that have stored samples"""
+        with self._lock:
+            return sorted(self._rows_by_user)
+
+    def counts(self):
+        """Return {user_id: number of samples}"""
+        with self._lock:
+            return {user_id: len(rows) for user_id, rows in self._rows_by_user.items()}
+
+    def samples_for(self, user_id):
+        """Return a copy of one user's samples as an (n, height, width) array"""
+        with self._lock:
+            rows = self._rows_by_user.get(int(user_id), [])
+            if not rows:
+                return np.empty((0, self.size[1], self.size[0]), dtype=np.uint8)
+            return np.array(self._array[rows])
+
+    def training_data(self):
+        """Return (samples, labels) for every stored sample, ready for LBPH train()"""
+        with self._lock:
+            count = len(self._user_ids)
+            if not count:
+                return [], np.array([], dtype=np.int32)
+            samples = np.array(self._array[:count])
+            labels = np.array(self._user_ids, dtype=np.int32)
+        return list(samples), labels
+
+    def __len__(self):
+        return len(self._user_ids)
+
+
+_shared_stores = {}
+_shared_stores_lock = threading.Lock()
+
+
+def get_face_sample_store(directory):
+    """Return the FaceSampleStore shared by every recognizer using the same data directory"""
+    key = os.path.abspath(directory)
+    with _shared_stores_lock:
+        if key not in _shared_stores:
+            _shared_stores[key] = FaceSampleStore(directory)
+        return _shared_stores[key]
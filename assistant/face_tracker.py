@@ -0,0 +1,116 @@
+# face_tracker.py
+
+from collections import Counter
+
+from assistant.face_detection import box_iou
+
+
+class FaceTrack:
+    """One face followed across frames, with the identity votes collected for it"""
+
+    def __init__(self, track_id, box):
+        self.track_id = track_id
+        self.box = tuple(int(v) for v in box)
+        self.votes = []  # (user_id or None for unknown, confidence) per prediction
+        self.identity = None  # Winning user_id once decided; None = unknown or undecided
+        self.confidence = None  # Mean LBPH distance of the winning votes
+        self.decided = False
+        self.hits = 1  # Frames the face was detected in
+        self.misses = 0  # Consecutive detection passes the face was missing from
+
+    def needs_prediction(self):
+        """True while the track still has to be shown to the recognizer"""
+        return not self.decided
+
+
+class FaceTracker:
+    """Gives detected faces persistent track IDs by matching boxes between frames.
+
+    Each detection pass is matched greedily to the existing tracks by
+    intersection over union. A track collects up to max_votes recognizer
+    predictions and settles on an identity as soon as one answer has a
+    majority of votes_needed votes (or the most votes once max_votes are
+    in); after that it is never predicted again until it is lost, i.e.
+    missing from more than max_misses consecutive detection passes.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_misses=5, votes_needed=3, max_votes=7,
+                 confidence_threshold=100):
+        self.iou_threshold = iou_threshold  # Overlap a box needs with a track to continue it
+        self.max_misses = max_misses
+        self.votes_needed = votes_needed
+        self.max_votes = max_votes
+        self.confidence_threshold = confidence_threshold  # LBPH distance below which a match counts
+
+        self.tracks = []
+        self.lost_tracks = []  # Tracks dropped by the last update()
+        self._next_id = 1
+        self.tracks_created = 0
+        self.predictions = 0
+
+    def reset(self):
+        """Drop every track"""
+        self.tracks = []
+        self.lost_tracks = []
+
+    def update(self, boxes):
+        """Match one detection pass against the tracks; returns the tracks seen in it"""
+        pairs = []
+        for track_index, track in enumerate(self.tracks):
+            for box_index, box in enumerate(boxes):
+                overlap = box_iou(track.box, box)
+                if overlap >= self.iou_threshold:
+                    pairs.append((overlap, track_index, box_index))
+        pairs.sort(reverse=True)
+
+        matched_tracks, matched_boxes = set(), set()
+        for overlap, track_index, box_index in pairs:
+            if track_index in matched_tracks or box_index in matched_boxes:
+                continue
+            track = self.tracks[track_index]
+            track.box = tuple(int(v) for v in boxes[box_index])
+            track.hits += 1
+            track.misses = 0
+            matched_tracks.add(track_index)
+            matched_boxes.add(box_index)
+
+        kept, self.lost_tracks = [], []
+        for track_index, track in enumerate(self.tracks):
+            if track_index not in matched_tracks:
+                track.misses += 1
+                if track.misses > self.max_misses:
+                    self.lost_tracks.append(track)
+                    continue
+            kept.append(track)
+        self.tracks = kept
+
+        for box_index, box in enumerate(boxes):
+            if box_index not in matched_boxes:
+                self.tracks.append(FaceTrack(self._next_id, box))
+                self._next_id += 1
+                self.tracks_created += 1
+
+        return [track for track in self.tracks if track.misses == 0]
+
+    def add_prediction(self, track, user_id, confidence):
+        """Record one recognizer answer for a track; returns True once the track is decided"""
+        self.predictions += 1
+        label = user_id if confidence < self.confidence_threshold else None
+        track.votes.append((label, confidence))
+
+        counts = Counter(label for label, _ in track.votes)
+        winner, count = counts.most_common(1)[0]
+        if count * 2 > self.votes_needed or len(track.votes) >= self.max_votes:
+            track.identity = winner
+            distances = [c for label, c in track.votes if label == winner]
+            track.confidence = sum(distances) / len(distances)
+            track.decided = True
+        return track.decided
+
+    def stats(self):
+        """Return tracking counters for diagnostics"""
+        return {
+            "active_tracks": len(self.tracks),
+            "tracks_created": self.tracks_created,
+            "predictions": self.predictions,
+        }
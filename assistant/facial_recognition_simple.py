@@ -1,63 +1,63 @@
-# facial_recognition_simple.py
-# A simplified version of facial recognition that doesn't rely on OpenCV
-
-class FacialRecognizer:
-    def __init__(self):
-        self.labels = {}  # Initialize empty labels dict
-        self.recognized_users = set()
-        self.is_running = False
-        self.recognition_thread = None
-        print("Initialized simplified facial recognition (without OpenCV)")
-    
-    def is_camera_available(self):
-        """Check if a camera is available on the system"""
-        # Always return False since we can't check without OpenCV
-        print("Camera availability check bypassed (OpenCV not available)")
-        return False
-    
-    def load_model(self):
-        """Stub for loading models"""
-        print("Model loading bypassed (OpenCV not available)")
-        return False
-    
-    def save_model(self):
-        """Stub for saving models"""
-        print("Model saving bypassed (OpenCV not available)")
-        return False
-    
-    def add_new_user(self):
-        """Stub for adding a new user"""
-        from assistant.text_to_speech import speak
-        speak("I'm sorry, facial recognition is not available because OpenCV is not installed.")
-        speak("Please install OpenCV to use this feature.")
-        print("To install OpenCV, run: conda install -c conda-forge opencv")
-        return False
-    
-    def start_recognition(self):
-        """Stub for starting recognition"""
-        from assistant.text_to_speech import speak
-        speak("I'm sorry, facial recognition is not available because OpenCV is not installed.")
-        speak("Please install OpenCV to use this feature.")
-        print("To install OpenCV, run: conda install -c conda-forge opencv")
-        return False
-    
-    def stop_recognition(self):
-        """Stub for stopping recognition"""
-        self.is_running = False
-        return True
-    
-    def list_users(self):
-        """Stub for listing users"""
-        from assistant.text_to_speech import speak
-        speak("I'm sorry, facial recognition is not available because OpenCV is not installed.")
-        speak("Please install OpenCV to use this feature.")
-        print("To install OpenCV, run: conda install -c conda-forge opencv")
-        return []
-    
-    def remove_user(self, user_name):
-        """Stub for removing a user"""
-        from assistant.text_to_speech import speak
-        speak("I'm sorry, facial recognition is not available because OpenCV is not installed.")
-        speak("Please install OpenCV to use this feature.")
-        print("To install OpenCV, run: conda install -c conda-forge opencv")
+# facial_recognition_simple.py
+# A simplified version of facial recognition that doesn't rely on OpenCV
+
+class FacialRecognizer:
+    def __init__(self):
+        self.labels = {}  # Initialize empty labels dict
+        self.recognized_users = set()
+        self.is_running = False
+        self.recognition_thread = None
+        print("Initialized simplified facial recognition (without OpenCV)")
+    
+    def is_camera_available(self):
+        """Check if a camera is available on the system"""
+        # Always return False since we can't check without OpenCV
+        print("Camera availability check bypassed (OpenCV not available)")
+        return False
+    
+    def load_model(self):
+        """Stub for loading models"""
+        print("Model loading bypassed (OpenCV not available)")
+        return False
+    
+    def save_model(self):
+        """Stub for saving models"""
+        print("Model saving bypassed (OpenCV not available)")
+        return False
+    
+    def add_new_user(self):
+        """Stub for adding a new user"""
+        from assistant.text_to_speech import speak
+        speak("I'm sorry, facial recognition is not available because OpenCV is not installed.")
+        speak("Please install OpenCV to use this feature.")
+        print("To install OpenCV, run: conda install -c conda-forge opencv")
+        return False
+    
+    def start_recognition(self):
+        """Stub for starting recognition"""
+        from assistant.text_to_speech import speak
+        speak("I'm sorry, facial recognition is not available because OpenCV is not installed.")
+        speak("Please install OpenCV to use this feature.")
+        print("To install OpenCV, run: conda install -c conda-forge opencv")
+        return False
+    
+    def stop_recognition(self):
+        """Stub for stopping recognition"""
+        self.is_running = False
+        return True
+    
+    def list_users(self):
+        """Stub for listing users"""
+        from assistant.text_to_speech import speak
+        speak("I'm sorry, facial recognition is not available because OpenCV is not installed.")
+        speak("Please install OpenCV to use this feature.")
+        print("To install OpenCV, run: conda install -c conda-forge opencv")
+        return []
+    
+    def remove_user(self, user_name):
+        """Stub for removing a user"""
+        from assistant.text_to_speech import speak
+        speak("I'm sorry, facial recognition is not available because OpenCV is not installed.")
+        speak("Please install OpenCV to use this feature.")
+        print("To install OpenCV, run: conda install -c conda-forge opencv")
         return False
\ No newline at end of file
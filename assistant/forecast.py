@@ -0,0 +1,175 @@
+# forecast.py
+
+import datetime
+import numpy as np
+
+SLOT_SECONDS = 3 * 60 * 60  # The 5-day forecast uses 3-hour slots
+DAY_SECONDS = 24 * 60 * 60
+
+# OpenWeatherMap condition code groups (https://openweathermap.org/weather-conditions)
+CONDITION_GROUPS = [
+    (200, 300, "Thunderstorm"),
+    (300, 400, "Drizzle"),
+    (500, 600, "Rain"),
+    (600, 700, "Snow"),
+    (700, 800, "Atmosphere"),
+    (800, 801, "Clear"),
+    (801, 900, "Clouds"),
+]
+
+
+def condition_name(code):
+    """Return the condition group name for an OpenWeatherMap condition code"""
+    for low, high, name in CONDITION_GROUPS:
+        if low <= code < high:
+            return name
+    return "Unknown"
+
+
+class ForecastTable:
+    """Columnar view of the full 5-day/3-hour forecast payload.
+
+    The payload is parsed once into NumPy arrays sorted by time; day and
+    time-range questions are then answered with vectorized slices instead of
+    new API calls.
+    """
+
+    def __init__(self, times, temp, temp_min, temp_max, precipitation, pop, codes,
+                 humidity, wind_speed, descriptions, tz_offset=0, location=""):
+        self.times = times  # int64 unix timestamps of each slot start (UTC)
+        self.temp = temp  # float32 degrees Celsius
+        self.temp_min = temp_min
+        self.temp_max = temp_max
+        self.precipitation = precipitation  # float32 mm of rain + snow in the slot
+        self.pop = pop  # float32 probability of precipitation, 0..1
+        self.codes = codes  # int16 OpenWeatherMap condition codes
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.descriptions = descriptions  # Plain list, only used for display
+        self.tz_offset = tz_offset  # Seconds east of UTC for the forecast location
+        self.location = location
+
+        # Local calendar day of every slot, as days since the epoch
+        self.local_days = (self.times + self.tz_offset) // DAY_SECONDS
+
+    @classmethod
+    def from_payload(cls, data):
+        """Build a table from an OpenWeatherMap /forecast response"""
+        items = sorted(data.get("list", []), key=lambda item: item["dt"])
+        count = len(items)
+
+        times = np.fromiter((item["dt"] for item in items), dtype=np.int64, count=count)
+        temp = np.fromiter((item["main"]["temp"] for item in items), dtype=np.float32, count=count)
+        temp_min = np.fromiter((item["main"].get("temp_min", item["main"]["temp"]) for item in items),
+                               dtype=np.float32, count=count)
+        temp_max = np.fromiter((item["main"].get("temp_max", item["main"]["temp"]) for item in items),
+                               dtype=np.float32, count=count)
+        precipitation = np.fromiter(
+            (item.get("rain", {}).get("3h", 0) + item.get("snow", {}).get("3h", 0) for item in items),
+            dtype=np.float32, count=count
+        )
+        pop = np.fromiter((item.get("pop", 0) for item in items), dtype=np.float32, count=count)
+        codes = np.fromiter((item["weather"][0].get("id", 0) for item in items), dtype=np.int16, count=count)
+        humidity = np.fromiter((item["main"].get("humidity", 0) for item in items), dtype=np.float32, count=count)
+        wind_speed = np.fromiter((item.get("wind", {}).get("speed", 0) for item in items),
+                                 dtype=np.float32, count=count)
+        descriptions = [item["weather"][0]["description"] for item in items]
+
+        city = data.get("city", {})
+        return cls(times, temp, temp_min, temp_max, precipitation, pop, codes, humidity,
+                   wind_speed, descriptions, tz_offset=city.get("timezone", 0),
+                   location=city.get("name", ""))
+
+    def __len__(self):
+        return len(self.times)
+
+    def _slice(self, start, end):
+        """Return the index range of slots overlapping [start, end)"""
+        first = int(np.searchsorted(self.times, start - SLOT_SECONDS, side="right"))
+        last = int(np.searchsorted(self.times, end, side="left"))
+        return first, last
+
+    def _aggregate(self, first, last):
+        """Summarize slots [first, last) into a single dict"""
+        if first >= last:
+            return None
+
+        precipitation = self.precipitation[first:last]
+        codes = self.codes[first:last]
+        wet = np.flatnonzero(precipitation > 0)
+
+        # Most frequent condition code wins; ties go to the lowest code
+        values, counts = np.unique(codes, return_counts=True)
+        dominant = int(values[np.argmax(counts)])
+
+        return {
+            "start": int(self.times[first]),
+            "end": int(self.times[last - 1]) + SLOT_SECONDS,
+            "min_temp": round(float(self.temp_min[first:last].min())),
+            "max_temp": round(float(self.temp_max[first:last].max())),
+            "avg_temp": round(float(self.temp[first:last].mean())),
+            "total_precipitation": round(float(precipitation.sum()), 1),
+            "max_pop": round(float(self.pop[first:last].max()), 2),
+            "rain_expected": bool(len(wet)),
+            "first_rain": int(self.times[first + wet[0]]) if len(wet) else None,
+            "condition": condition_name(dominant),
+            "condition_code": dominant,
+            "slots": last - first,
+        }
+
+    def window(self, start, end):
+        """Aggregate all slots overlapping the unix time range [start, end)"""
+        return self._aggregate(*self._slice(start, end))
+
+    def entries(self, start, end):
+        """Return the individual slots overlapping [start, end) as dicts"""
+        first, last = self._slice(start, end)
+        return [
+            {
+                "time": datetime.datetime.fromtimestamp(int(self.times[i]), datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                "temperature": round(float(self.temp[i])),
+                "condition": condition_name(int(self.codes[i])),
+                "description": self.descriptions[i],
+                "rain": float(self.precipitation[i]),
+            }
+            for i in range(first, last)
+        ]
+
+    def local_day(self, timestamp):
+        """Return the location's local day number for a unix timestamp"""
+        return (int(timestamp) + self.tz_offset) // DAY_SECONDS
+
+    def days(self, first_day, num_days=1):
+        """Aggregate the location's local days [first_day, first_day + num_days)"""
+        first = int(np.searchsorted(self.local_days, first_day, side="left"))
+        last = int(np.searchsorted(self.local_days, first_day + num_days, side="left"))
+        return self._aggregate(first, last)
+
+    def daily(self):
+        """Return one aggregate per local day covered by the forecast"""
+        if not len(self):
+            return []
+
+        day_numbers, starts = np.unique(self.local_days, return_index=True)
+        # Per-day reductions in a single pass over each column
+        min_temps = np.minimum.reduceat(self.temp_min, starts)
+        max_temps = np.maximum.reduceat(self.temp_max, starts)
+        totals = np.add.reduceat(self.precipitation, starts)
+        max_pops = np.maximum.reduceat(self.pop, starts)
+        ends = np.append(starts[1:], len(self))
+
+        daily = []
+        for i, day in enumerate(day_numbers):
+            date = datetime.date(1970, 1, 1) + datetime.timedelta(days=int(day))
+            values, counts = np.unique(self.codes[starts[i]:ends[i]], return_counts=True)
+            daily.append({
+                "date": date.isoformat(),
+                "weekday": date.strftime("%A"),
+                "min_temp": round(float(min_temps[i])),
+                "max_temp": round(float(max_temps[i])),
+                "total_precipitation": round(float(totals[i]), 1),
+                "max_pop": round(float(max_pops[i]), 2),
+                "rain_expected": bool(totals[i] > 0),
+                "condition": condition_name(int(values[np.argmax(counts)])),
+            })
+        return daily
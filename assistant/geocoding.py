@@ -0,0 +1,130 @@
+# geocoding.py
+
+import json
+import os
+import threading
+from assistant.rate_limiter import parse_retry_after
+from assistant.state_store import atomic_write_json
+
+GEOCODING_URL = "https://api.openweathermap.org/geo/1.0/direct"
+
+
+class LocationNotFoundError(Exception):
+    """Raised when the geocoding API has no match for a location name"""
+
+    def __init__(self, location):
+        self.location = location
+        super().__init__(f"Could not find a location named {location}")
+
+
+def normalize_location(name):
+    """Normalize a free-text location name for cache lookups"""
+    parts = [" ".join(part.split()) for part in name.lower().split(",")]
+    return ", ".join(part for part in parts if part)
+
+
+class LocationResolver:
+    """Resolves free-text place names to coordinates once and caches them on disk.
+
+    Weather requests by coordinates skip the provider's own name lookup and
+    always refer to the same place, even for ambiguous names.
+    """
+
+    def __init__(self, cache_file="geocode_cache.json"):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._places = {}  # normalized name -> {"lat", "lon", "name", "country", "state"}
+        self._pending = {}  # normalized name -> lock held while that name is being geocoded
+        self.load()
+
+    def load(self):
+        """Load resolved locations from disk"""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                self._places = json.load(f)
+        except Exception as e:
+            print(f"Error loading geocoding cache: {e}")
+            self._places = {}
+
+    def save(self):
+        """Save resolved locations to disk"""
+        try:
+            with self._lock:
+                places = dict(self._places)
+            atomic_write_json(self.cache_file, places)
+        except Exception as e:
+            print(f"Error saving geocoding cache: {e}")
+
+    def lookup(self, name):
+        """Return the cached place for a name without using the network, or None"""
+        with self._lock:
+            return self._places.get(normalize_location(name))
+
+    def resolve(self, name, api_key, session, timeout, rate_limiter=None):
+        """Return the place for a name, geocoding it on the first request
+
+        Raises LocationNotFoundError if the name has no match, and lets
+        network and rate limit errors propagate so callers can fall back
+        to cached data.
+        """
+        place = self.lookup(name)
+        if place is not None:
+            return place
+
+        # Concurrent requests for the same new name share a single geocoding call
+        key = normalize_location(name)
+        with self._lock:
+            pending = self._pending.setdefault(key, threading.Lock())
+        with pending:
+            place = self.lookup(name)
+            if place is not None:
+                return place
+            try:
+                return self._geocode(name, api_key, session, timeout, rate_limiter)
+            finally:
+                with self._lock:
+                    self._pending.pop(key, None)
+
+    def _geocode(self, name, api_key, session, timeout, rate_limiter=None):
+        """Query the geocoding API for a name and cache the best match"""
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        params = {"q": name, "limit": 1, "appid": api_key}
+        response = session.get(GEOCODING_URL, params=params, timeout=timeout)
+        if response.status_code == 429 and rate_limiter is not None:
+            rate_limiter.backoff(parse_retry_after(response.headers.get("Retry-After")))
+        if response.status_code != 200:
+            raise ConnectionError(f"Error geocoding {name}: {response.status_code}")
+
+        results = response.json()
+        if not results:
+            raise LocationNotFoundError(name)
+
+        match = results[0]
+        place = {
+            "lat": round(match["lat"], 4),
+            "lon": round(match["lon"], 4),
+            "name": match.get("name", name),
+            "country": match.get("country", ""),
+            "state": match.get("state", ""),
+        }
+        with self._lock:
+            self._places[normalize_location(name)] = place
+        self.save()
+        print(f"Resolved {name} to {place['name']}, {place['country']} ({place['lat']}, {place['lon']})")
+        return place
+
+
+_shared_resolvers = {}
+_shared_resolvers_lock = threading.Lock()
+
+
+def get_location_resolver(cache_file="geocode_cache.json"):
+    """Return the LocationResolver shared by every caller using the same file"""
+    with _shared_resolvers_lock:
+        if cache_file not in _shared_resolvers:
+            _shared_resolvers[cache_file] = LocationResolver(cache_file)
+        return _shared_resolvers[cache_file]
@@ -0,0 +1,69 @@
+# motion_gate.py
+
+import time
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Cheap check run before face detection so a static scene costs almost nothing.
+
+    Each frame is shrunk to a tiny grayscale thumbnail and compared with a
+    running-average background model. Detection should run only when enough
+    thumbnail pixels changed, or when refresh_interval seconds passed since
+    the last detection (so a person sitting perfectly still is still seen).
+    """
+
+    def __init__(self, thumb_size=(32, 24), pixel_threshold=12, motion_threshold=0.02,
+                 learning_rate=0.05, refresh_interval=2.0):
+        self.thumb_size = thumb_size  # (width, height) of the thumbnail
+        self.pixel_threshold = pixel_threshold  # Gray levels a thumbnail pixel must change by to count
+        self.motion_threshold = motion_threshold  # Fraction of changed pixels that counts as motion
+        self.learning_rate = learning_rate  # How fast the background absorbs changes
+        self.refresh_interval = refresh_interval  # Seconds between forced detections
+
+        self.background = None  # float32 thumbnail
+        self.motion = 0.0  # Fraction of changed pixels in the last frame
+        self._last_pass = 0.0
+        self.frames = 0
+        self.passed = 0
+
+    def reset(self):
+        """Forget the background so the next frame always passes"""
+        self.background = None
+
+    def _thumbnail(self, frame):
+        thumb = cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA)
+        if thumb.ndim == 3:
+            thumb = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY)
+        return thumb.astype(np.float32)
+
+    def check(self, frame, now=None):
+        """Update the background with a BGR or grayscale frame; True if detection should run"""
+        now = time.monotonic() if now is None else now
+        thumb = self._thumbnail(frame)
+        self.frames += 1
+
+        if self.background is None:
+            self.background = thumb
+            self.motion = 1.0
+        else:
+            changed = np.abs(thumb - self.background) > self.pixel_threshold
+            self.motion = float(changed.mean())
+            cv2.accumulateWeighted(thumb, self.background, self.learning_rate)
+
+        if self.motion >= self.motion_threshold or now - self._last_pass >= self.refresh_interval:
+            self._last_pass = now
+            self.passed += 1
+            return True
+        return False
+
+    def stats(self):
+        """Return how many frames were checked and how many passed on to detection"""
+        return {
+            "frames": self.frames,
+            "detections": self.passed,
+            "skipped": self.frames - self.passed,
+            "motion": round(self.motion, 3),
+        }
@@ -0,0 +1,172 @@
+# process_index.py
+
+import threading
+import time
+import psutil
+
+
+def normalize_process_name(name):
+    """Normalize a process or application name for lookups"""
+    if not name:
+        return ""
+    name = name.strip().lower()
+    if name.endswith(".exe"):
+        name = name[:-4]
+    return name
+
+
+class ProcessIndex:
+    """Keeps a name -> PIDs map of running processes that is refreshed incrementally.
+
+    Processes are keyed by (pid, create time), so a PID the OS hands to a new
+    process is seen as one process exiting and another starting. A refresh
+    reads only the create time of each process; names are looked up just for
+    processes that appeared since the last refresh. Lookups never wait for
+    more than one refresh and data is never older than the configured TTL.
+    """
+
+    def __init__(self, ttl=2.0, refresh_interval=1.0):
+        self.ttl = ttl  # Maximum age of the index (seconds) before a lookup forces a refresh
+        self.refresh_interval = refresh_interval  # Background refresh period (seconds)
+
+        self._lock = threading.Lock()
+        self._processes = {}  # pid -> psutil.Process
+        self._pid_keys = {}  # pid -> (pid, create time) of the process indexed under it
+        self._pid_names = {}  # pid -> normalized name
+        self._name_pids = {}  # normalized name -> set of pids
+        self._last_refresh = 0.0
+
+        self._stop_event = threading.Event()
+        self._refresh_thread = None
+
+    def start(self):
+        """Start the background refresh thread"""
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self.refresh()
+        # A new event per thread, so a thread that outlives stop()'s join can't be revived by start()
+        self._stop_event = threading.Event()
+        self._refresh_thread = threading.Thread(target=self._refresh_worker, args=(self._stop_event,), daemon=True)
+        self._refresh_thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread and wait for it to finish"""
+        self._stop_event.set()
+        if self._refresh_thread and self._refresh_thread is not threading.current_thread():
+            self._refresh_thread.join(timeout=2)
+        self._refresh_thread = None
+
+    def _refresh_worker(self, stop_event):
+        """Refresh the index periodically until stopped"""
+        while not stop_event.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Error refreshing process index: {e}")
+
+    def refresh(self):
+        """Diff the current processes against the index and apply the changes"""
+        current = {}  # (pid, create time) -> psutil.Process
+        for proc in psutil.process_iter(["create_time"]):
+            current[(proc.pid, proc.info.get("create_time"))] = proc
+
+        with self._lock:
+            known_keys = set(self._pid_keys.values())
+
+        exited = known_keys - set(current)
+        started = set(current) - known_keys
+
+        # Resolve names outside the lock, this is the part that costs syscalls
+        new_entries = {}
+        for key in started:
+            proc = current[key]
+            try:
+                new_entries[key] = (proc, normalize_process_name(proc.name()))
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+
+        with self._lock:
+            # Exits first, so a reused PID ends up with the new process
+            for pid, _ in exited:
+                self._remove_pid(pid)
+            for key, (proc, name) in new_entries.items():
+                pid = key[0]
+                self._processes[pid] = proc
+                self._pid_keys[pid] = key
+                self._pid_names[pid] = name
+                self._name_pids.setdefault(name, set()).add(pid)
+            self._last_refresh = time.monotonic()
+
+    def _remove_pid(self, pid):
+        """Drop a PID from all maps (caller must hold the lock)"""
+        name = self._pid_names.pop(pid, None)
+        self._processes.pop(pid, None)
+        self._pid_keys.pop(pid, None)
+        if name is not None:
+            pids = self._name_pids.get(name)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._name_pids[name]
+
+    def _ensure_fresh(self):
+        """Refresh synchronously if the index is older than the TTL"""
+        if time.monotonic() - self._last_refresh > self.ttl:
+            self.refresh()
+
+    def find_pids(self, name):
+        """Return the PIDs of processes whose name matches exactly"""
+        self._ensure_fresh()
+        key = normalize_process_name(name)
+        with self._lock:
+            return sorted(self._name_pids.get(key, ()))
+
+    def find_matching_pids(self, name):
+        """Return PIDs of processes whose name contains the given text"""
+        self._ensure_fresh()
+        key = normalize_process_name(name)
+        if not key:
+            return []
+        with self._lock:
+            # Exact hits are O(1); partial matches only scan the distinct names
+            pids = set(self._name_pids.get(key, ()))
+            for proc_name, proc_pids in self._name_pids.items():
+                if key in proc_name:
+                    pids.update(proc_pids)
+        return sorted(pids)
+
+    def is_running(self, name):
+        """Return a PID of a running process matching the name, or None"""
+        pids = self.find_matching_pids(name)
+        return pids[0] if pids else None
+
+    def get_process(self, pid):
+        """Return the cached psutil.Process for a PID, or None"""
+        with self._lock:
+            return self._processes.get(pid)
+
+    def get_processes(self, name):
+        """Return cached psutil.Process objects for processes matching the name"""
+        pids = self.find_matching_pids(name)
+        with self._lock:
+            return [self._processes[pid] for pid in pids if pid in self._processes]
+
+    def names(self):
+        """Return the names of all running processes"""
+        self._ensure_fresh()
+        with self._lock:
+            return sorted(self._name_pids)
+
+
+_shared_index = None
+_shared_index_lock = threading.Lock()
+
+
+def get_process_index():
+    """Return the process-wide ProcessIndex, starting it on first use"""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = ProcessIndex()
+            _shared_index.start()
+        return _shared_index
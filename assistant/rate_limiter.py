@@ -0,0 +1,206 @@
+# rate_limiter.py
+
+import datetime
+import email.utils
+import json
+import os
+import threading
+import time
+from assistant.state_store import atomic_write_json
+
+
+class RateLimitExceeded(Exception):
+    """Raised when an API call would exceed the request rate or the daily quota"""
+
+    def __init__(self, reason, retry_after=None):
+        self.reason = reason
+        self.retry_after = retry_after  # Seconds until a call may succeed, if known
+        super().__init__(f"API rate limit reached: {reason}")
+
+
+def parse_retry_after(value, default=60):
+    """Turn a Retry-After header (seconds or an HTTP date) into seconds to wait
+
+    Missing or malformed values give the default instead of an exception, so a
+    bad header can't turn a 429 into an unhandled error.
+    """
+    value = (value or "").strip()
+    if value.isdigit():
+        return int(value)
+    try:
+        until = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return default
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=datetime.timezone.utc)
+    return max(0, int((until - datetime.datetime.now(datetime.timezone.utc)).total_seconds()))
+
+
+class TokenBucket:
+    """Classic token bucket: refills at rate tokens per second up to capacity"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def tokens(self):
+        """Return the number of tokens currently available"""
+        self._refill()
+        return self._tokens
+
+    def try_take(self, tokens=1):
+        """Take tokens if available; otherwise return the seconds until they will be"""
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+
+class DailyQuota:
+    """Counts calls per UTC day and persists the count so restarts don't reset it"""
+
+    def __init__(self, limit, state_file="weather_quota.json"):
+        self.limit = limit
+        self.state_file = state_file
+        self.date = self._today()
+        self.used = 0
+        self.load()
+
+    def _today(self):
+        return datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+
+    def load(self):
+        """Load today's usage from disk"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            if state.get("date") == self.date:
+                self.used = state.get("used", 0)
+        except Exception as e:
+            print(f"Error loading API quota state: {e}")
+
+    def save(self):
+        """Save today's usage to disk"""
+        if not self.state_file:
+            return
+        try:
+            atomic_write_json(self.state_file, {"date": self.date, "used": self.used})
+        except Exception as e:
+            print(f"Error saving API quota state: {e}")
+
+    def _roll_over(self):
+        today = self._today()
+        if today != self.date:
+            self.date = today
+            self.used = 0
+
+    def remaining(self):
+        self._roll_over()
+        return max(self.limit - self.used, 0)
+
+    def consume(self):
+        """Count one call; returns False without counting if the quota is used up"""
+        if self.remaining() <= 0:
+            return False
+        self.used += 1
+        self.save()
+        return True
+
+    def seconds_until_reset(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        tomorrow = datetime.datetime.combine(now.date() + datetime.timedelta(days=1),
+                                             datetime.time(), datetime.timezone.utc)
+        return (tomorrow - now).total_seconds()
+
+
+class ApiRateLimiter:
+    """Process-wide request budget for one API key.
+
+    A token bucket smooths bursts to the provider's per-minute limit and a
+    daily quota caps total usage. Callers wait briefly for a token and get
+    RateLimitExceeded otherwise, so they can fall back to cached data.
+    A 429 from the provider pauses all calls until its Retry-After passes.
+    """
+
+    def __init__(self, per_minute=60, per_day=1000, state_file="weather_quota.json", clock=time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.bucket = TokenBucket(per_minute / 60.0, per_minute, clock)
+        self.quota = DailyQuota(per_day, state_file)
+        self._blocked_until = 0.0  # Monotonic time before which the provider asked us to back off
+        self.throttled = 0  # Calls refused locally since start
+        self.server_throttled = 0  # 429 responses seen since start
+
+    def acquire(self, max_wait=1.0):
+        """Reserve one call, waiting up to max_wait seconds for the rate limit
+
+        Raises RateLimitExceeded if the call can't be made in time.
+        """
+        deadline = self.clock() + max_wait
+        while True:
+            with self._lock:
+                now = self.clock()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                    reason = "provider asked to slow down"
+                elif self.quota.remaining() <= 0:
+                    self.throttled += 1
+                    raise RateLimitExceeded("daily quota used up", self.quota.seconds_until_reset())
+                else:
+                    wait = self.bucket.try_take()
+                    reason = "too many requests per minute"
+                    if wait == 0:
+                        self.quota.consume()
+                        return
+
+                if now + wait > deadline:
+                    self.throttled += 1
+                    raise RateLimitExceeded(reason, wait)
+            time.sleep(wait)
+
+    def backoff(self, retry_after=60):
+        """Pause all calls after the provider returned 429 Too Many Requests"""
+        with self._lock:
+            self.server_throttled += 1
+            self._blocked_until = max(self._blocked_until, self.clock() + retry_after)
+        print(f"Weather API asked to slow down; pausing requests for {retry_after} seconds")
+
+    def usage(self):
+        """Return a snapshot of the current budget"""
+        with self._lock:
+            # remaining() rolls the quota over to a new day first, so used and date match it
+            remaining = self.quota.remaining()
+            return {
+                "date": self.quota.date,
+                "used_today": self.quota.used,
+                "daily_limit": self.quota.limit,
+                "remaining_today": remaining,
+                "tokens_available": int(self.bucket.tokens()),
+                "per_minute": int(self.bucket.capacity),
+                "paused_for": round(max(self._blocked_until - self.clock(), 0), 1),
+                "throttled": self.throttled,
+                "server_throttled": self.server_throttled,
+            }
+
+
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(state_file="weather_quota.json", per_minute=60, per_day=1000):
+    """Return the ApiRateLimiter shared by every caller using the same state file"""
+    with _shared_limiters_lock:
+        if state_file not in _shared_limiters:
+            _shared_limiters[state_file] = ApiRateLimiter(per_minute, per_day, state_file)
+        return _shared_limiters[state_file]
@@ -0,0 +1,159 @@
+# recognition_events.py
+
+import os
+import platform
+import queue
+import threading
+import time
+
+import cv2
+
+FACE_APPEARED = "face_appeared"
+USER_RECOGNIZED = "user_recognized"
+USER_LEFT = "user_left"
+EVENT_TYPES = (FACE_APPEARED, USER_RECOGNIZED, USER_LEFT)
+
+
+def display_available():
+    """True if OpenCV windows can be opened; set SAGE_HEADLESS=1 to force headless mode"""
+    if os.environ.get("SAGE_HEADLESS", "").lower() in ("1", "true", "yes"):
+        return False
+    if platform.system() == "Linux":
+        return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+    return True
+
+
+class RecognitionEvents:
+    """Publishes recognition events and camera frames to whoever subscribed.
+
+    Events are dicts with a "type" (one of EVENT_TYPES), a "time" and
+    event-specific fields such as track_id, user_id and user_name. They go
+    to callbacks, which run on the recognition thread and should return
+    quickly, and to queues for consumers that prefer to poll from their own
+    thread; a full queue drops its oldest event. Frame subscribers get every
+    processed frame with an overlay description and are how previews attach.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = []  # (callback, event types or None for all)
+        self._queues = []  # (queue, event types or None for all)
+        self._frame_callbacks = []
+
+    def subscribe(self, callback, event_types=None):
+        """Call callback(event) for each event of the given types (all if None)"""
+        with self._lock:
+            self._callbacks.append((callback, set(event_types) if event_types else None))
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._callbacks = [(c, t) for c, t in self._callbacks if c is not callback]
+
+    def subscribe_queue(self, event_types=None, maxsize=100):
+        """Return a queue.Queue that receives events of the given types (all if None)"""
+        events = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._queues.append((events, set(event_types) if event_types else None))
+        return events
+
+    def unsubscribe_queue(self, events):
+        with self._lock:
+            self._queues = [(q, t) for q, t in self._queues if q is not events]
+
+    def subscribe_frames(self, callback):
+        """Call callback(frame, overlay) for every processed frame"""
+        with self._lock:
+            self._frame_callbacks.append(callback)
+        return callback
+
+    def unsubscribe_frames(self, callback):
+        with self._lock:
+            self._frame_callbacks = [c for c in self._frame_callbacks if c is not callback]
+
+    def has_frame_subscribers(self):
+        return bool(self._frame_callbacks)
+
+    def publish(self, event_type, **fields):
+        """Send an event to every matching subscriber and return it"""
+        event = dict(fields, type=event_type)
+        event.setdefault("time", time.time())
+        with self._lock:
+            callbacks = list(self._callbacks)
+            queues = list(self._queues)
+
+        for callback, types in callbacks:
+            if types is None or event_type in types:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Error in recognition event subscriber: {e}")
+
+        for events, types in queues:
+            if types is None or event_type in types:
+                while True:
+                    try:
+                        events.put_nowait(event)
+                        break
+                    except queue.Full:
+                        try:
+                            events.get_nowait()
+                        except queue.Empty:
+                            pass
+        return event
+
+    def publish_frame(self, frame, overlay):
+        """Hand a frame and its overlay description to the frame subscribers"""
+        with self._lock:
+            callbacks = list(self._frame_callbacks)
+        for callback in callbacks:
+            try:
+                callback(frame, overlay)
+            except Exception as e:
+                print(f"Error in frame subscriber: {e}")
+
+
+class FacePreview:
+    """Frame subscriber that shows the camera feed in an OpenCV window.
+
+    The overlay dict may hold a window "title", "boxes" (dicts with box,
+    label, detail and a BGR color), status "lines" as (text, color) pairs
+    and "flash" to outline the whole frame. Pressing q calls on_quit.
+    """
+
+    def __init__(self, on_quit=None):
+        self.on_quit = on_quit
+        self._windows = set()
+
+    def __call__(self, frame, overlay):
+        image = frame.copy()
+        for face in overlay.get("boxes", []):
+            x, y, w, h = face["box"]
+            color = face.get("color", (0, 255, 0))
+            cv2.rectangle(image, (x, y), (x+w, y+h), color, 2)
+            if face.get("label"):
+                cv2.putText(image, face["label"], (x, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.9, color, 2)
+            if face.get("detail"):
+                cv2.putText(image, face["detail"], (x+w-70, y-10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+
+        for index, (text, color) in enumerate(overlay.get("lines", [])):
+            cv2.putText(image, text, (10, 30 + 30 * index), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+
+        if overlay.get("flash"):
+            cv2.rectangle(image, (0, 0), (image.shape[1], image.shape[0]), (0, 255, 0), 20)
+
+        title = overlay.get("title", "Face Recognition")
+        self._windows.add(title)
+        cv2.imshow(title, image)
+        if cv2.waitKey(100 if overlay.get("flash") else 1) & 0xFF == ord('q') and self.on_quit:
+            self.on_quit()
+
+    def close(self):
+        """Close the preview windows"""
+        if not self._windows:
+            return
+        self._windows.clear()
+        cv2.destroyAllWindows()
+        # Make sure all OpenCV windows are really closed
+        for i in range(5):
+            cv2.waitKey(1)
@@ -0,0 +1,293 @@
+# recurrence.py
+
+import bisect
+import calendar
+import datetime
+import re
+
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = ["january", "february", "march", "april", "may", "june", "july",
+          "august", "september", "october", "november", "december"]
+FREQUENCIES = ("once", "daily", "weekly", "monthly", "dates", "interval")
+
+
+def _ordinal(n):
+    if 10 <= n % 100 <= 20:
+        return f"{n}th"
+    return f"{n}{ {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')}"
+
+
+class RecurrenceRule:
+    """When an alarm or reminder rings, with the next occurrence computed in closed form.
+
+    freq is one of FREQUENCIES:
+      once      a single datetime (at)
+      daily     every day at hour:minute
+      weekly    at hour:minute on the given weekdays (0 = Monday)
+      monthly   at hour:minute on a day of the month (-1 = last day); months
+                without that day are skipped
+      dates     at hour:minute on specific dates
+      interval  every `every` seconds counted from `start`
+    Any rule can skip specific dates and stop after an `until` date.
+    Everything a lookup needs is precomputed in the constructor, so
+    next_after() does a constant amount of work per call (plus one step per
+    skipped date it crosses).
+    """
+
+    def __init__(self, freq, hour=0, minute=0, weekdays=None, day=None, dates=None,
+                 at=None, every=None, start=None, skip=None, until=None):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown recurrence frequency: {freq}")
+        self.freq = freq
+        self.time = datetime.time(hour, minute)
+        self.weekdays = sorted(set(weekdays or []))
+        self.day = day
+        self.dates = sorted(set(dates or []))
+        self.at = at
+        self.every = every
+        self.start = start
+        self.skip = frozenset(skip or [])
+        self.until = until
+
+        if freq == "weekly":
+            if not self.weekdays:
+                raise ValueError("A weekly rule needs at least one weekday")
+            # Days from each weekday to the next allowed one (0 if allowed itself)
+            self._weekday_offset = [
+                min((allowed - weekday) % 7 for allowed in self.weekdays) for weekday in range(7)
+            ]
+        elif freq == "monthly" and not (day == -1 or 1 <= (day or 0) <= 31):
+            raise ValueError("A monthly rule needs a day between 1 and 31, or -1 for the last day")
+        elif freq == "dates":
+            self._datetimes = [datetime.datetime.combine(d, self.time) for d in self.dates]
+        elif freq == "once" and at is None:
+            raise ValueError("A one-shot rule needs a datetime")
+        elif freq == "interval":
+            if not every or every <= 0 or start is None:
+                raise ValueError("An interval rule needs a positive interval and a start time")
+            self._start_ts = start.timestamp()
+
+    # Candidate occurrences strictly after a naive local datetime, ignoring skip dates
+
+    def _next_once(self, after):
+        return self.at if self.at > after else None
+
+    def _next_daily(self, after):
+        day = after.date() if self.time > after.time() else after.date() + datetime.timedelta(days=1)
+        return datetime.datetime.combine(day, self.time)
+
+    def _next_weekly(self, after):
+        day = after.date() if self.time > after.time() else after.date() + datetime.timedelta(days=1)
+        day += datetime.timedelta(days=self._weekday_offset[day.weekday()])
+        return datetime.datetime.combine(day, self.time)
+
+    def _next_monthly(self, after):
+        year, month = after.year, after.month
+        # A day that exists at all turns up within a year; the 31st skips at most 2 months in a row
+        for _ in range(13):
+            days_in_month = calendar.monthrange(year, month)[1]
+            day = days_in_month if self.day == -1 else self.day
+            if day <= days_in_month:
+                candidate = datetime.datetime.combine(datetime.date(year, month, day), self.time)
+                if candidate > after:
+                    return candidate
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+        return None
+
+    def _next_dates(self, after):
+        index = bisect.bisect_right(self._datetimes, after)
+        return self._datetimes[index] if index < len(self._datetimes) else None
+
+    def _next_interval(self, after):
+        elapsed = after.timestamp() - self._start_ts
+        periods = max(int(elapsed // self.every) + 1, 0)
+        return datetime.datetime.fromtimestamp(self._start_ts + periods * self.every)
+
+    def next_after(self, after):
+        """Return the first occurrence strictly after a naive local datetime, or None"""
+        next_candidate = getattr(self, f"_next_{self.freq}")
+        candidate = next_candidate(after)
+        while candidate is not None and candidate.date() in self.skip:
+            # Jump past the whole skipped day at once
+            end_of_day = datetime.datetime.combine(candidate.date() + datetime.timedelta(days=1), datetime.time())
+            candidate = next_candidate(end_of_day - datetime.timedelta(microseconds=1))
+        if candidate is not None and self.until is not None and candidate.date() > self.until:
+            return None
+        return candidate
+
+    def is_finite(self):
+        """True if the rule eventually runs out of occurrences"""
+        return self.freq in ("once", "dates") or self.until is not None
+
+    def day_names(self):
+        """Return the weekday names the rule rings on, for daily and weekly rules"""
+        if self.freq == "daily":
+            return list(WEEKDAYS)
+        if self.freq == "weekly":
+            return [WEEKDAYS[i] for i in self.weekdays]
+        return []
+
+    def describe(self):
+        """Return a short spoken description of the rule"""
+        if self.freq == "once":
+            text = f"once on {self.at.strftime('%A, %B')} {self.at.day}"
+        elif self.freq == "daily":
+            text = "every day"
+        elif self.freq == "weekly":
+            if self.weekdays == [0, 1, 2, 3, 4]:
+                text = "on weekdays"
+            elif self.weekdays == [5, 6]:
+                text = "on weekends"
+            elif len(self.weekdays) <= 3:
+                text = "on " + ", ".join(WEEKDAYS[i] for i in self.weekdays)
+            else:
+                text = f"on {len(self.weekdays)} days"
+        elif self.freq == "monthly":
+            day = "last day" if self.day == -1 else _ordinal(self.day)
+            text = f"on the {day} of every month"
+        elif self.freq == "dates":
+            if len(self.dates) == 1:
+                text = f"on {self.dates[0].strftime('%B')} {self.dates[0].day}"
+            else:
+                text = f"on {len(self.dates)} dates"
+        else:
+            hours, remainder = divmod(int(self.every), 3600)
+            if remainder == 0:
+                text = "every hour" if hours == 1 else f"every {hours} hours"
+            else:
+                text = f"every {int(self.every) // 60} minutes"
+
+        if self.skip:
+            text += f", except {len(self.skip)} skipped date" + ("s" if len(self.skip) > 1 else "")
+        return text
+
+    def to_dict(self):
+        """Return a JSON-serializable form of the rule"""
+        rule = {"freq": self.freq, "hour": self.time.hour, "minute": self.time.minute}
+        if self.weekdays:
+            rule["weekdays"] = self.weekdays
+        if self.day is not None:
+            rule["day"] = self.day
+        if self.dates:
+            rule["dates"] = [d.isoformat() for d in self.dates]
+        if self.at is not None:
+            rule["at"] = self.at.isoformat()
+        if self.every is not None:
+            rule["every"] = self.every
+        if self.start is not None:
+            rule["start"] = self.start.isoformat()
+        if self.skip:
+            rule["skip"] = sorted(d.isoformat() for d in self.skip)
+        if self.until is not None:
+            rule["until"] = self.until.isoformat()
+        return rule
+
+    @classmethod
+    def from_dict(cls, rule):
+        """Build a rule from the output of to_dict()"""
+        parse_date = datetime.date.fromisoformat
+        parse_datetime = datetime.datetime.fromisoformat
+        return cls(
+            rule["freq"],
+            hour=rule.get("hour", 0),
+            minute=rule.get("minute", 0),
+            weekdays=rule.get("weekdays"),
+            day=rule.get("day"),
+            dates=[parse_date(d) for d in rule.get("dates", [])],
+            at=parse_datetime(rule["at"]) if "at" in rule else None,
+            every=rule.get("every"),
+            start=parse_datetime(rule["start"]) if "start" in rule else None,
+            skip=[parse_date(d) for d in rule.get("skip", [])],
+            until=parse_date(rule["until"]) if "until" in rule else None,
+        )
+
+    @classmethod
+    def from_days(cls, hour, minute, days):
+        """Build a rule from the weekday-name list used by older alarm files"""
+        weekdays = [WEEKDAYS.index(day) for day in days if day in WEEKDAYS]
+        if len(set(weekdays)) == 7:
+            return cls("daily", hour, minute)
+        return cls("weekly", hour, minute, weekdays=weekdays)
+
+
+def _parse_dates(text, today):
+    """Find dates like 2026-12-25 or "december 25th" in text; dates without a year are the next upcoming one"""
+    dates = []
+    for year, month, day in re.findall(r"(\d{4})-(\d{1,2})-(\d{1,2})", text):
+        dates.append(datetime.date(int(year), int(month), int(day)))
+
+    month_names = "|".join(MONTHS)
+    for month_name, day in re.findall(rf"({month_names})\s+(\d{{1,2}})(?:st|nd|rd|th)?", text):
+        month = MONTHS.index(month_name) + 1
+        for year in (today.year, today.year + 1):
+            try:
+                date = datetime.date(year, month, int(day))
+            except ValueError:
+                continue
+            if date >= today:
+                dates.append(date)
+                break
+    return dates
+
+
+def parse_recurrence(text, hour, minute, now=None):
+    """Turn a spoken repeat phrase into a RecurrenceRule for an alarm at hour:minute
+
+    Understands "everyday", "weekdays", "weekends", weekday lists, "every month
+    on the 15th", "every 2 hours", "once", "today", "tomorrow", specific dates
+    and a trailing "except <dates>". Raises ValueError for anything else.
+    """
+    now = now or datetime.datetime.now()
+    text = " ".join(text.lower().split())
+
+    skip = []
+    for separator in (" except ", " but not ", " skipping "):
+        if separator in text:
+            text, skipped = text.split(separator, 1)
+            skip = _parse_dates(skipped, now.date())
+            if not skip:
+                raise ValueError(f"Couldn't understand the dates to skip: {skipped}")
+            break
+
+    match = re.search(r"every\s+(\d+|an?|one)?\s*(hour|minute)s?", text)
+    if match:
+        count = match.group(1)
+        count = 1 if count in (None, "a", "an", "one") else int(count)
+        every = count * (3600 if match.group(2) == "hour" else 60)
+        start = datetime.datetime.combine(now.date(), datetime.time(hour, minute))
+        return RecurrenceRule("interval", hour, minute, every=every, start=start, skip=skip)
+
+    if "month" in text:
+        if "last day" in text:
+            day = -1
+        else:
+            match = re.search(r"(\d{1,2})(?:st|nd|rd|th)?", text)
+            day = int(match.group(1)) if match else now.day
+        return RecurrenceRule("monthly", hour, minute, day=day, skip=skip)
+
+    if text in ("once", "just once", "one time", "today", "tomorrow", "only today", "only tomorrow"):
+        at = datetime.datetime.combine(now.date(), datetime.time(hour, minute))
+        if "tomorrow" in text or at <= now:
+            at += datetime.timedelta(days=1)
+        return RecurrenceRule("once", hour, minute, at=at)
+
+    dates = _parse_dates(text, now.date())
+    if dates:
+        return RecurrenceRule("dates", hour, minute, dates=dates, skip=skip)
+
+    if text in ("everyday", "every day", "daily", "all days"):
+        return RecurrenceRule("daily", hour, minute, skip=skip)
+    if "weekday" in text:
+        return RecurrenceRule("weekly", hour, minute, weekdays=[0, 1, 2, 3, 4], skip=skip)
+    if "weekend" in text:
+        return RecurrenceRule("weekly", hour, minute, weekdays=[5, 6], skip=skip)
+
+    weekdays = [index for index, day in enumerate(WEEKDAYS) if day in text]
+    if weekdays:
+        if len(weekdays) == 7:
+            return RecurrenceRule("daily", hour, minute, skip=skip)
+        return RecurrenceRule("weekly", hour, minute, weekdays=weekdays, skip=skip)
+
+    raise ValueError(f"Couldn't understand when to repeat: {text}")
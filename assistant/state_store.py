@@ -0,0 +1,149 @@
+# state_store.py
+
+import copy
+import json
+import os
+import tempfile
+import threading
+
+
+def _fsync_directory(directory):
+    """Make a rename durable; directories can't be opened for syncing on Windows"""
+    if os.name == "nt":
+        return
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path, data, **dump_options):
+    """Write data as JSON so that path holds either the old or the new document, never a mix
+
+    The document goes to a temporary file in the same directory, is fsynced,
+    and then renamed over path.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, **dump_options)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def load_json(path, default=None):
+    """Read a JSON file, returning default if it doesn't exist"""
+    if not os.path.exists(path):
+        return default
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class JournaledStore:
+    """A JSON object on disk that is updated by appending to a journal.
+
+    The file at path holds a snapshot (a plain JSON object, so older
+    readers still understand it). Every set() or delete() appends one line
+    to path + ".journal" and fsyncs it, so a change costs I/O proportional
+    to the change. Loading replays the journal over the snapshot, ignoring
+    a torn last line. Once the journal holds compact_every entries, the
+    snapshot is rewritten atomically and the journal is emptied; replaying
+    an already-applied journal is harmless, so a crash between the two
+    steps loses nothing.
+    """
+
+    def __init__(self, path, compact_every=200):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._data = {}
+        self._journal = None  # Open append handle
+        self._journal_entries = 0
+
+    def load(self):
+        """Load the snapshot and replay the journal; returns a copy of the data"""
+        with self._lock:
+            self._data = load_json(self.path, {}) or {}
+            self._journal_entries = 0
+            if os.path.exists(self.journal_path):
+                with open(self.journal_path, 'r') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            print(f"Ignoring incomplete entry at the end of {self.journal_path}")
+                            break
+                        if entry.get("op") == "set":
+                            self._data[entry["key"]] = entry["value"]
+                        elif entry.get("op") == "delete":
+                            self._data.pop(entry["key"], None)
+                        self._journal_entries += 1
+            if self._journal_entries:
+                # Start from a clean journal so a torn line is never followed by valid ones
+                self._compact()
+            return copy.deepcopy(self._data)
+
+    def set(self, key, value):
+        """Store one key; the value must not be modified by another thread during the call"""
+        self._append({"op": "set", "key": key, "value": value})
+
+    def delete(self, key):
+        """Remove one key"""
+        self._append({"op": "delete", "key": key})
+
+    def replace(self, data):
+        """Replace the whole document with an atomic snapshot"""
+        with self._lock:
+            self._data = copy.deepcopy(data)
+            self._compact()
+
+    def _append(self, entry):
+        with self._lock:
+            line = json.dumps(entry) + "\n"
+            if entry["op"] == "set":
+                self._data[entry["key"]] = json.loads(line)["value"]
+            else:
+                self._data.pop(entry["key"], None)
+
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a')
+            self._journal.write(line)
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal_entries += 1
+
+            if self._journal_entries >= self.compact_every:
+                self._compact()
+
+    def _compact(self):
+        """Fold the journal into a new snapshot; the caller holds the lock"""
+        atomic_write_json(self.path, self._data)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        with open(self.journal_path, 'w'):
+            pass
+        self._journal_entries = 0
+
+    def close(self):
+        """Close the journal file"""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
@@ -0,0 +1,115 @@
+# weather_prefetch.py
+
+import datetime
+import threading
+import time
+
+
+class WeatherPrefetcher:
+    """Downloads weather shortly before each alarm so the alarm can speak it instantly.
+
+    The prefetched bundle is pinned until it is replaced by the next
+    successful prefetch or becomes older than max_age. A failed prefetch
+    keeps the last good snapshot while it is young enough.
+    """
+
+    def __init__(self, weather_service, get_next_alarm, lead_time=5 * 60, max_age=30 * 60, clock=time.time):
+        self.weather_service = weather_service
+        self.get_next_alarm = get_next_alarm  # Callable returning the next alarm datetime or None
+        self.lead_time = lead_time  # Seconds before an alarm to fetch the weather
+        self.max_age = max_age  # Seconds after which a snapshot is too old to announce
+        self.retry_interval = 60  # Seconds between attempts after a failed prefetch
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._snapshot = None  # {"bundle": ..., "fetched_at": unix time, "alarm": datetime}
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the prefetch thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        # A new event per thread, so a worker still waiting after stop() can't be revived by start()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._prefetch_worker, args=(self._stop_event,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the prefetch thread and wait briefly for a prefetch in progress to finish"""
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def reschedule(self):
+        """Recompute the next prefetch time, e.g. after alarms were added or removed"""
+        self._wake.set()
+
+    def _prefetch_worker(self, stop_event):
+        """Sleep until lead_time before the next alarm, then prefetch"""
+        prefetched_for = None
+
+        while not stop_event.is_set():
+            try:
+                next_alarm = self.get_next_alarm()
+            except Exception as e:
+                print(f"Error computing next alarm for weather prefetch: {e}")
+                next_alarm = None
+
+            if next_alarm is None:
+                # Nothing scheduled; sleep until alarms change
+                self._wait(None)
+                continue
+
+            now = datetime.datetime.fromtimestamp(self.clock())
+            if next_alarm == prefetched_for:
+                # Already prefetched; wait for this alarm to pass
+                delay = (next_alarm - now).total_seconds() + 1
+            else:
+                delay = (next_alarm - now).total_seconds() - self.lead_time
+                if delay <= 0:
+                    if self.prefetch(next_alarm):
+                        prefetched_for = next_alarm
+                        continue
+                    # Retry until the alarm fires; the last good snapshot stays pinned meanwhile
+                    delay = min(self.retry_interval, (next_alarm - now).total_seconds())
+
+            # Re-check at least once a minute so wall-clock changes are noticed
+            self._wait(min(max(delay, 0), 60))
+
+    def _wait(self, timeout):
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def prefetch(self, alarm_time=None):
+        """Fetch fresh weather and pin it for the upcoming alarm"""
+        try:
+            bundle = self.weather_service.get_weather_bundle(refresh=True)
+        except Exception as e:
+            print(f"Error prefetching weather: {e}")
+            return False
+
+        if not bundle.get("success"):
+            print(f"Weather prefetch failed, keeping last snapshot: {bundle.get('error')}")
+            return False
+
+        with self._lock:
+            self._snapshot = {
+                "bundle": bundle,
+                "fetched_at": self.clock(),
+                "alarm": alarm_time,
+            }
+        print(f"Prefetched weather for alarm at {alarm_time}")
+        return True
+
+    def get_snapshot(self):
+        """Return the pinned weather bundle, or None if nothing recent was prefetched"""
+        with self._lock:
+            if self._snapshot is None:
+                return None
+            if self.clock() - self._snapshot["fetched_at"] > self.max_age:
+                return None
+            return self._snapshot["bundle"]
@@ -1,147 +1,520 @@
-# weather_service.py
-
-import requests
-import json
-import os
-
-class WeatherService:
-    def __init__(self):
-        # Store API key and location in a config file
-        self.config_file = "weather_config.json"
-        self.api_key = ""
-        self.location = "London"  # Default location
-        self.load_config()
-        
-    def load_config(self):
-        """Load API key and location from config file"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    self.api_key = config.get("api_key", "")
-                    self.location = config.get("location", "London")
-                print(f"Loaded weather config for {self.location}")
-            except Exception as e:
-                print(f"Error loading weather config: {e}")
-        else:
-            print("No weather config file found. Using defaults.")
-            self.save_config()
-            
-    def save_config(self):
-        """Save API key and location to config file"""
-        try:
-            with open(self.config_file, 'w') as f:
-                json.dump({
-                    "api_key": self.api_key,
-                    "location": self.location
-                }, f)
-            print(f"Saved weather config for {self.location}")
-        except Exception as e:
-            print(f"Error saving weather config: {e}")
-            
-    def set_location(self, location):
-        """Update the location for weather forecasts"""
-        self.location = location
-        self.save_config()
-        return True
-        
-    def set_api_key(self, api_key):
-        """Update the API key for weather service"""
-        self.api_key = api_key
-        self.save_config()
-        return True
-        
-    def get_weather(self):
-        """Get current weather data for the configured location"""
-        if not self.api_key:
-            return {
-                "success": False,
-                "error": "No API key configured. Please set up an OpenWeatherMap API key."
-            }
-            
-        try:
-            # Using OpenWeatherMap API for weather data
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={self.location}&appid={self.api_key}&units=metric"
-            response = requests.get(url)
-            
-            if response.status_code != 200:
-                return {
-                    "success": False,
-                    "error": f"Error fetching weather data: {response.status_code}"
-                }
-                
-            data = response.json()
-            
-            # Extract relevant weather information
-            weather = {
-                "success": True,
-                "location": self.location,
-                "temperature": round(data["main"]["temp"]),
-                "condition": data["weather"][0]["main"],
-                "description": data["weather"][0]["description"],
-                "humidity": data["main"]["humidity"],
-                "wind_speed": data["wind"]["speed"],
-                "icon": data["weather"][0]["icon"]
-            }
-            
-            return weather
-            
-        except Exception as e:
-            print(f"Error getting weather: {e}")
-            return {
-                "success": False,
-                "error": f"Error getting weather: {str(e)}"
-            }
-    
-    def get_forecast(self):
-        """Get weather forecast for the day"""
-        if not self.api_key:
-            return {
-                "success": False,
-                "error": "No API key configured. Please set up an OpenWeatherMap API key."
-            }
-            
-        try:
-            # Using OpenWeatherMap API for forecast data
-            url = f"http://api.openweathermap.org/data/2.5/forecast?q={self.location}&appid={self.api_key}&units=metric"
-            response = requests.get(url)
-            
-            if response.status_code != 200:
-                return {
-                    "success": False,
-                    "error": f"Error fetching forecast data: {response.status_code}"
-                }
-                
-            data = response.json()
-            
-            # Process forecast data (next 24 hours)
-            forecasts = []
-            for item in data["list"][:8]:  # First 8 entries = 24 hours (3-hour steps)
-                forecast = {
-                    "time": item["dt_txt"],
-                    "temperature": round(item["main"]["temp"]),
-                    "condition": item["weather"][0]["main"],
-                    "description": item["weather"][0]["description"],
-                    "rain": item["rain"]["3h"] if "rain" in item else 0
-                }
-                forecasts.append(forecast)
-            
-            # Check for rain in the next 24 hours
-            rain_forecast = any(f["rain"] > 0 for f in forecasts)
-            max_temp = max(f["temperature"] for f in forecasts)
-            min_temp = min(f["temperature"] for f in forecasts)
-            
-            return {
-                "success": True,
-                "forecasts": forecasts,
-                "rain_expected": rain_forecast,
-                "max_temp": max_temp,
-                "min_temp": min_temp
-            }
-            
-        except Exception as e:
-            print(f"Error getting forecast: {e}")
-            return {
-                "success": False,
-                "error": f"Error getting forecast: {str(e)}"
-            }
\ No newline at end of file
+# weather_service.py
+
+import requests
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from assistant.forecast import ForecastTable, DAY_SECONDS
+from assistant.geocoding import get_location_resolver, LocationNotFoundError
+from assistant.rate_limiter import get_rate_limiter, parse_retry_after, RateLimitExceeded
+from assistant.state_store import atomic_write_json
+
+API_BASE_URL = "https://api.openweathermap.org/data/2.5"
+
+# How long a cached response is considered fresh, per endpoint (seconds)
+CACHE_TTL = {
+    "weather": 10 * 60,
+    "forecast": 60 * 60,
+}
+
+# Stale responses older than this are not served without trying the network first
+CACHE_MAX_STALE = {
+    "weather": 3 * 60 * 60,
+    "forecast": 12 * 60 * 60,
+}
+
+# Options for the optional background weather alert watcher
+DEFAULT_ALERT_SETTINGS = {
+    "enabled": False,
+    "interval_minutes": 30,
+    "rain_within_hours": 3,
+    "temp_swing": 8,
+}
+
+REQUEST_TIMEOUT = (3.05, 10)  # (connect, read) seconds before an API request is abandoned
+MAX_RETRIES = 2  # Retries for connections that never reached the API
+MAX_CONCURRENT_REQUESTS = 4  # Requests in flight at once across all locations
+RATE_LIMIT_PER_MINUTE = 60  # OpenWeatherMap free tier allows 60 calls per minute
+DAILY_QUOTA = 1000  # Calls per UTC day; leaves plenty of headroom on the free tier
+
+# Keep-alive session and worker threads shared by every WeatherService
+_http_session = None
+_http_session_lock = threading.Lock()
+_request_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="weather")
+
+
+def get_http_session():
+    """Return the pooled HTTP session used for all weather requests"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            # Only connection failures are retried here: a request that reached the API
+            # counts against the quota, and every one of those goes through the rate
+            # limiter, which also handles 429 and its Retry-After instead of urllib3
+            retry = Retry(
+                total=MAX_RETRIES,
+                connect=MAX_RETRIES,
+                read=0,
+                status=0,
+                backoff_factor=0.5,
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=MAX_CONCURRENT_REQUESTS, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+
+class WeatherCache:
+    """Disk-backed cache of raw OpenWeatherMap responses with stale-while-revalidate.
+
+    Fresh entries are returned as is. Stale entries are returned immediately
+    while a single background refresh per key replaces them.
+    """
+
+    def __init__(self, cache_file="weather_cache.json", clock=time.time):
+        self.cache_file = cache_file
+        self.clock = clock  # Wall-clock time source; fetched_at values are unix times
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> {"data": raw response, "fetched_at": unix time}
+        self._refreshing = set()  # keys with a background refresh in flight
+        self.load()
+
+    def load(self):
+        """Load cached responses from disk"""
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r') as f:
+                self._entries = json.load(f)
+            print(f"Loaded {len(self._entries)} cached weather responses")
+        except Exception as e:
+            print(f"Error loading weather cache: {e}")
+            self._entries = {}
+
+    def save(self):
+        """Save cached responses to disk"""
+        try:
+            with self._lock:
+                entries = dict(self._entries)
+            atomic_write_json(self.cache_file, entries)
+        except Exception as e:
+            print(f"Error saving weather cache: {e}")
+
+    def get_entry(self, key):
+        """Return the cached entry for a key, or None"""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key, data):
+        """Store a fresh response and persist the cache"""
+        with self._lock:
+            self._entries[key] = {"data": data, "fetched_at": self.clock()}
+        self.save()
+
+    def get(self, key, endpoint, fetch, refresh=False, cached_only=False):
+        """Return the response for a key, calling fetch() only when needed
+
+        refresh=True always tries the network first; cached_only=True never
+        does. Returns (data, age_in_seconds). Raises whatever fetch() raises
+        (or LookupError when cached_only) if there is no usable cached data.
+        """
+        entry = self.get_entry(key)
+        if cached_only:
+            if entry is None:
+                raise LookupError(f"No cached {endpoint} data available")
+            return entry["data"], self.clock() - entry["fetched_at"]
+
+        if entry is not None and not refresh:
+            age = self.clock() - entry["fetched_at"]
+            if age < CACHE_TTL[endpoint]:
+                return entry["data"], age
+            if age < CACHE_MAX_STALE[endpoint]:
+                self._refresh_in_background(key, fetch)
+                return entry["data"], age
+
+        try:
+            data = fetch()
+        except Exception:
+            # A very old answer is still better than none when the network is down
+            if entry is not None:
+                return entry["data"], self.clock() - entry["fetched_at"]
+            raise
+        self.put(key, data)
+        return data, 0.0
+
+    def _refresh_in_background(self, key, fetch):
+        """Start a refresh for a stale key unless one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def worker():
+            try:
+                self.put(key, fetch())
+            except Exception as e:
+                print(f"Background weather refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+
+_shared_caches = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_weather_cache(cache_file="weather_cache.json"):
+    """Return the WeatherCache shared by every WeatherService using the same file"""
+    with _shared_caches_lock:
+        if cache_file not in _shared_caches:
+            _shared_caches[cache_file] = WeatherCache(cache_file)
+        return _shared_caches[cache_file]
+
+
+class WeatherAPIError(Exception):
+    """Raised when the weather API returns an unusable response"""
+
+    def __init__(self, endpoint, status_code):
+        self.endpoint = endpoint
+        self.status_code = status_code
+        super().__init__(f"Error fetching {endpoint} data: {status_code}")
+
+
+class WeatherService:
+    def __init__(self):
+        # Store API key and location in a config file
+        self.config_file = "weather_config.json"
+        self.api_key = ""
+        self.location = "London"  # Default location
+        self.locations = {}  # Extra named locations, label -> location name
+        self.alert_settings = dict(DEFAULT_ALERT_SETTINGS)  # Background weather alert options
+        self.cache = get_weather_cache()
+        self.resolver = get_location_resolver()
+        self.rate_limiter = get_rate_limiter(per_minute=RATE_LIMIT_PER_MINUTE, per_day=DAILY_QUOTA)
+        self._forecast_tables = {}  # id(raw payload) -> (raw payload, ForecastTable)
+        self.load_config()
+        
+    def load_config(self):
+        """Load API key and location from config file"""
+        if os.path.exists(self.config_file):
+            try:
+                with open(self.config_file, 'r') as f:
+                    config = json.load(f)
+                    self.api_key = config.get("api_key", "")
+                    self.location = config.get("location", "London")
+                    self.alert_settings.update(config.get("alerts", {}))
+                    self.locations = config.get("locations", {})
+                print(f"Loaded weather config for {self.location}")
+            except Exception as e:
+                print(f"Error loading weather config: {e}")
+        else:
+            print("No weather config file found. Using defaults.")
+            self.save_config()
+            
+    def save_config(self):
+        """Save API key and location to config file"""
+        try:
+            atomic_write_json(self.config_file, {
+                "api_key": self.api_key,
+                "location": self.location,
+                "alerts": self.alert_settings,
+                "locations": self.locations
+            })
+            print(f"Saved weather config for {self.location}")
+        except Exception as e:
+            print(f"Error saving weather config: {e}")
+            
+    def set_location(self, location):
+        """Update the location for weather forecasts, validating it with the geocoding API"""
+        place = None
+        if self.api_key:
+            try:
+                place = self.resolver.resolve(location, self.api_key, get_http_session(), REQUEST_TIMEOUT, self.rate_limiter)
+            except LocationNotFoundError as e:
+                print(e)
+                return False
+            except Exception as e:
+                # Keep the name and resolve it on the next weather request
+                print(f"Could not verify location {location}: {e}")
+
+        self.location = location
+        self.save_config()
+
+        # Warm the weather cache for the new location in the background
+        if place is not None:
+            threading.Thread(target=self.get_weather_bundle, daemon=True).start()
+        return True
+
+    def get_location_name(self, location=None):
+        """Return the canonical name of a location, by default the configured one"""
+        location = location or self.location
+        place = self.resolver.lookup(location)
+        return place["name"] if place else location
+
+    def add_location(self, location, label=None):
+        """Add a named location for multi-location weather queries"""
+        if self.api_key:
+            try:
+                self.resolver.resolve(location, self.api_key, get_http_session(), REQUEST_TIMEOUT, self.rate_limiter)
+            except LocationNotFoundError as e:
+                print(e)
+                return False
+            except Exception as e:
+                print(f"Could not verify location {location}: {e}")
+
+        label = label or self.get_location_name(location)
+        self.locations[label] = location
+        self.save_config()
+        return True
+
+    def remove_location(self, label):
+        """Remove a named location"""
+        for existing in list(self.locations):
+            if existing.lower() == label.strip().lower():
+                del self.locations[existing]
+                self.save_config()
+                return True
+        return False
+        
+    def set_alerts_enabled(self, enabled):
+        """Turn the background weather alerts on or off"""
+        self.alert_settings["enabled"] = bool(enabled)
+        self.save_config()
+        return True
+
+    def set_api_key(self, api_key):
+        """Update the API key for weather service"""
+        self.api_key = api_key
+        self.save_config()
+        return True
+        
+    def _resolve_place(self, location, cached_only=False):
+        """Return the coordinates for a location name, geocoding it if it isn't cached yet"""
+        place = self.resolver.lookup(location)
+        if place is None:
+            if cached_only:
+                raise LookupError(f"Location {location} has not been resolved yet")
+            place = self.resolver.resolve(location, self.api_key, get_http_session(), REQUEST_TIMEOUT, self.rate_limiter)
+        return place
+
+    def _fetch(self, endpoint, place):
+        """Download a raw response from the OpenWeatherMap API"""
+        url = f"{API_BASE_URL}/{endpoint}"
+        params = {"lat": place["lat"], "lon": place["lon"], "appid": self.api_key, "units": "metric"}
+        # Raises RateLimitExceeded when over budget; the cache then serves the last response
+        self.rate_limiter.acquire()
+        response = get_http_session().get(url, params=params, timeout=REQUEST_TIMEOUT)
+
+        if response.status_code == 429:
+            self.rate_limiter.backoff(parse_retry_after(response.headers.get("Retry-After")))
+        if response.status_code != 200:
+            raise WeatherAPIError(endpoint, response.status_code)
+
+        return response.json()
+
+    def _get_data(self, endpoint, refresh=False, cached_only=False, location=None):
+        """Get a raw response for a location (default: the configured one), using the cache when possible"""
+        place = self._resolve_place(location or self.location, cached_only)
+        key = f"{endpoint}:{place['lat']},{place['lon']}"
+        data, age = self.cache.get(
+            key, endpoint, lambda: self._fetch(endpoint, place),
+            refresh=refresh, cached_only=cached_only
+        )
+        return data
+
+    def get_quota_usage(self):
+        """Return how much of the API budget has been used, see ApiRateLimiter.usage()"""
+        return self.rate_limiter.usage()
+
+    def _missing_api_key_error(self):
+        return {
+            "success": False,
+            "error": "No API key configured. Please set up an OpenWeatherMap API key."
+        }
+
+    def _build_result(self, endpoint, get_data, location=None):
+        """Turn a raw response into a result dict, reporting failures the same way for every endpoint"""
+        parsers = {
+            "weather": self._parse_weather,
+            "forecast": self._parse_forecast,
+        }
+        try:
+            return parsers[endpoint](get_data(), location)
+        except (WeatherAPIError, LocationNotFoundError, RateLimitExceeded) as e:
+            return {
+                "success": False,
+                "location": self.get_location_name(location),
+                "error": str(e)
+            }
+        except Exception as e:
+            print(f"Error getting {endpoint}: {e}")
+            return {
+                "success": False,
+                "location": self.get_location_name(location),
+                "error": f"Error getting {endpoint}: {str(e)}"
+            }
+
+    def _parse_weather(self, data, location=None):
+        """Extract relevant current weather information"""
+        return {
+            "success": True,
+            "location": self.get_location_name(location),
+            "temperature": round(data["main"]["temp"]),
+            "condition": data["weather"][0]["main"],
+            "description": data["weather"][0]["description"],
+            "humidity": data["main"]["humidity"],
+            "wind_speed": data["wind"]["speed"],
+            "icon": data["weather"][0]["icon"]
+        }
+
+    def _table_for(self, data):
+        """Return the ForecastTable for a raw payload, parsing each download only once"""
+        cached = self._forecast_tables.get(id(data))
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        table = ForecastTable.from_payload(data)
+        if len(self._forecast_tables) >= 16:
+            self._forecast_tables.clear()
+        self._forecast_tables[id(data)] = (data, table)
+        return table
+
+    def _parse_forecast(self, data, location=None):
+        """Summarize the next 24 hours of a forecast response"""
+        table = self._table_for(data)
+        now = time.time()
+
+        # Slots still relevant now, even if the cached forecast is stale
+        summary = table.window(now, now + DAY_SECONDS)
+        if summary is None:
+            raise ValueError("Forecast does not cover the next 24 hours")
+
+        return {
+            "success": True,
+            "location": self.get_location_name(location),
+            "forecasts": table.entries(now, now + DAY_SECONDS),
+            "rain_expected": summary["rain_expected"],
+            "max_temp": summary["max_temp"],
+            "min_temp": summary["min_temp"]
+        }
+
+    def get_forecast_table(self, refresh=False, cached_only=False, location=None):
+        """Return the full 5-day forecast as a ForecastTable"""
+        return self._table_for(self._get_data("forecast", refresh, cached_only, location))
+
+    def get_day_forecast(self, days_ahead=0, num_days=1, location=None):
+        """Summarize the forecast for whole local days, starting days_ahead from today"""
+        if not self.api_key:
+            return self._missing_api_key_error()
+
+        try:
+            table = self.get_forecast_table(location=location)
+        except (WeatherAPIError, LocationNotFoundError) as e:
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        except Exception as e:
+            print(f"Error getting forecast: {e}")
+            return {
+                "success": False,
+                "error": f"Error getting forecast: {str(e)}"
+            }
+
+        first_day = table.local_day(time.time()) + days_ahead
+        summary = table.days(first_day, num_days)
+        if summary is None:
+            return {
+                "success": False,
+                "error": "The forecast only covers the next five days."
+            }
+
+        summary["success"] = True
+        summary["location"] = self.get_location_name(location)
+        return summary
+
+    def get_weather(self):
+        """Get current weather data for the configured location"""
+        if not self.api_key:
+            return self._missing_api_key_error()
+        return self._build_result("weather", lambda: self._get_data("weather"))
+
+    def get_forecast(self):
+        """Get weather forecast for the day"""
+        if not self.api_key:
+            return self._missing_api_key_error()
+        return self._build_result("forecast", lambda: self._get_data("forecast"))
+
+    def get_weather_bundle(self, refresh=False, cached_only=False, location=None):
+        """Get current weather and the day's forecast in one parallel round trip
+
+        Returns the get_weather() result with the get_forecast() result
+        stored under "forecast". refresh=True bypasses fresh cache entries;
+        cached_only=True answers from the cache without touching the network.
+        """
+        return self.get_weather_bundles([location or self.location], refresh, cached_only)["locations"][0]
+
+    def get_weather_bundles(self, locations=None, refresh=False, cached_only=False):
+        """Get weather bundles for several locations with all requests issued concurrently
+
+        locations defaults to the named locations (or the configured location
+        if none are set). Requests share the session pool, worker limit and
+        cache with every other weather query. Returns {"success", "locations":
+        [bundle, ...], "summary"} where summary is one sentence per location.
+        """
+        if locations is None:
+            locations = list(self.locations.values()) or [self.location]
+
+        if not self.api_key:
+            bundle = self._missing_api_key_error()
+            bundle["forecast"] = self._missing_api_key_error()
+            return {
+                "success": False,
+                "error": bundle["error"],
+                "locations": [dict(bundle, location=location) for location in locations],
+                "summary": bundle["error"]
+            }
+
+        futures = [
+            (
+                location,
+                _request_executor.submit(self._get_data, "weather", refresh, cached_only, location),
+                _request_executor.submit(self._get_data, "forecast", refresh, cached_only, location),
+            )
+            for location in locations
+        ]
+
+        bundles = []
+        for location, weather_future, forecast_future in futures:
+            bundle = self._build_result("weather", weather_future.result, location)
+            bundle["forecast"] = self._build_result("forecast", forecast_future.result, location)
+            bundles.append(bundle)
+
+        return {
+            "success": any(bundle["success"] for bundle in bundles),
+            "locations": bundles,
+            "summary": self.summarize_bundles(bundles)
+        }
+
+    def summarize_bundles(self, bundles):
+        """Build a short spoken summary with one sentence per location"""
+        sentences = []
+        for bundle in bundles:
+            if not bundle["success"]:
+                sentences.append(f"{bundle['location']}: weather unavailable.")
+                continue
+            sentence = f"{bundle['location']}: {bundle['temperature']} degrees with {bundle['description']}"
+            forecast = bundle.get("forecast", {})
+            if forecast.get("success") and forecast["rain_expected"]:
+                sentence += ", rain expected later"
+            sentences.append(sentence + ".")
+        return " ".join(sentences)
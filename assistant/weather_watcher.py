@@ -0,0 +1,114 @@
+# weather_watcher.py
+
+import datetime
+import threading
+import time
+from assistant.text_to_speech import speak
+from assistant.forecast import DAY_SECONDS
+
+
+class WeatherWatcher:
+    """Polls the forecast at a low rate and announces only meaningful changes.
+
+    Each poll reduces the forecast to a tiny state tuple (first rain slot in
+    the alert window, forecast low and high for the next day); notifications
+    are sent only when that state changes in a way worth mentioning.
+    """
+
+    def __init__(self, weather_service, interval=30 * 60, rain_within_hours=3, temp_swing=8, notify=speak):
+        self.weather_service = weather_service
+        self.interval = interval  # Seconds between polls
+        self.rain_within_hours = rain_within_hours  # Announce rain starting within this many hours
+        self.temp_swing = temp_swing  # Degrees Celsius that count as a notable temperature change
+        self.notify = notify
+
+        self.listeners = []  # Extra callbacks, e.g. the GUI, called with each message
+        self._state = None  # (rain_start, low, high) from the previous poll
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        """Register a callback that receives every alert message"""
+        self.listeners.append(callback)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start polling in the background"""
+        if self.is_running():
+            return
+        # A new event per thread, so a poll still running after stop() can't be revived by start()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._watch_worker, args=(self._stop_event,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling and wait briefly for a poll in progress to finish"""
+        self._stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+
+    def _watch_worker(self, stop_event):
+        while not stop_event.is_set():
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error checking weather alerts: {e}")
+            stop_event.wait(self.interval)
+
+    def _summarize(self, table, now):
+        """Reduce a forecast table to the compact state used for diffing"""
+        rain_window = table.window(now, now + self.rain_within_hours * 60 * 60)
+        day_window = table.window(now, now + DAY_SECONDS)
+        if day_window is None:
+            return None
+        rain_start = rain_window["first_rain"] if rain_window else None
+        return (rain_start, day_window["min_temp"], day_window["max_temp"])
+
+    def _diff(self, previous, current):
+        """Return the alert messages for a state change"""
+        # The first poll only sets the baseline; rain already forecast then isn't a change
+        if previous is None:
+            return []
+
+        messages = []
+        rain_start, low, high = current
+
+        previous_rain = previous[0]
+        if rain_start is not None and previous_rain is None:
+            start = datetime.datetime.fromtimestamp(max(rain_start, time.time()))
+            messages.append(f"Heads up: rain is expected from around {start.strftime('%I:%M %p')}.")
+        elif rain_start is None and previous_rain is not None:
+            messages.append("The rain expected earlier is no longer in the forecast.")
+
+        swing = high - low
+        if swing >= self.temp_swing and previous[2] - previous[1] < self.temp_swing:
+            messages.append(f"Temperatures will swing between {low} and {high} degrees Celsius over the next day.")
+        elif abs(high - previous[2]) >= self.temp_swing or abs(low - previous[1]) >= self.temp_swing:
+            messages.append(f"The forecast changed: expect {low} to {high} degrees Celsius over the next day.")
+
+        return messages
+
+    def check(self):
+        """Poll the forecast once and announce any meaningful change"""
+        # The forecast comes from the shared weather cache, so polling faster
+        # than its TTL costs no extra API calls
+        table = self.weather_service.get_forecast_table()
+        state = self._summarize(table, time.time())
+        if state is None:
+            return []
+
+        messages = self._diff(self._state, state)
+        self._state = state
+
+        for message in messages:
+            print(f"Weather alert: {message}")
+            self.notify(message)
+            for listener in self.listeners:
+                try:
+                    listener(message)
+                except Exception as e:
+                    print(f"Error in weather alert listener: {e}")
+        return messages
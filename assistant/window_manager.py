@@ -0,0 +1,428 @@
+# window_manager.py
+
+import platform
+import os
+import select
+import threading
+import time
+import psutil
+from assistant.process_index import normalize_process_name
+
+
+def normalize_window_title(title):
+    """Normalize a window title for lookups"""
+    return " ".join((title or "").lower().split())
+
+
+class FakeWindowBackend:
+    """In-memory window backend for tests"""
+
+    def __init__(self, windows=None):
+        self.windows = list(windows or [])
+        self.focused = []  # Handles passed to focus(), in call order
+        self.list_calls = 0
+        self.changed = threading.Event()
+
+    def add_window(self, handle, title, pid=0, process=""):
+        self.windows.append({"handle": handle, "title": title, "pid": pid, "process": process})
+        self.changed.set()
+
+    def remove_window(self, handle):
+        self.windows = [win for win in self.windows if win["handle"] != handle]
+        self.changed.set()
+
+    def list_windows(self):
+        self.list_calls += 1
+        return [dict(win) for win in self.windows]
+
+    def focus(self, handle):
+        if not any(win["handle"] == handle for win in self.windows):
+            return False
+        self.focused.append(handle)
+        return True
+
+    def wait_for_change(self, timeout):
+        changed = self.changed.wait(timeout)
+        self.changed.clear()
+        return changed
+
+
+# WinEvent constants for the change hook
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+WINEVENT_SKIPOWNPROCESS = 0x0002
+OBJID_WINDOW = 0
+GA_ROOT = 2
+PM_REMOVE = 0x0001
+QS_ALLINPUT = 0x04FF
+
+
+class PywinautoWindowBackend:
+    """Windows backend using pywinauto's desktop enumeration.
+
+    The win32 backend is used by default because it enumerates top-level
+    windows in milliseconds, whereas UIA can take seconds. Changes are
+    reported through an out-of-context WinEvent hook on top-level windows
+    being created, destroyed, shown, hidden, renamed or focused. If the hook
+    can't be installed, wait_for_change() just sleeps and the window list is
+    refreshed every TTL instead.
+    """
+
+    def __init__(self, backend="win32"):
+        from pywinauto import Desktop
+        from pywinauto.controls.hwndwrapper import HwndWrapper
+        self.backend = backend
+        self.Desktop = Desktop
+        self.HwndWrapper = HwndWrapper
+        self._thread_state = threading.local()
+        self._known_handles = set()  # Handles from the last enumeration, to spot destroyed windows
+
+    def _desktop(self):
+        """Return a Desktop for the calling thread (UIA needs COM initialized per thread)"""
+        desktop = getattr(self._thread_state, "desktop", None)
+        if desktop is None:
+            if self.backend == "uia":
+                import comtypes
+                comtypes.CoInitialize()
+            desktop = self.Desktop(backend=self.backend)
+            self._thread_state.desktop = desktop
+        return desktop
+
+    def list_windows(self):
+        windows = []
+        for win in self._desktop().windows():
+            try:
+                windows.append({
+                    "handle": win.handle,
+                    "title": win.window_text(),
+                    "pid": win.process_id(),
+                    "process": "",
+                })
+            except Exception:
+                continue
+        self._known_handles = {win["handle"] for win in windows}
+        return windows
+
+    def focus(self, handle):
+        # Wrapping the handle directly avoids another enumeration
+        self.HwndWrapper(handle).set_focus()
+        return True
+
+    def _install_hooks(self):
+        """Hook window events for the calling thread; returns False if that isn't possible"""
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.windll.user32
+        user32.SetWinEventHook.restype = wintypes.HANDLE
+        user32.GetAncestor.restype = wintypes.HWND
+        state = self._thread_state
+        state.changed = False
+
+        def on_event(hook, event, hwnd, id_object, id_child, thread_id, time_ms):
+            if id_object != OBJID_WINDOW or id_child != 0 or not hwnd:
+                return
+            if event == EVENT_OBJECT_DESTROY:
+                # A destroyed window has no ancestors left to check
+                state.changed = state.changed or hwnd in self._known_handles
+            elif user32.GetAncestor(hwnd, GA_ROOT) == hwnd:
+                state.changed = True
+
+        prototype = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG,
+                                       wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        state.callback = prototype(on_event)  # Must outlive the hooks
+        flags = WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS
+        state.hooks = [
+            user32.SetWinEventHook(first, last, None, state.callback, 0, 0, flags)
+            for first, last in [(EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+                                (EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE),
+                                (EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE)]
+        ]
+        state.msg = wintypes.MSG()
+        state.user32 = user32
+        return all(state.hooks)
+
+    def wait_for_change(self, timeout):
+        """Pump this thread's messages until a window event arrives or the timeout expires"""
+        state = self._thread_state
+        if not hasattr(state, "hooked"):
+            try:
+                state.hooked = self._install_hooks()
+            except Exception as e:
+                print(f"Error installing window event hook: {e}")
+                state.hooked = False
+            if not state.hooked:
+                print("Window change events unavailable, refreshing the window list on a timer")
+        if not state.hooked:
+            time.sleep(timeout)
+            return False
+
+        import ctypes
+        user32, msg = state.user32, state.msg
+        deadline = time.monotonic() + timeout
+        settle_until = None
+        while True:
+            # Out-of-context WinEvent callbacks are delivered while the hooking thread reads messages
+            while user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_REMOVE):
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+            now = time.monotonic()
+            if state.changed and settle_until is None:
+                # Windows open and close in bursts; collect the rest of the burst first
+                settle_until = min(now + 0.05, deadline)
+            wait_until = settle_until if settle_until is not None else deadline
+            if now >= wait_until:
+                break
+            user32.MsgWaitForMultipleObjects(0, None, False, int((wait_until - now) * 1000) + 1, QS_ALLINPUT)
+
+        changed, state.changed = state.changed, False
+        return changed
+
+
+class EWMHWindowBackend:
+    """Linux backend for X11 window managers that implement EWMH"""
+
+    def __init__(self):
+        from Xlib import X, Xatom, display, protocol
+        self.X = X
+        self.Xatom = Xatom
+        self.protocol = protocol
+
+        self.display = display.Display()
+        self.root = self.display.screen().root
+        self.atoms = {
+            name: self.display.intern_atom(name)
+            for name in ["_NET_CLIENT_LIST", "_NET_ACTIVE_WINDOW", "_NET_WM_NAME", "_NET_WM_PID", "UTF8_STRING"]
+        }
+
+        # Separate connection for change notifications, Xlib displays are not thread safe
+        self.event_display = display.Display()
+        self.event_display.screen().root.change_attributes(event_mask=X.PropertyChangeMask)
+        self.event_display.flush()
+        self._lock = threading.Lock()
+
+    def _get_property(self, window, name, prop_type):
+        prop = window.get_full_property(self.atoms[name], prop_type)
+        return prop.value if prop else None
+
+    def list_windows(self):
+        windows = []
+        with self._lock:
+            handles = self._get_property(self.root, "_NET_CLIENT_LIST", self.Xatom.WINDOW) or []
+            for handle in handles:
+                try:
+                    window = self.display.create_resource_object("window", handle)
+                    title = self._get_property(window, "_NET_WM_NAME", self.atoms["UTF8_STRING"])
+                    if title is None:
+                        title = window.get_wm_name()
+                    if isinstance(title, bytes):
+                        title = title.decode("utf-8", errors="ignore")
+                    pid = self._get_property(window, "_NET_WM_PID", self.Xatom.CARDINAL)
+                    windows.append({
+                        "handle": int(handle),
+                        "title": title or "",
+                        "pid": int(pid[0]) if pid is not None and len(pid) else 0,
+                        "process": "",
+                    })
+                except Exception:
+                    # Windows can disappear while we enumerate them
+                    continue
+        return windows
+
+    def focus(self, handle):
+        with self._lock:
+            window = self.display.create_resource_object("window", handle)
+            # Source indication 2 = request from a pager/taskbar, which window managers honour
+            event = self.protocol.event.ClientMessage(
+                window=window,
+                client_type=self.atoms["_NET_ACTIVE_WINDOW"],
+                data=(32, [2, self.X.CurrentTime, 0, 0, 0]),
+            )
+            mask = self.X.SubstructureRedirectMask | self.X.SubstructureNotifyMask
+            self.root.send_event(event, event_mask=mask)
+            self.display.flush()
+        return True
+
+    def wait_for_change(self, timeout):
+        """Block until the client list or active window changes, or the timeout expires"""
+        readable, _, _ = select.select([self.event_display.fileno()], [], [], timeout)
+        if not readable:
+            return False
+        changed = False
+        watched = (self.atoms["_NET_CLIENT_LIST"], self.atoms["_NET_ACTIVE_WINDOW"])
+        while self.event_display.pending_events():
+            event = self.event_display.next_event()
+            if event.type == self.X.PropertyNotify and event.atom in watched:
+                changed = True
+        return changed
+
+
+def create_window_backend():
+    """Create the window backend for the current platform, or None if unsupported"""
+    os_name = platform.system()
+    try:
+        if os_name == "Windows":
+            return PywinautoWindowBackend()
+        if os_name == "Linux" and os.environ.get("DISPLAY"):
+            return EWMHWindowBackend()
+    except ImportError as e:
+        print(f"Window management not available: {e}")
+    except Exception as e:
+        print(f"Error initializing window backend: {e}")
+    return None
+
+
+class WindowManager:
+    """Cached list of top-level windows indexed by process and normalized title.
+
+    A background thread refreshes the list whenever the backend reports a
+    change, and at least every `ttl` seconds, so lookups normally never
+    enumerate windows themselves.
+    """
+
+    def __init__(self, backend, ttl=2.0):
+        self.backend = backend
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._windows = []
+        self._by_process = {}  # normalized process name -> [window, ...]
+        self._by_title = {}  # normalized title -> window
+        self._process_names = {}  # pid -> normalized process name
+        self._last_refresh = 0.0
+
+        self._stop_event = threading.Event()
+        self._refresh_thread = None
+
+    def start(self):
+        """Start refreshing the window list in the background"""
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        # A new event per thread, so a thread that outlives stop()'s join can't be revived by start()
+        self._stop_event = threading.Event()
+        self._refresh_thread = threading.Thread(target=self._refresh_worker, args=(self._stop_event,), daemon=True)
+        self._refresh_thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread and wait for it to finish"""
+        self._stop_event.set()
+        # A thread blocked in wait_for_change() exits at its next wake-up; its own event stays set
+        if self._refresh_thread and self._refresh_thread is not threading.current_thread():
+            self._refresh_thread.join(timeout=2)
+        self._refresh_thread = None
+
+    def _refresh_worker(self, stop_event):
+        """Refresh on backend change notifications or when the TTL expires"""
+        while not stop_event.is_set():
+            try:
+                self.refresh()
+                self.backend.wait_for_change(self.ttl)
+            except Exception as e:
+                print(f"Error refreshing window list: {e}")
+                stop_event.wait(self.ttl)
+
+    def _process_name(self, pid, known_names):
+        """Return the normalized process name for a PID, from known_names if it was seen before"""
+        if not pid:
+            return ""
+        name = known_names.get(pid)
+        if name is None:
+            try:
+                name = normalize_process_name(psutil.Process(pid).name())
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                name = ""
+        return name
+
+    def refresh(self):
+        """Enumerate windows through the backend and rebuild the indexes"""
+        windows = self.backend.list_windows()
+        with self._lock:
+            known_names = self._process_names
+
+        by_process = {}
+        by_title = {}
+        # Only PIDs that still own windows are kept, so recycled PIDs are looked up again
+        process_names = {}
+        for win in windows:
+            if win.get("process"):
+                win["process"] = normalize_process_name(win["process"])
+            else:
+                win["process"] = process_names[win.get("pid")] = self._process_name(win.get("pid"), known_names)
+            win["normalized_title"] = normalize_window_title(win.get("title"))
+
+            if win["process"]:
+                by_process.setdefault(win["process"], []).append(win)
+            if win["normalized_title"]:
+                by_title.setdefault(win["normalized_title"], win)
+
+        with self._lock:
+            self._process_names = process_names
+            self._windows = windows
+            self._by_process = by_process
+            self._by_title = by_title
+            self._last_refresh = time.monotonic()
+
+    def _ensure_fresh(self):
+        """Refresh synchronously if the background thread has missed a refresh cycle"""
+        if time.monotonic() - self._last_refresh > self.ttl * 2:
+            self.refresh()
+
+    def windows(self):
+        """Return the cached window list"""
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._windows)
+
+    def find_window(self, title=None, process=None):
+        """Find a window by process name, exact title, or title substring"""
+        self._ensure_fresh()
+        with self._lock:
+            if process:
+                matches = self._by_process.get(normalize_process_name(process))
+                if matches:
+                    # Prefer the process's window that actually has a title
+                    titled = [win for win in matches if win["normalized_title"]]
+                    return (titled or matches)[0]
+
+            if title:
+                key = normalize_window_title(title)
+                if key in self._by_title:
+                    return self._by_title[key]
+                for win in self._windows:
+                    if key in win["normalized_title"]:
+                        return win
+        return None
+
+    def focus(self, title=None, process=None):
+        """Bring the matching window to the foreground"""
+        win = self.find_window(title=title, process=process)
+        if win is None:
+            return False
+        try:
+            return self.backend.focus(win["handle"])
+        except Exception as e:
+            # The cached window may have closed; retry once against a fresh list
+            print(f"Error focusing cached window, refreshing: {e}")
+            self.refresh()
+            win = self.find_window(title=title, process=process)
+            return bool(win) and self.backend.focus(win["handle"])
+
+
+_shared_manager = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_window_manager():
+    """Return the process-wide WindowManager, or None if the platform is unsupported"""
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            backend = create_window_backend()
+            if backend is None:
+                return None
+            _shared_manager = WindowManager(backend)
+            _shared_manager.start()
+        return _shared_manager
@@ -0,0 +1,57 @@
+# benchmark_capture_presets.py - Measures camera throughput for each capture preset
+#
+# Usage: python benchmark_capture_presets.py [camera_index_or_video_file] [number_of_frames]
+#
+# The camera is reopened for every preset so each one starts from a fresh
+# negotiation. The table shows what was requested, what the driver
+# granted, and the frame rate actually delivered. Without a camera index
+# the camera found by camera discovery is used.
+
+import sys
+import os
+
+import cv2
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.capture_settings import CAPTURE_PRESETS, apply_capture_settings, measure_throughput
+
+
+def open_source(source):
+    if source is None:
+        from assistant.camera_discovery import open_camera
+        return open_camera()
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    return cap if cap.isOpened() else None
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else None
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+
+    print(f"{'preset':<22} {'requested':<22} {'granted':<22} {'delivered fps':>13}  notes")
+    for name, preset in CAPTURE_PRESETS.items():
+        cap = open_source(source)
+        if cap is None:
+            print("Could not open the camera")
+            return
+        try:
+            granted = apply_capture_settings(cap, preset["fourcc"], preset["width"], preset["height"], preset["fps"])
+            result = measure_throughput(cap, frames=frames)
+        finally:
+            cap.release()
+
+        requested = "default"
+        if preset["width"]:
+            requested = f"{preset['fourcc'] or '-'} {preset['width']}x{preset['height']}@{preset['fps']}"
+        size = result["frame_size"] or (granted["width"], granted["height"])
+        shown = f"{granted['fourcc'] or '-'} {size[0]}x{size[1]}@{granted['fps']}"
+        notes = "; ".join(granted["mismatches"])
+        if result["failures"]:
+            notes = (notes + "; " if notes else "") + f"{result['failures']} failed reads"
+        print(f"{preset['label']:<22} {requested:<22} {shown:<22} {result['fps']:>13}  {notes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmark_face_detection.py - Compares full-frame face detection with the downscaled ROI pipeline
+#
+# Usage: python benchmark_face_detection.py [video_file_or_camera_index] [number_of_frames]
+#
+# Frames are loaded into memory first so only detection is measured. Recall
+# is measured against per-frame full-resolution detection (the old
+# behaviour): a reference face counts as found if a detected box overlaps
+# it with IoU >= 0.3.
+
+import sys
+import os
+import time
+
+import cv2
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.face_detection import FaceDetector, box_iou
+
+CONFIGS = [
+    {"detect_width": None, "full_detect_interval": 1},
+    {"detect_width": 480, "full_detect_interval": 1},
+    {"detect_width": 480, "full_detect_interval": 6},
+    {"detect_width": 320, "full_detect_interval": 6},
+    {"detect_width": 480, "full_detect_interval": 12},
+]
+
+
+def load_frames(source, count):
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+    cap.release()
+    return frames
+
+
+def timed(detect, frames):
+    """Run detect over every frame; returns (results, cpu seconds, wall seconds)"""
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    results = [detect(gray) for gray in frames]
+    return results, time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def recall(reference, results):
+    expected = found = extra = 0
+    for ref_boxes, boxes in zip(reference, results):
+        expected += len(ref_boxes)
+        found += sum(1 for ref in ref_boxes if any(box_iou(ref, box) >= 0.3 for box in boxes))
+        extra += sum(1 for box in boxes if not any(box_iou(ref, box) >= 0.3 for ref in ref_boxes))
+    return (found / expected if expected else 1.0), extra
+
+
+def main():
+    source = sys.argv[1] if len(sys.argv) > 1 else "0"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    frames = load_frames(source, count)
+    if not frames:
+        print(f"Could not read any frames from {source}")
+        return
+    print(f"Loaded {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+    def baseline(gray):
+        return [tuple(box) for box in cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30))]
+
+    reference, cpu, wall = timed(baseline, frames)
+    faces = sum(len(boxes) for boxes in reference)
+    print(f"{'full frame, scaleFactor 1.1 (old)':<42} cpu {cpu / len(frames) * 1000:7.2f} ms/frame  "
+          f"wall {wall / len(frames) * 1000:7.2f} ms/frame  faces {faces}")
+
+    for config in CONFIGS:
+        detector = FaceDetector(cascade, **config)
+        results, cpu, wall = timed(lambda gray: [tuple(box) for box in detector.detect(gray)], frames)
+        found, extra = recall(reference, results)
+        label = f"width {config['detect_width'] or 'full'}, full scan every {config['full_detect_interval']}"
+        print(f"{label:<42} cpu {cpu / len(frames) * 1000:7.2f} ms/frame  "
+              f"wall {wall / len(frames) * 1000:7.2f} ms/frame  recall {found:6.1%}  extra boxes {extra}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# benchmark_recurrence.py - Measures next-occurrence computation and scheduling for many alarm rules
+#
+# Usage: python benchmark_recurrence.py [number_of_rules]
+
+import heapq
+import random
+import sys
+import os
+import time
+import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.recurrence import parse_recurrence
+
+PHRASES = [
+    "everyday", "weekdays", "weekends", "monday, wednesday, friday", "tuesday and thursday",
+    "every month on the 15th", "last day of every month", "every month on the 31st",
+    "every 2 hours", "every 45 minutes", "once", "tomorrow", "december 25th and january 1st",
+    "weekdays except december 24th and december 31st", "everyday except november 1st",
+]
+
+
+def build_rules(count, now):
+    rng = random.Random(42)
+    return [parse_recurrence(rng.choice(PHRASES), rng.randrange(24), rng.randrange(60), now=now)
+            for _ in range(count)]
+
+
+def naive_next(alarm, after, step=datetime.timedelta(minutes=1), limit=60 * 24 * 8):
+    """Minute-by-minute scan with the check the old per-alarm threads polled every 15 seconds"""
+    candidate = after.replace(second=0, microsecond=0) + step
+    for _ in range(limit):
+        current_day = candidate.strftime("%A").lower()
+        if (alarm["active"] and
+                candidate.hour == alarm["hour"] and
+                candidate.minute == alarm["minute"] and
+                current_day in alarm["days"]):
+            return candidate
+        candidate += step
+    return None
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    now = datetime.datetime.now().replace(second=0, microsecond=0)
+
+    start = time.perf_counter()
+    rules = build_rules(count, now)
+    build_time = time.perf_counter() - start
+    print(f"Parsed and compiled {count} rules in {build_time * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    heap = []
+    for index, rule in enumerate(rules):
+        next_time = rule.next_after(now)
+        if next_time is not None:
+            heap.append((next_time, index))
+    heapq.heapify(heap)
+    first_time = time.perf_counter() - start
+    print(f"First occurrence of every rule plus heapify: {first_time * 1000:.1f} ms "
+          f"({first_time / count * 1e6:.2f} us per rule)")
+
+    # Simulate a week of firing: pop the earliest alarm, compute its next occurrence, push it back
+    end = now + datetime.timedelta(days=7)
+    fired = 0
+    start = time.perf_counter()
+    while heap and heap[0][0] <= end:
+        fire_time, index = heapq.heappop(heap)
+        fired += 1
+        next_time = rules[index].next_after(fire_time)
+        if next_time is not None:
+            heapq.heappush(heap, (next_time, index))
+    simulate_time = time.perf_counter() - start
+    print(f"Simulated one week: {fired} firings in {simulate_time * 1000:.1f} ms "
+          f"({simulate_time / max(fired, 1) * 1e6:.2f} us per firing incl. heap operations)")
+
+    # For comparison, the old polling check for the daily and weekly rules it could express
+    sample = [rule for rule in rules if rule.day_names()][:50]
+    alarms = [{"hour": rule.time.hour, "minute": rule.time.minute, "days": rule.day_names(), "active": True}
+              for rule in sample]
+    start = time.perf_counter()
+    for alarm in alarms:
+        naive_next(alarm, now)
+    naive_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for rule in sample:
+        rule.next_after(now)
+    direct_time = time.perf_counter() - start
+    print(f"Old minute-by-minute polling check: {naive_time / len(sample) * 1e3:.2f} ms per rule, "
+          f"next_after: {direct_time / len(sample) * 1e6:.2f} us per rule "
+          f"({naive_time / max(direct_time, 1e-9):.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
-# GUI package for Project SAGE
-# This file makes the 'gui' directory a Python package
-
-# Version
+# GUI package for Project SAGE
+# This file makes the 'gui' directory a Python package
+
+# Version
 __version__ = "1.0.0"
\ No newline at end of file
@@ -1,10 +1,10 @@
-# main.py
-
-from assistant.core import Assistant
-
-def main():
-    assistant = Assistant()
-    assistant.run()
-
-if __name__ == "__main__":
-    main()
+# main.py
+
+from assistant.core import Assistant
+
+def main():
+    assistant = Assistant()
+    assistant.run()
+
+if __name__ == "__main__":
+    main()
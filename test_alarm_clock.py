@@ -0,0 +1,121 @@
+# test_alarm_clock.py - Tests for missed-alarm catch-up and clock change handling
+
+import unittest
+import sys
+import os
+import datetime
+import tempfile
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.alarm_clock import AlarmClock
+from assistant.alarm_scheduler import AlarmScheduler
+from assistant.recurrence import parse_recurrence
+from assistant.state_store import JournaledStore
+
+TODAY = datetime.datetime(2026, 10, 19)
+
+
+def at(hour, minute, days=0):
+    """Unix time of a local time of day, days after TODAY"""
+    return (TODAY + datetime.timedelta(days=days, hours=hour, minutes=minute)).timestamp()
+
+
+class FakeClocks:
+    """Wall and monotonic clocks that only move when told to"""
+
+    def __init__(self, wall):
+        self.wall = wall
+        self.mono = 1000.0
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not condition():
+        time.sleep(0.01)
+    return condition()
+
+
+class AlarmClockCatchUpTests(unittest.TestCase):
+    """Alarms missed while asleep or across clock jumps ring once, if recent enough"""
+
+    def setUp(self):
+        self.clocks = FakeClocks(at(7, 10))
+
+        with patch.object(AlarmClock, '__init__', return_value=None):
+            self.alarm_clock = AlarmClock()
+        clock = self.alarm_clock
+        clock.alarms = {}
+        clock.catch_up_window = 30 * 60
+        clock.clock = self.clocks.time
+        clock._lock = threading.RLock()
+        clock.store = JournaledStore(os.path.join(tempfile.mkdtemp(), "alarms.json"))
+        clock._rules = {}
+        clock._reported_missed = set()
+        clock.weather_prefetcher = MagicMock()
+        clock._trigger_alarm = MagicMock()  # Called instead of speaking
+        clock.scheduler = AlarmScheduler(clock._on_alarm_due, clock._on_clock_change, max_sleep=0.005,
+                                         clock=self.clocks.time, monotonic=self.clocks.monotonic)
+        self.addCleanup(clock.scheduler.stop)
+
+    def add_alarm(self, hour, minute):
+        """A daily alarm that last rang yesterday"""
+        rule = parse_recurrence("everyday", hour, minute)
+        time_key = f"{hour:02d}:{minute:02d}"
+        self.alarm_clock.alarms[time_key] = {
+            "hour": hour, "minute": minute, "days": rule.day_names(), "rule": rule.to_dict(),
+            "active": True, "created": at(hour, minute, days=-7), "last_fired": at(hour, minute, days=-1),
+        }
+        return time_key
+
+    def rung(self):
+        return [call.args for call in self.alarm_clock._trigger_alarm.call_args_list]
+
+    def test_recent_missed_alarm_rings_exactly_once(self):
+        """Missed by 10 minutes it rings late; missed by over two hours it is skipped"""
+        recent = self.add_alarm(7, 0)
+        too_old = self.add_alarm(5, 0)
+        self.alarm_clock.schedule_all()
+        self.alarm_clock.scheduler.start()
+
+        self.assertTrue(wait_for(lambda: self.rung()))
+        time.sleep(0.05)
+        self.assertEqual(self.rung(), [(recent, datetime.datetime.fromtimestamp(at(7, 0)))])
+
+        # Rescheduling again, as after a restart or clock change, must not ring it a second time
+        self.alarm_clock.schedule_all()
+        time.sleep(0.05)
+        self.assertEqual(len(self.rung()), 1)
+        self.assertEqual(self.alarm_clock.alarms[recent]["last_fired"], at(7, 0))
+        self.assertEqual(self.alarm_clock.scheduler.deadline(recent), at(7, 0, days=1))
+        self.assertEqual(self.alarm_clock.scheduler.deadline(too_old), at(5, 0, days=1))
+
+    def test_clock_jump_rearms_and_rings_once(self):
+        """A wall clock jump past an alarm re-arms everything and rings the alarm once, late"""
+        self.clocks.wall = at(6, 0)
+        time_key = self.add_alarm(7, 0)
+        self.alarm_clock.schedule_all()
+        self.alarm_clock.scheduler.start()
+        time.sleep(0.05)
+        self.assertEqual(self.rung(), [])
+
+        self.clocks.wall = at(7, 15)  # Suspend or manual clock change: the monotonic clock didn't move
+        self.assertTrue(wait_for(lambda: self.rung()))
+        time.sleep(0.05)
+        self.assertEqual(self.rung(), [(time_key, datetime.datetime.fromtimestamp(at(7, 0)))])
+        self.assertTrue(self.alarm_clock.weather_prefetcher.reschedule.called)
+        self.assertEqual(self.alarm_clock.scheduler.deadline(time_key), at(7, 0, days=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# test_alarm_scheduler.py - Tests for the heap-based alarm scheduler
+
+import unittest
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.alarm_scheduler import AlarmScheduler
+
+
+class FakeClocks:
+    """Wall and monotonic clocks that only move when told to"""
+
+    def __init__(self):
+        self.wall = 1700000000.0
+        self.mono = 1000.0
+
+    def time(self):
+        return self.wall
+
+    def monotonic(self):
+        return self.mono
+
+    def advance(self, seconds):
+        self.wall += seconds
+        self.mono += seconds
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not condition():
+        time.sleep(0.01)
+    return condition()
+
+
+class AlarmSchedulerTests(unittest.TestCase):
+    """Firing order, rescheduling and cancelling with a fake clock"""
+
+    def setUp(self):
+        self.clocks = FakeClocks()
+        self.fired = []
+        # A short max_sleep makes the thread look at the fake clock every few milliseconds
+        self.scheduler = AlarmScheduler(lambda key, deadline: self.fired.append((key, deadline)),
+                                        max_sleep=0.005, clock=self.clocks.time, monotonic=self.clocks.monotonic)
+        self.scheduler.start()
+        self.addCleanup(self.scheduler.stop)
+        self.start = self.clocks.wall
+
+    def test_fires_in_deadline_order(self):
+        for key, offset in [("c", 30), ("a", 10), ("b", 20)]:
+            self.scheduler.schedule(key, self.start + offset)
+        self.assertEqual(self.scheduler.next_deadline(), (self.start + 10, "a"))
+
+        self.clocks.advance(15)
+        self.assertTrue(wait_for(lambda: len(self.fired) == 1))
+        time.sleep(0.05)
+        self.assertEqual(self.fired, [("a", self.start + 10)])
+
+        self.clocks.advance(60)
+        self.assertTrue(wait_for(lambda: len(self.fired) == 3))
+        self.assertEqual([key for key, _ in self.fired], ["a", "b", "c"])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_reschedule_and_cancel_drop_stale_entries(self):
+        """Only the latest schedule of a key fires, and cancelled keys never do"""
+        self.scheduler.schedule("x", self.start + 10)
+        self.scheduler.schedule("y", self.start + 20)
+        self.scheduler.schedule("x", self.start + 50)
+        self.assertTrue(self.scheduler.cancel("y"))
+        self.assertFalse(self.scheduler.cancel("y"))
+
+        self.assertEqual(self.scheduler.next_deadline(), (self.start + 50, "x"))
+        self.assertEqual(self.scheduler.deadline("x"), self.start + 50)
+        self.assertIsNone(self.scheduler.deadline("y"))
+
+        self.clocks.advance(30)
+        time.sleep(0.05)
+        self.assertEqual(self.fired, [])
+
+        self.clocks.advance(30)
+        self.assertTrue(wait_for(lambda: self.fired))
+        time.sleep(0.05)
+        self.assertEqual(self.fired, [("x", self.start + 50)])
+
+    def test_clock_jump_is_reported(self):
+        """A wall clock that moves without the monotonic clock triggers on_clock_change"""
+        drifts = []
+        self.scheduler.on_clock_change = drifts.append
+        self.scheduler.schedule("x", self.start + 3 * 60 * 60)
+        time.sleep(0.05)
+
+        self.clocks.wall += 60 * 60
+        self.assertTrue(wait_for(lambda: drifts))
+        self.assertAlmostEqual(drifts[0], 60 * 60)
+        self.assertEqual(self.fired, [])
+
+    def test_many_reschedules_keep_the_heap_small(self):
+        for offset in range(1000):
+            self.scheduler.schedule("x", self.start + 100 + offset)
+        self.assertLess(len(self.scheduler._heap), 100)
+        self.assertEqual(len(self.scheduler), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
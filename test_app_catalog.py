@@ -0,0 +1,122 @@
+# test_app_catalog.py - Tests for the installed application catalog
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.app_catalog import ApplicationCatalog, DEFAULT_ALIASES
+
+
+class AppCatalogTests(unittest.TestCase):
+    """Desktop file parsing, name resolution and incremental rescans on a fake Linux tree"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.apps_dir = os.path.join(self.root, "data", "applications")
+        self.bin_dir = os.path.join(self.root, "bin")
+        os.makedirs(self.apps_dir)
+        os.makedirs(self.bin_dir)
+
+        environ = patch.dict(os.environ, {
+            "XDG_DATA_HOME": os.path.join(self.root, "data"),
+            "XDG_DATA_DIRS": "",
+            "PATH": self.bin_dir,
+        })
+        environ.start()
+        self.addCleanup(environ.stop)
+
+        self.write_desktop("org.gnome.Calculator", Name="Calculator", Exec="gnome-calculator %U")
+        self.write_desktop("code", Name="Visual Studio Code", GenericName="Text Editor",
+                           Exec="env GDK_BACKEND=x11 /usr/share/code/code --unity-launch %F")
+        self.write_desktop("hidden-tool", Name="Hidden Tool", Exec="hidden-tool", NoDisplay="true")
+        self.write_desktop("removed-tool", Name="Removed Tool", Exec="removed-tool", Hidden="true")
+        self.write_executable("pyhton-helper")
+        self.write_executable("spotify")
+
+        self.catalog = self.make_catalog()
+
+    def make_catalog(self):
+        with patch("platform.system", return_value="Linux"):
+            return ApplicationCatalog(os.path.join(self.root, "app_catalog.json"))
+
+    def write_desktop(self, stem, **fields):
+        lines = ["[Desktop Entry]", "Type=Application"] + [f"{key}={value}" for key, value in fields.items()]
+        with open(os.path.join(self.apps_dir, stem + ".desktop"), "w") as f:
+            f.write("\n".join(lines + ["", "[Desktop Action new-window]", "Name=Ignored", "Exec=ignored"]) + "\n")
+
+    def write_executable(self, name):
+        path = os.path.join(self.bin_dir, name)
+        with open(path, "w") as f:
+            f.write("#!/bin/sh\n")
+        os.chmod(path, 0o755)
+
+    def test_desktop_file_parsing(self):
+        """Field codes and env prefixes are dropped, and hidden entries are skipped"""
+        self.catalog.refresh()
+        calculator = self.catalog.resolve("calculator")
+        self.assertEqual(calculator["command"], ["gnome-calculator"])
+        self.assertEqual(calculator["source"], "desktop")
+
+        code = self.catalog.resolve("visual studio code")
+        self.assertEqual(code["command"], ["env", "GDK_BACKEND=x11", "/usr/share/code/code", "--unity-launch"])
+        self.assertEqual(code["process"], "code")
+        self.assertEqual(code["name"], "Visual Studio Code")
+
+        names = self.catalog.list_applications()
+        self.assertNotIn("Hidden Tool", names)
+        self.assertNotIn("Removed Tool", names)
+        self.assertNotIn("Ignored", names)
+
+    def test_resolve(self):
+        """Exact, space-insensitive, token-subset and fuzzy matches, with unrelated names rejected"""
+        self.catalog.refresh()
+        self.assertEqual(self.catalog.resolve("Visual Studio Code")["process"], "code")
+        self.assertEqual(self.catalog.resolve("visualstudio code")["process"], "code")
+        self.assertEqual(self.catalog.resolve("studio code")["process"], "code")
+        self.assertEqual(self.catalog.resolve("spotifi")["process"], "spotify")
+        self.assertIsNone(self.catalog.resolve("photoshop"))
+        self.assertIsNone(self.catalog.resolve("spo"))
+        self.assertIsNone(self.catalog.resolve(""))
+
+    def test_default_aliases(self):
+        """Spoken aliases launch the name directly before a scan, then the installed candidate"""
+        notepad = self.catalog.resolve("notepad")
+        self.assertEqual(notepad["source"], "alias")
+        self.assertEqual(notepad["command"], [DEFAULT_ALIASES["notepad"][0]])
+
+        self.catalog.refresh()
+        self.assertEqual(self.catalog.resolve("calculator")["process"], "gnome-calculator")
+        self.assertEqual(self.catalog.resolve("vscode")["process"], "code")
+        self.assertIsNone(self.catalog.resolve("notepad"))  # None of its candidates is installed
+
+    def test_unchanged_directories_are_not_rescanned(self):
+        """The cache file carries directory mtimes, so only changed directories are read again"""
+        self.catalog.refresh()
+        catalog = self.make_catalog()
+        self.assertEqual(catalog.resolve("calculator")["source"], "desktop")  # Served from the cache
+
+        with patch.object(catalog, "_scan_desktop_files") as scan_desktop, \
+                patch.object(catalog, "_scan_path_directory") as scan_path:
+            catalog.refresh()
+        scan_desktop.assert_not_called()
+        scan_path.assert_not_called()
+
+        self.write_desktop("firefox", Name="Firefox", Exec="firefox %u")
+        mtime = os.stat(self.apps_dir).st_mtime + 10
+        os.utime(self.apps_dir, (mtime, mtime))
+        with patch.object(catalog, "_scan_path_directory") as scan_path:
+            catalog.refresh()
+        scan_path.assert_not_called()
+        self.assertEqual(catalog.resolve("firefox")["command"], ["firefox"])
+        self.assertTrue(catalog.ready.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# test_bulk_enrollment.py - Tests for enrolling users from a name/*.jpg directory tree
+
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cv2
+import numpy as np
+
+from assistant import bulk_enrollment
+from assistant.face_samples import SAMPLE_SIZE
+
+
+class BrightnessDetector:
+    """Stands in for FaceDetector: dark images have no face, bright ones two, the rest one"""
+
+    def __init__(self, cascade, **settings):
+        self.min_size = None
+
+    def reset(self):
+        pass
+
+    def detect(self, gray):
+        mean = gray.mean()
+        if mean < 64:
+            return []
+        if mean > 192:
+            return [(0, 0, 40, 40), (60, 60, 40, 40)]
+        return [(10, 20, 80, 90)]
+
+
+class FakeRecognizer:
+    def __init__(self):
+        self.enrolled = None
+
+    def enroll_samples(self, samples_by_name):
+        self.enrolled = samples_by_name
+        users = {name: {"id": index + 1, "samples": len(samples)}
+                 for index, (name, samples) in enumerate(sorted(samples_by_name.items()))}
+        return {"success": True, "users": users, "seconds": 0.0}
+
+
+class EnrollDirectoryTests(unittest.TestCase):
+    """Extraction, rejects and the report for a small synthetic tree"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        images = {
+            "ana": [128, 120, 30],  # Two faces, one image without a face
+            "ben": [130, 240],  # One face, one image with two faces
+        }
+        for name, values in images.items():
+            os.makedirs(os.path.join(self.directory, name))
+            for index, value in enumerate(values):
+                path = os.path.join(self.directory, name, f"{index}.jpg")
+                cv2.imwrite(path, np.full((160, 120), value, dtype=np.uint8))
+        with open(os.path.join(self.directory, "ben", "broken.jpg"), "wb") as f:
+            f.write(b"not a jpeg")
+        with open(os.path.join(self.directory, "notes.txt"), "w") as f:
+            f.write("ignored")
+
+    def test_enroll_directory_with_one_worker(self):
+        recognizer = FakeRecognizer()
+        with patch.object(bulk_enrollment, "FaceDetector", BrightnessDetector):
+            report = bulk_enrollment.enroll_directory(recognizer, self.directory, workers=1)
+
+        self.assertTrue(report["success"])
+        self.assertEqual(report["images"], 6)
+        self.assertEqual(report["accepted"], 3)
+        reasons = {os.path.relpath(r["image"], self.directory): r["reason"] for r in report["rejects"]}
+        self.assertEqual(reasons, {
+            os.path.join("ana", "2.jpg"): "no face found",
+            os.path.join("ben", "1.jpg"): "2 faces found",
+            os.path.join("ben", "broken.jpg"): "could not be decoded",
+        })
+
+        self.assertEqual({name: len(s) for name, s in recognizer.enrolled.items()}, {"ana": 2, "ben": 1})
+        self.assertEqual(recognizer.enrolled["ana"][0].shape, (SAMPLE_SIZE[1], SAMPLE_SIZE[0]))
+        self.assertEqual(report["users"]["ben"], {"id": 2, "samples": 1})
+
+    def test_missing_directory(self):
+        report = bulk_enrollment.enroll_directory(FakeRecognizer(), os.path.join(self.directory, "nobody"))
+        self.assertFalse(report["success"])
+
+
+if __name__ == '__main__':
+    unittest.main()
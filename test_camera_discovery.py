@@ -0,0 +1,94 @@
+# test_camera_discovery.py - Tests for parallel camera probing and the camera cache
+
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from assistant import camera_discovery
+
+
+class FakeCapture:
+    """Stands in for cv2.VideoCapture; behavior depends on the camera index"""
+
+    opened = []
+    released = []
+
+    def __init__(self, index, api):
+        self.index = index
+        if index == 0:
+            time.sleep(0.5)  # A driver that hangs
+        FakeCapture.opened.append((index, api))
+
+    def isOpened(self):
+        return self.index in (0, 1)
+
+    def read(self):
+        return True, np.zeros((480, 640, 3), dtype=np.uint8)
+
+    def release(self):
+        FakeCapture.released.append(self.index)
+
+
+def join_probe_threads(timeout=2):
+    """Wait for the probe threads discovery started, including abandoned ones; True if all finished"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        probes = [thread for thread in threading.enumerate()
+                  if thread.name.startswith(camera_discovery.PROBE_THREAD_PREFIX)]
+        if not probes:
+            return True
+        for thread in probes:
+            thread.join(max(deadline - time.time(), 0))
+    return False
+
+
+class CameraDiscoveryTests(unittest.TestCase):
+    """Probe timeouts, index preference and the on-disk cache"""
+
+    def setUp(self):
+        self.cache_file = os.path.join(tempfile.mkdtemp(), "camera_cache.json")
+        self.original_open = camera_discovery._open_capture
+        camera_discovery._open_capture = FakeCapture
+        camera_discovery._last_choice = None
+        FakeCapture.opened, FakeCapture.released = [], []
+
+    def tearDown(self):
+        # Abandoned probes still finish on their own; don't let them touch the next test's FakeCapture lists
+        join_probe_threads()
+        camera_discovery._open_capture = self.original_open
+        camera_discovery._last_choice = None
+
+    def test_hung_probe_times_out_and_choice_is_cached(self):
+        start = time.time()
+        result = camera_discovery.discover_camera(timeout=0.1, refresh=True, cache_file=self.cache_file)
+        self.assertLess(time.time() - start, 0.45)
+        self.assertTrue(result["success"])
+        self.assertEqual((result["index"], result["width"], result["height"]), (1, 640, 480))
+        self.assertFalse(result["cached"])
+
+        FakeCapture.opened = []
+        camera_discovery._last_choice = None
+        result = camera_discovery.discover_camera(timeout=0.1, cache_file=self.cache_file)
+        self.assertTrue(result["cached"])
+        self.assertEqual(FakeCapture.opened, [(1, result["api"])])
+
+    def test_keep_open_hands_over_probe_capture(self):
+        result = camera_discovery.discover_camera(timeout=1.0, refresh=True, keep_open=True,
+                                                  cache_file=self.cache_file)
+        self.assertEqual(result["index"], 0)
+        self.assertIsInstance(result["capture"], FakeCapture)
+        # Every other capture that was opened gets released
+        self.assertTrue(join_probe_threads())
+        self.assertEqual(len(FakeCapture.released), len(FakeCapture.opened) - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
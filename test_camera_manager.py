@@ -0,0 +1,156 @@
+# test_camera_manager.py - Tests for the shared, reference-counted camera
+
+import unittest
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+import cv2
+
+from assistant import camera_manager
+from assistant.capture_settings import DEFAULT_PRESET, apply_capture_settings, decode_fourcc, get_preset
+
+
+class FakeCapture:
+    """Delivers numbered frames at about 100 fps"""
+
+    def __init__(self):
+        self.count = 0
+        self.released = False
+
+    def read(self):
+        time.sleep(0.01)
+        self.count += 1
+        return True, np.full((4, 4), self.count % 256, dtype=np.uint8)
+
+    def set(self, prop, value):
+        return True
+
+    def get(self, prop):
+        return 0
+
+    def release(self):
+        self.released = True
+
+
+class CameraManagerTests(unittest.TestCase):
+    """Shared frames, reuse between consumers and the idle release"""
+
+    def setUp(self):
+        self.captures = []
+        self.original_open = camera_manager.open_camera
+        camera_manager.open_camera = self._open
+        self.manager = camera_manager.CameraManager(idle_timeout=0.2)
+
+    def tearDown(self):
+        self.manager.close()
+        camera_manager.open_camera = self.original_open
+
+    def _open(self):
+        self.captures.append(FakeCapture())
+        return self.captures[-1]
+
+    def test_subscribers_share_one_device(self):
+        first = self.manager.acquire("first")
+        second = self.manager.acquire("second")
+        self.assertIsNotNone(first.read()[0])
+        self.assertIsNotNone(second.read()[0])
+        self.assertEqual(len(self.captures), 1)
+        self.assertEqual(self.manager.subscriber_count(), 2)
+
+    def test_device_is_reused_then_released_when_idle(self):
+        self.manager.acquire("recognition").close()
+        registration = self.manager.acquire("registration")
+        self.assertEqual(self.manager.opens, 1)
+        registration.close()
+
+        time.sleep(0.5)
+        self.assertFalse(self.manager.is_open())
+        self.assertTrue(self.captures[0].released)
+
+    def test_shared_capture_interface(self):
+        capture = self.manager.acquire("legacy").as_capture()
+        self.assertTrue(capture.isOpened())
+        ret, frame = capture.read()
+        self.assertTrue(ret)
+        capture.release()
+        self.assertEqual(self.manager.subscriber_count(), 0)
+
+
+class PickyCapture:
+    """A driver that grants MJPG but only at 1280x720"""
+
+    def __init__(self):
+        self.props = {cv2.CAP_PROP_FRAME_WIDTH: 1280, cv2.CAP_PROP_FRAME_HEIGHT: 720, cv2.CAP_PROP_FPS: 30}
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FOURCC:
+            self.props[prop] = value
+        return True
+
+    def get(self, prop):
+        return self.props.get(prop, 0)
+
+
+class RefusingCapture(FakeCapture):
+    """A driver that refuses every setting and keeps its YUYV 320x240 at 10 fps"""
+
+    def __init__(self):
+        super().__init__()
+        self.props = {cv2.CAP_PROP_FOURCC: cv2.VideoWriter_fourcc(*"YUYV"), cv2.CAP_PROP_FRAME_WIDTH: 320,
+                      cv2.CAP_PROP_FRAME_HEIGHT: 240, cv2.CAP_PROP_FPS: 10}
+
+    def set(self, prop, value):
+        return False
+
+    def get(self, prop):
+        return self.props.get(prop, 0)
+
+
+class CaptureSettingsTests(unittest.TestCase):
+    """Requesting a capture format and checking what was granted"""
+
+    def test_decode_fourcc(self):
+        self.assertEqual(decode_fourcc(cv2.VideoWriter_fourcc(*"MJPG")), "MJPG")
+        self.assertIsNone(decode_fourcc(0))
+
+    def test_mismatches_are_reported(self):
+        granted = apply_capture_settings(PickyCapture(), "MJPG", 640, 480, 30)
+        self.assertEqual(granted["fourcc"], "MJPG")
+        self.assertEqual((granted["width"], granted["height"]), (1280, 720))
+        self.assertEqual(granted["mismatches"], ["size 640x480 -> 1280x720"])
+
+    def test_unknown_preset_falls_back_to_default(self):
+        self.assertEqual(get_preset("nonsense")["name"], DEFAULT_PRESET)
+        self.assertEqual(get_preset("nonsense")["width"], get_preset(DEFAULT_PRESET)["width"])
+
+    def test_refused_settings_are_all_reported(self):
+        granted = apply_capture_settings(RefusingCapture(), "MJPG", 640, 480, 30)
+        self.assertEqual((granted["fourcc"], granted["width"], granted["height"], granted["fps"]),
+                         ("YUYV", 320, 240, 10))
+        self.assertEqual(granted["mismatches"], ["format MJPG -> YUYV", "size 640x480 -> 320x240", "fps 30 -> 10"])
+
+    def test_manager_keeps_streaming_when_the_driver_refuses(self):
+        """The device is used as granted, and an unknown preset negotiates the default one"""
+        original_open = camera_manager.open_camera
+        camera_manager.open_camera = RefusingCapture
+        self.addCleanup(setattr, camera_manager, "open_camera", original_open)
+        manager = camera_manager.CameraManager(idle_timeout=0.2, preset="nonsense")
+        self.addCleanup(manager.close)
+
+        subscription = manager.acquire("recognition")
+        self.assertIsNotNone(subscription.read()[0])
+        self.assertEqual(manager.preset, DEFAULT_PRESET)
+        self.assertEqual(manager.settings["preset"], DEFAULT_PRESET)
+        self.assertEqual((manager.settings["width"], manager.settings["height"]), (320, 240))
+        self.assertEqual(len(manager.settings["mismatches"]), 3)
+        subscription.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# test_camera_stream.py - Tests for the threaded latest-frame camera buffer
+
+import unittest
+import sys
+import os
+import queue
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from assistant.camera_stream import CameraStream
+
+
+class QueueCapture:
+    """VideoCapture stand-in that delivers the frames the test puts in its queue"""
+
+    def __init__(self):
+        self.frames = queue.Queue()
+        self.released = False
+
+    def push(self, value):
+        self.frames.put(np.full((4, 4), value, dtype=np.uint8))
+
+    def read(self):
+        try:
+            return True, self.frames.get(timeout=0.01)
+        except queue.Empty:
+            return False, None
+
+    def release(self):
+        self.released = True
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not condition():
+        time.sleep(0.005)
+    return condition()
+
+
+class CameraStreamTests(unittest.TestCase):
+    """Latest-frame slot, sequence numbers and shutdown"""
+
+    def setUp(self):
+        self.capture = QueueCapture()
+        self.stream = CameraStream(self.capture, max_failures=10000).start()
+        self.addCleanup(self.stream.stop)
+
+    def test_reader_gets_only_the_newest_frame(self):
+        """Frames replaced before anyone read them are dropped, not queued"""
+        for value in (1, 2, 3):
+            self.capture.push(value)
+        self.assertTrue(wait_for(lambda: self.stream.frames_captured == 3))
+
+        frame, seq, timestamp = self.stream.read()
+        self.assertEqual((int(frame[0, 0]), seq), (3, 3))
+        self.assertGreater(timestamp, 0)
+        self.assertEqual(self.stream.stats()["frames_dropped"], 2)
+
+        # Passing the last seq never returns the same frame twice
+        self.assertEqual(self.stream.read(after_seq=seq, timeout=0.05), (None, 3, 0.0))
+        self.capture.push(4)
+        frame, seq, _ = self.stream.read(after_seq=seq)
+        self.assertEqual((int(frame[0, 0]), seq), (4, 4))
+        self.assertEqual(self.stream.stats()["frames_dropped"], 2)
+
+    def test_latest_does_not_wait(self):
+        self.assertEqual(self.stream.latest(), (None, 0, 0.0))
+        self.capture.push(7)
+        self.assertTrue(wait_for(lambda: self.stream.latest()[1] == 1))
+        self.assertEqual(int(self.stream.latest()[0][0, 0]), 7)
+
+    def test_stream_gives_up_after_repeated_failures(self):
+        stream = CameraStream(QueueCapture(), max_failures=3).start()
+        self.assertTrue(wait_for(lambda: not stream.is_running()))
+        self.assertEqual(stream.read(timeout=0.05), (None, 0, 0.0))
+        self.assertEqual(stream.read_failures, 3)
+
+    def test_stop_releases_the_device(self):
+        self.stream.stop()
+        self.assertTrue(self.capture.released)
+        self.assertFalse(self.stream.is_running())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -152,6 +152,74 @@ class BasicCommandTests(unittest.TestCase):
             print("  Verifying 'open_application' was called with 'open notepad'")
             mock_open.assert_called_once_with("open notepad")
 
+    def test_06_process_command_reminder_and_rain_routing(self):
+        """Test that reminders aren't mistaken for forecast questions"""
+        print("\nTEST: Processing reminder and forecast commands")
+        with patch.object(self.commands, 'set_reminder') as mock_reminder, \
+                patch.object(self.commands, 'get_weather_outlook') as mock_outlook:
+            print("  Sending command: 'remind me about my train on monday'")
+            self.commands.process_command("remind me about my train on monday")
+            print("  Verifying 'set_reminder' was called and 'get_weather_outlook' was not")
+            mock_reminder.assert_called_once_with()
+            mock_outlook.assert_not_called()
+
+        with patch.object(self.commands, 'get_weather_outlook') as mock_outlook, \
+                patch.object(self.commands, 'open_application') as mock_open:
+            print("  Sending command: 'is the train running on monday'")
+            self.commands.process_command("is the train running on monday")
+            mock_outlook.assert_not_called()
+
+            print("  Sending command: 'will it rain tomorrow'")
+            self.commands.process_command("will it rain tomorrow")
+            print("  Verifying 'get_weather_outlook' was called with 'will it rain tomorrow'")
+            mock_outlook.assert_called_once_with("will it rain tomorrow")
+
+    def test_07_process_command_weather_time_words(self):
+        """Test that time and relative words after 'weather for' aren't taken as places"""
+        print("\nTEST: Processing weather commands with time words")
+        for command in ["what's the weather for today", "forecast for now", "weather at home",
+                        "weather for tonight", "weather here right now"]:
+            with patch.object(self.commands, 'get_current_weather') as mock_current, \
+                    patch.object(self.commands, 'get_multi_location_weather') as mock_multi:
+                print(f"  Sending command: '{command}'")
+                self.commands.process_command(command)
+                print("  Verifying 'get_current_weather' was called")
+                mock_current.assert_called_once_with()
+                mock_multi.assert_not_called()
+
+        print("  Verifying places are still found next to time words")
+        self.assertEqual(self.commands.parse_weather_locations("weather for today in paris"), ["paris"])
+        self.assertEqual(self.commands.parse_weather_locations("weather in london and paris now"), ["london", "paris"])
+
+        print("  Verifying an unknown place falls back to the current weather")
+        self.commands.weather_service.get_weather_bundles.return_value = {
+            "success": False, "error": "Location atlantis not found", "summary": ""}
+        with patch.object(self.commands, 'get_current_weather') as mock_current:
+            self.commands.process_command("weather in atlantis")
+            self.commands.weather_service.get_weather_bundles.assert_called_once_with(["atlantis"])
+            mock_current.assert_called_once_with()
+
+    def test_08_process_command_day_forecast_for_a_city(self):
+        """Test that a named city is used for questions about another day"""
+        print("\nTEST: Processing 'weather in paris tomorrow'")
+        self.commands.weather_service.get_day_forecast.return_value = {
+            "success": True, "location": "Paris", "condition": "Rain", "min_temp": 8, "max_temp": 14,
+            "rain_expected": True, "total_precipitation": 4.2}
+        with patch.object(self.commands, 'get_multi_location_weather') as mock_multi:
+            self.commands.process_command("weather in paris tomorrow")
+            mock_multi.assert_not_called()
+        print("  Verifying 'get_day_forecast' was asked about paris")
+        self.commands.weather_service.get_day_forecast.assert_called_once_with(1, 1, location="paris")
+        self.mock_speak.assert_any_call("Forecast for Paris tomorrow: mostly rain, "
+                                       "with temperatures from 8 to 14 degrees Celsius.")
+
+        print("  Verifying a day without a city still uses the default location")
+        self.commands.weather_service.get_day_forecast.reset_mock()
+        self.commands.process_command("will it rain in berlin on monday")
+        self.commands.process_command("what's the forecast for the weekend")
+        calls = self.commands.weather_service.get_day_forecast.call_args_list
+        self.assertEqual([call.kwargs["location"] for call in calls], ["berlin", None])
+
 
 def run_basic_tests():
     """Run a simplified set of tests with clear output"""
@@ -163,7 +231,7 @@ def run_basic_tests():
     suite = unittest.TestSuite()
     
     # Add tests in order (only the basic ones)
-    for i in range(1, 6):  # Tests 1-5
+    for i in range(1, 9):  # Tests 1-8
         test_name = f"test_{i:02d}_process_command"
         matching_tests = [t for t in dir(BasicCommandTests) if t.startswith(test_name)]
         for test in matching_tests:
@@ -0,0 +1,94 @@
+# test_face_detector.py - Tests for downscaled and region-of-interest face detection
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import cv2
+import numpy as np
+
+from assistant.face_detection import FaceDetector
+
+
+class BlobCascade:
+    """CascadeClassifier stand-in that "detects" bright rectangles in whatever image it is given"""
+
+    def __init__(self):
+        self.calls = []  # (image shape, minSize, maxSize) per detectMultiScale call
+
+    def detectMultiScale(self, image, scaleFactor=1.1, minNeighbors=3, minSize=(0, 0), maxSize=None):
+        self.calls.append((image.shape, minSize, maxSize))
+        count, _, stats, _ = cv2.connectedComponentsWithStats((image > 127).astype(np.uint8))
+        boxes = []
+        for x, y, w, h, _ in stats[1:count]:
+            if w >= minSize[0] and h >= minSize[1] and (maxSize is None or (w <= maxSize[0] and h <= maxSize[1])):
+                boxes.append((x, y, w, h))
+        return np.array(boxes, dtype=np.int32).reshape(-1, 4)
+
+
+def frame_with_faces(*boxes, size=(1280, 720)):
+    frame = np.zeros((size[1], size[0]), dtype=np.uint8)
+    for x, y, w, h in boxes:
+        frame[y:y+h, x:x+w] = 255
+    return frame
+
+
+class FaceDetectorTests(unittest.TestCase):
+    """Boxes found on scaled-down frames and regions map back to full resolution"""
+
+    def setUp(self):
+        self.cascade = BlobCascade()
+        self.detector = FaceDetector(self.cascade, detect_width=480, full_detect_interval=3, roi_face_size=64)
+
+    def assertBoxNear(self, found, expected, tolerance=3):
+        self.assertTrue(all(abs(int(a) - b) <= tolerance for a, b in zip(found, expected)),
+                        f"{list(found)} is not within {tolerance}px of {expected}")
+
+    def test_full_detection_runs_downscaled(self):
+        faces = self.detector.detect(frame_with_faces((640, 200, 160, 160)))
+        self.assertEqual(len(faces), 1)
+        self.assertBoxNear(faces[0], (640, 200, 160, 160))
+
+        shape, min_size, _ = self.cascade.calls[0]
+        self.assertEqual(shape, (270, 480))
+        self.assertEqual(min_size, (11, 11))  # 30 pixels at 480/1280 scale
+        self.assertEqual(self.detector.full_detections, 1)
+
+    def test_roi_follows_a_moving_face(self):
+        """Between full searches only a scaled region around the known face is searched"""
+        self.detector.detect(frame_with_faces((640, 200, 160, 160)))
+        faces = self.detector.detect(frame_with_faces((670, 215, 160, 160)))
+
+        self.assertEqual(self.detector.roi_detections, 1)
+        self.assertEqual(len(faces), 1)
+        self.assertBoxNear(faces[0], (670, 215, 160, 160))
+
+        # 320 pixel padded region scaled so the 160 pixel face is 64 pixels wide
+        shape, min_size, max_size = self.cascade.calls[1]
+        self.assertEqual(shape, (128, 128))
+        self.assertLessEqual(min_size[0], 64 * 0.7 + 1)
+        self.assertGreaterEqual(max_size[0], 64 * 1.4 - 1)
+
+    def test_new_faces_are_found_on_the_next_full_search(self):
+        self.detector.detect(frame_with_faces((640, 200, 160, 160)))
+        both = frame_with_faces((640, 200, 160, 160), (100, 300, 120, 120))
+
+        for _ in range(2):
+            self.assertEqual(len(self.detector.detect(both)), 1)  # Region search only
+        faces = self.detector.detect(both)  # Third frame since the full search
+        self.assertEqual(self.detector.full_detections, 2)
+        self.assertEqual(len(faces), 2)
+        self.assertBoxNear(sorted(faces.tolist())[0], (100, 300, 120, 120))
+
+    def test_lost_face_triggers_full_search(self):
+        self.detector.detect(frame_with_faces((640, 200, 160, 160)))
+        self.assertEqual(len(self.detector.detect(frame_with_faces())), 0)
+        self.detector.detect(frame_with_faces((100, 300, 120, 120)))
+        self.assertEqual(self.detector.full_detections, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# test_face_samples.py - Tests for the on-disk face sample store
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from assistant.face_samples import FaceSampleStore, SAMPLE_SIZE, get_face_sample_store
+
+
+def faces(value, count, size=(80, 90)):
+    return [np.full((size[1], size[0]), value, dtype=np.uint8) for _ in range(count)]
+
+
+class FaceSampleStoreTests(unittest.TestCase):
+    """Adding, removing and reloading stored samples"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_samples_are_normalized_and_indexed_by_user(self):
+        store = FaceSampleStore(self.directory)
+        store.add(1, faces(10, 3))
+        store.add(2, faces(20, 2, size=(200, 180)))
+
+        self.assertEqual(store.counts(), {1: 3, 2: 2})
+        self.assertEqual(store.samples_for(2).shape, (2, SAMPLE_SIZE[1], SAMPLE_SIZE[0]))
+        samples, labels = store.training_data()
+        self.assertEqual(len(samples), 5)
+        self.assertEqual(labels.tolist(), [1, 1, 1, 2, 2])
+
+    def test_remove_user_and_reload(self):
+        store = FaceSampleStore(self.directory, initial_capacity=4)
+        store.add(1, faces(10, 3))
+        store.add(2, faces(20, 3))  # Grows past the initial capacity
+        store.add(3, faces(30, 1))
+        self.assertEqual(store.remove_user(2), 3)
+
+        reloaded = FaceSampleStore(self.directory, initial_capacity=4)
+        self.assertEqual(reloaded.counts(), {1: 3, 3: 1})
+        self.assertEqual(reloaded.training_data()[1].tolist(), [1, 1, 1, 3])
+        self.assertEqual(len([name for name in os.listdir(self.directory) if name.endswith(".npy")]), 1)
+
+    def test_recognizers_share_one_store_per_directory(self):
+        first = get_face_sample_store(self.directory)
+        second = get_face_sample_store(os.path.join(self.directory, "."))
+        self.assertIs(first, second)
+
+        first.add(1, faces(10, 2))
+        second.add(2, faces(20, 2))
+        self.assertEqual(FaceSampleStore(self.directory).counts(), {1: 2, 2: 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
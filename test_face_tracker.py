@@ -0,0 +1,57 @@
+# test_face_tracker.py - Tests for face tracking and identity voting
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.face_tracker import FaceTracker
+
+
+class FaceTrackerTests(unittest.TestCase):
+    """Track matching between frames and identity votes"""
+
+    def test_track_ids_persist_while_faces_move(self):
+        tracker = FaceTracker()
+        first = tracker.update([(100, 100, 80, 80), (400, 100, 80, 80)])
+        ids = {track.box[0]: track.track_id for track in first}
+
+        moved = tracker.update([(410, 104, 80, 80), (108, 96, 80, 80)])
+        self.assertEqual({track.box[0]: track.track_id for track in moved},
+                         {108: ids[100], 410: ids[400]})
+        self.assertEqual(tracker.tracks_created, 2)
+
+    def test_lost_track_is_replaced_by_new_id(self):
+        tracker = FaceTracker(max_misses=2)
+        track_id = tracker.update([(100, 100, 80, 80)])[0].track_id
+        for _ in range(3):
+            tracker.update([])
+        self.assertEqual([track.track_id for track in tracker.lost_tracks], [track_id])
+
+        new_track = tracker.update([(100, 100, 80, 80)])[0]
+        self.assertNotEqual(new_track.track_id, track_id)
+
+    def test_votes_settle_identity_and_stop_predictions(self):
+        tracker = FaceTracker(votes_needed=3)
+        track = tracker.update([(100, 100, 80, 80)])[0]
+
+        self.assertFalse(tracker.add_prediction(track, 4, 60))
+        self.assertFalse(tracker.add_prediction(track, 2, 150))  # Too far to count as user 2
+        self.assertTrue(tracker.add_prediction(track, 4, 70))
+        self.assertEqual(track.identity, 4)
+        self.assertEqual(track.confidence, 65)
+        self.assertFalse(track.needs_prediction())
+
+    def test_unknown_majority(self):
+        tracker = FaceTracker(votes_needed=3)
+        track = tracker.update([(100, 100, 80, 80)])[0]
+        tracker.add_prediction(track, 1, 120)
+        tracker.add_prediction(track, 1, 130)
+        self.assertTrue(track.decided)
+        self.assertIsNone(track.identity)
+
+
+if __name__ == '__main__':
+    unittest.main()
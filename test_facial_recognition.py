@@ -0,0 +1,41 @@
+# test_facial_recognition.py - Tests for starting recognition with and without a display
+
+import unittest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.facial_recognition import FacialRecognizer
+
+
+class StartRecognitionTests(unittest.TestCase):
+    """With nobody registered, only an interactive session asks to register a user"""
+
+    def make_recognizer(self, headless):
+        with patch.object(FacialRecognizer, '__init__', return_value=None):
+            recognizer = FacialRecognizer()
+        recognizer.headless = headless
+        recognizer.is_running = False
+        recognizer.labels = {}
+        recognizer.add_new_user = MagicMock()
+        return recognizer
+
+    def test_headless_without_users_returns_without_prompting(self):
+        recognizer = self.make_recognizer(headless=True)
+        with patch('builtins.input', side_effect=AssertionError("input() would block")):
+            self.assertFalse(recognizer.start_recognition())
+        recognizer.add_new_user.assert_not_called()
+        self.assertFalse(recognizer.is_running)
+
+    def test_interactive_without_users_offers_registration(self):
+        recognizer = self.make_recognizer(headless=False)
+        with patch('assistant.facial_recognition.speak'):
+            self.assertFalse(recognizer.start_recognition())
+        recognizer.add_new_user.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# test_forecast.py - Tests for the columnar 5-day forecast table
+
+import unittest
+import sys
+import os
+import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.forecast import ForecastTable, SLOT_SECONDS, DAY_SECONDS
+
+TZ_OFFSET = 3600  # Forecast location one hour east of UTC
+FIRST_DAY = (datetime.date(2026, 10, 19) - datetime.date(1970, 1, 1)).days  # A Monday
+LOCAL_MIDNIGHT = FIRST_DAY * DAY_SECONDS - TZ_OFFSET  # Unix time the first local day starts
+
+
+def canned_payload():
+    """Two local days of 3-hour slots: a clear Monday with one wet slot, then a cloudy Tuesday"""
+    items = []
+    for index in range(16):
+        item = {
+            "dt": LOCAL_MIDNIGHT + index * SLOT_SECONDS,
+            "main": {"temp": 10 + index, "temp_min": 9 + index, "temp_max": 11 + index, "humidity": 70},
+            "weather": [{"id": 800 if index < 8 else 803, "description": "clear sky" if index < 8 else "clouds"}],
+            "wind": {"speed": 3.0},
+            "pop": 0.1,
+        }
+        if index == 5:
+            item["weather"] = [{"id": 500, "description": "light rain"}]
+            item["rain"] = {"3h": 1.5}
+            item["pop"] = 0.8
+        items.append(item)
+    # The API sorts by time, but the table must not rely on it
+    items.reverse()
+    return {"list": items, "city": {"name": "Testville", "timezone": TZ_OFFSET}}
+
+
+class ForecastTableTests(unittest.TestCase):
+    """Time windows, local days and per-day summaries on a canned payload"""
+
+    def setUp(self):
+        self.table = ForecastTable.from_payload(canned_payload())
+
+    def test_parse(self):
+        self.assertEqual(len(self.table), 16)
+        self.assertEqual(self.table.location, "Testville")
+        self.assertEqual(int(self.table.times[0]), LOCAL_MIDNIGHT)
+        self.assertEqual(self.table.local_day(LOCAL_MIDNIGHT), FIRST_DAY)
+        self.assertEqual(self.table.local_day(LOCAL_MIDNIGHT - 1), FIRST_DAY - 1)
+
+    def test_window(self):
+        """A window covers every slot overlapping it and reports the first rain"""
+        start = LOCAL_MIDNIGHT + 4 * SLOT_SECONDS
+        summary = self.table.window(start, start + 2 * SLOT_SECONDS)
+        self.assertEqual(summary["slots"], 2)
+        self.assertEqual((summary["min_temp"], summary["max_temp"]), (13, 16))
+        self.assertTrue(summary["rain_expected"])
+        self.assertEqual(summary["first_rain"], LOCAL_MIDNIGHT + 5 * SLOT_SECONDS)
+
+        # Starting mid-slot still includes the slot in progress
+        summary = self.table.window(start + 60, start + 120)
+        self.assertEqual((summary["start"], summary["slots"]), (start, 1))
+
+        self.assertIsNone(self.table.window(LOCAL_MIDNIGHT + 10 * DAY_SECONDS, LOCAL_MIDNIGHT + 11 * DAY_SECONDS))
+
+    def test_days(self):
+        """Local days are aggregated separately and in ranges"""
+        monday = self.table.days(FIRST_DAY)
+        self.assertEqual(monday["slots"], 8)
+        self.assertEqual(monday["condition"], "Clear")
+        self.assertEqual(monday["total_precipitation"], 1.5)
+        self.assertEqual(monday["max_pop"], 0.8)
+
+        tuesday = self.table.days(FIRST_DAY + 1)
+        self.assertEqual(tuesday["condition"], "Clouds")
+        self.assertFalse(tuesday["rain_expected"])
+        self.assertEqual((tuesday["min_temp"], tuesday["max_temp"]), (17, 26))
+
+        both = self.table.days(FIRST_DAY, 2)
+        self.assertEqual((both["slots"], both["min_temp"], both["max_temp"]), (16, 9, 26))
+        self.assertIsNone(self.table.days(FIRST_DAY + 5))
+
+    def test_daily(self):
+        daily = self.table.daily()
+        self.assertEqual([day["date"] for day in daily], ["2026-10-19", "2026-10-20"])
+        self.assertEqual([day["weekday"] for day in daily], ["Monday", "Tuesday"])
+        self.assertEqual([day["rain_expected"] for day in daily], [True, False])
+        self.assertEqual(daily[1]["min_temp"], self.table.days(FIRST_DAY + 1)["min_temp"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# test_geocoding.py - Tests for the geocoding cache
+
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.geocoding import LocationResolver, LocationNotFoundError, normalize_location
+
+
+class FakeResponse:
+    def __init__(self, results, status_code=200):
+        self.results = results
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self):
+        return self.results
+
+
+class FakeSession:
+    """requests.Session stand-in that answers geocoding queries from a dict"""
+
+    def __init__(self, places):
+        self.places = places
+        self.queries = []
+
+    def get(self, url, params=None, timeout=None):
+        self.queries.append(params["q"])
+        match = self.places.get(params["q"].lower())
+        return FakeResponse([match] if match else [])
+
+
+class LocationResolverTests(unittest.TestCase):
+    """Cache hits, persistence and deduplication of concurrent lookups"""
+
+    def setUp(self):
+        self.cache_file = os.path.join(tempfile.mkdtemp(), "geocode_cache.json")
+        self.resolver = LocationResolver(self.cache_file)
+        self.session = FakeSession({
+            "paris": {"lat": 48.858893, "lon": 2.320041, "name": "Paris", "country": "FR"},
+        })
+
+    def test_resolved_names_are_cached_and_persisted(self):
+        place = self.resolver.resolve("Paris", "key", self.session, 5)
+        self.assertEqual((place["lat"], place["lon"], place["name"]), (48.8589, 2.32, "Paris"))
+
+        # Spelling variants of the same name hit the cache
+        self.assertIs(self.resolver.resolve("  PARIS ", "key", self.session, 5), place)
+        self.assertEqual(normalize_location(" Paris ,  FR "), "paris, fr")
+        self.assertEqual(self.session.queries, ["Paris"])
+
+        self.assertEqual(LocationResolver(self.cache_file).lookup("paris"), place)
+        self.assertIsNone(self.resolver.lookup("Lyon"))
+
+    def test_unknown_name(self):
+        with self.assertRaises(LocationNotFoundError):
+            self.resolver.resolve("Atlantis", "key", self.session, 5)
+        self.assertIsNone(self.resolver.lookup("Atlantis"))
+
+    def test_concurrent_lookups_of_a_new_name_geocode_once(self):
+        """Threads asking for the same new name share one geocoding call"""
+        calls = []
+        place = {"lat": 51.5073, "lon": -0.1277, "name": "London", "country": "GB", "state": ""}
+
+        def fake_geocode(name, api_key, session, timeout, rate_limiter=None):
+            calls.append(name)
+            time.sleep(0.1)  # Long enough for the other threads to pile up behind it
+            with self.resolver._lock:
+                self.resolver._places[normalize_location(name)] = place
+            return place
+
+        results = []
+        with patch.object(self.resolver, "_geocode", side_effect=fake_geocode):
+            threads = [
+                threading.Thread(target=lambda n=name: results.append(self.resolver.resolve(n, "key", None, 5)))
+                for name in ["London", "london", " LONDON", "London"]
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [place] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
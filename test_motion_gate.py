@@ -0,0 +1,64 @@
+# test_motion_gate.py - Tests for the thumbnail motion gate in front of face detection
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from assistant.motion_gate import MotionGate
+
+
+def scene(brightness=100, block=None, channels=None):
+    """A flat 640x480 frame, optionally with a white (x, y, w, h) block"""
+    shape = (480, 640, channels) if channels else (480, 640)
+    frame = np.full(shape, brightness, dtype=np.uint8)
+    if block is not None:
+        x, y, w, h = block
+        frame[y:y+h, x:x+w] = 255
+    return frame
+
+
+class MotionGateTests(unittest.TestCase):
+    """Which frames pass on to detection, driven by an explicit clock"""
+
+    def setUp(self):
+        self.gate = MotionGate(refresh_interval=2.0)
+
+    def test_static_scene_only_passes_on_refresh(self):
+        self.assertTrue(self.gate.check(scene(), now=0.0))  # No background yet
+        passed = [self.gate.check(scene(), now=0.1 * i) for i in range(1, 20)]
+        self.assertFalse(any(passed))
+        self.assertTrue(self.gate.check(scene(), now=2.0))
+
+        stats = self.gate.stats()
+        self.assertEqual((stats["frames"], stats["detections"], stats["skipped"]), (21, 2, 19))
+
+    def test_motion_threshold(self):
+        """A change over enough of the picture passes; a speck or a slight lighting shift doesn't"""
+        self.gate.check(scene(), now=0.0)
+        self.assertFalse(self.gate.check(scene(block=(300, 200, 20, 20)), now=0.1))
+        self.assertFalse(self.gate.check(scene(brightness=108), now=0.2))
+        self.assertTrue(self.gate.check(scene(block=(200, 120, 200, 200)), now=0.3))
+        self.assertGreater(self.gate.motion, self.gate.motion_threshold)
+
+    def test_background_absorbs_a_lasting_change(self):
+        self.gate = MotionGate(learning_rate=0.5, refresh_interval=60)
+        self.gate.check(scene(), now=0.0)
+        moved = scene(block=(200, 120, 200, 200))
+        results = [self.gate.check(moved, now=0.1 * i) for i in range(1, 10)]
+        self.assertTrue(results[0])
+        self.assertFalse(results[-1])
+
+    def test_color_frames_and_reset(self):
+        self.gate.check(scene(channels=3), now=0.0)
+        self.assertFalse(self.gate.check(scene(channels=3), now=0.1))
+        self.gate.reset()
+        self.assertTrue(self.gate.check(scene(channels=3), now=0.2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# test_process_index.py - Tests for the incrementally refreshed process index
+
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.process_index import ProcessIndex
+
+
+class FakeProcess:
+    """Just enough of psutil.Process for the index"""
+
+    def __init__(self, pid, name, create_time):
+        self.pid = pid
+        self.info = {"create_time": create_time}
+        self._name = name
+        self.name_calls = 0
+
+    def name(self):
+        self.name_calls += 1
+        return self._name
+
+
+class ProcessIndexTests(unittest.TestCase):
+    """Refresh diffs, PID reuse and name lookups with a stubbed process_iter"""
+
+    def setUp(self):
+        self.processes = [
+            FakeProcess(100, "notepad.exe", 1.0),
+            FakeProcess(200, "Code.exe", 2.0),
+            FakeProcess(201, "Code.exe", 2.5),
+        ]
+        patcher = patch("assistant.process_index.psutil.process_iter",
+                        side_effect=lambda attrs=None: list(self.processes))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index = ProcessIndex(ttl=60)
+
+    def test_find_pids_and_is_running(self):
+        """Names are matched without case or the .exe suffix"""
+        self.assertEqual(self.index.find_pids("CODE.EXE"), [200, 201])
+        self.assertEqual(self.index.find_pids("code"), [200, 201])
+        self.assertEqual(self.index.is_running("note"), 100)
+        self.assertIsNone(self.index.is_running("spotify"))
+
+    def test_refresh_only_resolves_new_processes(self):
+        """Exited processes are dropped and only new ones have their name read"""
+        self.index.refresh()
+        notepad = self.processes[0]
+        self.processes = [notepad, FakeProcess(300, "Spotify.exe", 3.0)]
+        self.index.refresh()
+
+        self.assertEqual(notepad.name_calls, 1)
+        self.assertEqual(self.index.find_pids("code"), [])
+        self.assertEqual(self.index.find_pids("spotify"), [300])
+        self.assertEqual(self.index.names(), ["notepad", "spotify"])
+
+    def test_reused_pid_gets_new_name(self):
+        """A PID handed to a new process is re-indexed under the new name"""
+        self.index.refresh()
+        self.processes[0] = FakeProcess(100, "calc.exe", 9.0)
+        self.index.refresh()
+
+        self.assertEqual(self.index.find_pids("notepad"), [])
+        self.assertEqual(self.index.find_pids("calc"), [100])
+        self.assertIs(self.index.get_process(100), self.processes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
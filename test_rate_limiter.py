@@ -0,0 +1,91 @@
+# test_rate_limiter.py - Tests for the weather API rate limiter and daily quota
+
+import unittest
+import sys
+import os
+import email.utils
+import time
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.rate_limiter import ApiRateLimiter, RateLimitExceeded, parse_retry_after
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimiterTests(unittest.TestCase):
+    """Burst smoothing, daily quota and provider backoff"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = ApiRateLimiter(per_minute=3, per_day=5, state_file=None, clock=self.clock)
+
+    def test_burst_limited_to_bucket_size(self):
+        """A burst may use the whole bucket, then calls are refused until tokens refill"""
+        for _ in range(3):
+            self.limiter.acquire(max_wait=0)
+        with self.assertRaises(RateLimitExceeded) as ctx:
+            self.limiter.acquire(max_wait=0)
+        self.assertAlmostEqual(ctx.exception.retry_after, 20.0)
+
+        self.clock.now += 20
+        self.limiter.acquire(max_wait=0)
+
+    def test_daily_quota(self):
+        """Calls stop once the daily quota is used up, regardless of the bucket"""
+        for _ in range(5):
+            self.clock.now += 60
+            self.limiter.acquire(max_wait=0)
+        self.clock.now += 60
+        with self.assertRaises(RateLimitExceeded):
+            self.limiter.acquire(max_wait=0)
+
+        usage = self.limiter.usage()
+        self.assertEqual(usage["used_today"], 5)
+        self.assertEqual(usage["remaining_today"], 0)
+        self.assertEqual(usage["throttled"], 1)
+
+    def test_usage_after_the_day_rolls_over(self):
+        """The first usage() after UTC midnight reports the new day, not yesterday's count"""
+        for _ in range(3):
+            self.clock.now += 60
+            self.limiter.acquire(max_wait=0)
+        yesterday = self.limiter.usage()
+        self.assertEqual((yesterday["used_today"], yesterday["remaining_today"]), (3, 2))
+
+        with patch.object(self.limiter.quota, "_today", return_value="2099-01-02"):
+            usage = self.limiter.usage()
+        self.assertEqual(usage["date"], "2099-01-02")
+        self.assertEqual((usage["used_today"], usage["remaining_today"]), (0, 5))
+
+    def test_backoff_after_429(self):
+        """A 429 pauses all calls for the Retry-After period"""
+        self.limiter.backoff(30)
+        with self.assertRaises(RateLimitExceeded):
+            self.limiter.acquire(max_wait=0)
+        self.clock.now += 31
+        self.limiter.acquire(max_wait=0)
+        self.assertEqual(self.limiter.usage()["server_throttled"], 1)
+
+    def test_parse_retry_after(self):
+        """Retry-After may be seconds or an HTTP date; anything else uses the default"""
+        self.assertEqual(parse_retry_after("120"), 120)
+        in_90s = email.utils.formatdate(time.time() + 90, usegmt=True)
+        self.assertTrue(85 <= parse_retry_after(in_90s) <= 90)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+        for value in (None, "", "soon", "-5", "1.5"):
+            self.assertEqual(parse_retry_after(value), 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# test_recognition_events.py - Tests for recognition event publishing
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.recognition_events import RecognitionEvents, FACE_APPEARED, USER_RECOGNIZED, USER_LEFT
+
+
+class RecognitionEventsTests(unittest.TestCase):
+    """Event delivery to callbacks, queues and frame subscribers"""
+
+    def test_callbacks_filter_by_type(self):
+        events = RecognitionEvents()
+        everything, recognized = [], []
+        events.subscribe(everything.append)
+        events.subscribe(recognized.append, [USER_RECOGNIZED])
+
+        events.publish(FACE_APPEARED, track_id=1)
+        events.publish(USER_RECOGNIZED, track_id=1, user_id=3, user_name="Ana")
+
+        self.assertEqual([e["type"] for e in everything], [FACE_APPEARED, USER_RECOGNIZED])
+        self.assertEqual([e["user_name"] for e in recognized], ["Ana"])
+        self.assertIn("time", recognized[0])
+
+    def test_failing_callback_does_not_stop_delivery(self):
+        events = RecognitionEvents()
+        received = []
+
+        def broken(event):
+            raise RuntimeError("subscriber bug")
+
+        events.subscribe(broken)
+        events.subscribe(received.append)
+        events.publish(USER_LEFT, track_id=2)
+        self.assertEqual(len(received), 1)
+
+    def test_full_queue_drops_oldest(self):
+        events = RecognitionEvents()
+        queue = events.subscribe_queue(maxsize=2)
+        for track_id in (1, 2, 3):
+            events.publish(FACE_APPEARED, track_id=track_id)
+        self.assertEqual([queue.get_nowait()["track_id"] for _ in range(2)], [2, 3])
+
+    def test_frame_subscribers(self):
+        events = RecognitionEvents()
+        self.assertFalse(events.has_frame_subscribers())
+        frames = []
+        callback = events.subscribe_frames(lambda frame, overlay: frames.append(overlay["title"]))
+        events.publish_frame(None, {"title": "Face Recognition"})
+        events.unsubscribe_frames(callback)
+        events.publish_frame(None, {"title": "Face Recognition"})
+        self.assertEqual(frames, ["Face Recognition"])
+
+
+if __name__ == '__main__':
+    unittest.main()
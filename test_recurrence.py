@@ -0,0 +1,77 @@
+# test_recurrence.py - Tests for alarm recurrence rules
+
+import unittest
+import sys
+import os
+import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.recurrence import RecurrenceRule, parse_recurrence
+
+# A Monday
+NOW = datetime.datetime(2026, 10, 19, 9, 0)
+
+
+def at(month, day, hour, minute=0, year=2026):
+    return datetime.datetime(year, month, day, hour, minute)
+
+
+class RecurrenceRuleTests(unittest.TestCase):
+    """Next-occurrence computation for every kind of rule"""
+
+    def test_daily(self):
+        rule = parse_recurrence("everyday", 7, 30, now=NOW)
+        self.assertEqual(rule.next_after(NOW), at(10, 20, 7, 30))
+        self.assertEqual(rule.next_after(at(10, 20, 7, 29)), at(10, 20, 7, 30))
+        self.assertEqual(rule.next_after(at(10, 20, 7, 30)), at(10, 21, 7, 30))
+
+    def test_weekly(self):
+        rule = parse_recurrence("monday, friday", 8, 0, now=NOW)
+        self.assertEqual(rule.next_after(NOW), at(10, 23, 8))
+        self.assertEqual(rule.next_after(at(10, 23, 8)), at(10, 26, 8))
+        self.assertEqual(parse_recurrence("weekends", 8, 0).next_after(NOW), at(10, 24, 8))
+
+    def test_monthly_skips_short_months(self):
+        rule = parse_recurrence("every month on the 31st", 9, 0, now=NOW)
+        self.assertEqual(rule.next_after(NOW), at(10, 31, 9))
+        self.assertEqual(rule.next_after(at(10, 31, 9)), at(12, 31, 9))
+        last = parse_recurrence("last day of every month", 9, 0, now=NOW)
+        self.assertEqual(last.next_after(at(1, 31, 9, year=2027)), at(2, 28, 9, year=2027))
+
+    def test_dates_and_once(self):
+        rule = parse_recurrence("december 25th and 2027-01-01", 10, 0, now=NOW)
+        self.assertEqual(rule.next_after(NOW), at(12, 25, 10))
+        self.assertEqual(rule.next_after(at(12, 25, 10)), at(1, 1, 10, year=2027))
+        self.assertIsNone(rule.next_after(at(1, 1, 10, year=2027)))
+
+        once = parse_recurrence("once", 8, 0, now=NOW)
+        self.assertEqual(once.next_after(NOW), at(10, 20, 8))
+        self.assertIsNone(once.next_after(at(10, 20, 8)))
+
+    def test_interval(self):
+        rule = parse_recurrence("every 2 hours", 8, 0, now=NOW)
+        self.assertEqual(rule.next_after(NOW), at(10, 19, 10))
+        self.assertEqual(rule.next_after(at(10, 19, 10)), at(10, 19, 12))
+        self.assertEqual(rule.next_after(at(10, 19, 7)), at(10, 19, 8))
+
+    def test_skip_dates(self):
+        rule = parse_recurrence("every 2 hours except october 20th", 8, 0, now=NOW)
+        self.assertEqual(rule.next_after(at(10, 19, 23)), at(10, 21, 0))
+        daily = parse_recurrence("weekdays except october 20 and october 21", 7, 0, now=NOW)
+        self.assertEqual(daily.next_after(NOW), at(10, 22, 7))
+
+    def test_round_trip(self):
+        for phrase in ("weekdays except december 25th", "every 90 minutes", "once", "every month on the 15th"):
+            rule = parse_recurrence(phrase, 6, 45, now=NOW)
+            copy = RecurrenceRule.from_dict(rule.to_dict())
+            self.assertEqual(copy.next_after(NOW), rule.next_after(NOW))
+
+    def test_unknown_phrase(self):
+        with self.assertRaises(ValueError):
+            parse_recurrence("whenever", 7, 0, now=NOW)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# test_state_store.py - Tests for atomic JSON writes and the journaled state store
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+import shutil
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.state_store import atomic_write_json, load_json, JournaledStore
+
+
+class StateStoreTests(unittest.TestCase):
+    """Crash safety and compaction of state files"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "alarms.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_atomic_write_leaves_no_temp_files(self):
+        atomic_write_json(self.path, {"a": 1})
+        atomic_write_json(self.path, {"a": 2})
+        self.assertEqual(load_json(self.path), {"a": 2})
+        self.assertEqual(os.listdir(self.directory), ["alarms.json"])
+
+    def test_journal_round_trip(self):
+        store = JournaledStore(self.path)
+        store.load()
+        store.set("07:30", {"hour": 7})
+        store.set("08:00", {"hour": 8})
+        store.delete("07:30")
+        store.close()
+
+        self.assertEqual(JournaledStore(self.path).load(), {"08:00": {"hour": 8}})
+
+    def test_torn_journal_line_is_ignored(self):
+        store = JournaledStore(self.path)
+        store.load()
+        store.set("a", 1)
+        store.close()
+        with open(store.journal_path, 'a') as f:
+            f.write('{"op": "set", "key": "b", "val')
+
+        self.assertEqual(JournaledStore(self.path).load(), {"a": 1})
+
+    def test_compaction(self):
+        store = JournaledStore(self.path, compact_every=5)
+        store.load()
+        for i in range(12):
+            store.set(str(i), i)
+        store.close()
+
+        with open(store.journal_path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        with open(self.path) as f:
+            self.assertEqual(len(json.load(f)), 10)
+        self.assertEqual(len(JournaledStore(self.path).load()), 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+# test_weather_prefetch.py - Tests for fetching the weather shortly before an alarm
+
+import unittest
+import sys
+import os
+import datetime
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.weather_prefetch import WeatherPrefetcher
+
+ALARM = datetime.datetime(2026, 10, 19, 7, 0)
+
+
+class FakeWeatherService:
+    """Counts bundle downloads; fails while self.error is set"""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    def get_weather_bundle(self, refresh=False):
+        self.calls += 1
+        if self.error:
+            return {"success": False, "error": self.error}
+        return {"success": True, "temperature": 10 + self.calls}
+
+
+class FakeClock:
+    def __init__(self, when):
+        self.now = when.timestamp()
+
+    def __call__(self):
+        return self.now
+
+    def set(self, when):
+        self.now = when.timestamp()
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not condition():
+        time.sleep(0.01)
+    return condition()
+
+
+class WeatherPrefetcherTests(unittest.TestCase):
+    """Prefetch timing, the pinned snapshot and its expiry, driven by a fake clock"""
+
+    def setUp(self):
+        self.service = FakeWeatherService()
+        self.clock = FakeClock(ALARM - datetime.timedelta(hours=1))
+        self.next_alarm = ALARM
+        self.prefetcher = WeatherPrefetcher(self.service, lambda: self.next_alarm, lead_time=5 * 60,
+                                            max_age=30 * 60, clock=self.clock)
+        self.addCleanup(self.prefetcher.stop)
+
+    def test_prefetches_once_within_the_lead_time(self):
+        self.prefetcher.start()
+        time.sleep(0.05)
+        self.assertEqual(self.service.calls, 0)
+        self.assertIsNone(self.prefetcher.get_snapshot())
+
+        # The worker re-reads the clock whenever it is woken, as after an alarm change
+        self.clock.set(ALARM - datetime.timedelta(minutes=4))
+        self.prefetcher.reschedule()
+        self.assertTrue(wait_for(lambda: self.prefetcher.get_snapshot() is not None))
+
+        self.prefetcher.reschedule()
+        time.sleep(0.05)
+        self.assertEqual(self.service.calls, 1)
+        self.assertEqual(self.prefetcher.get_snapshot()["temperature"], 11)
+
+    def test_failed_prefetch_keeps_the_last_good_snapshot(self):
+        self.assertTrue(self.prefetcher.prefetch(ALARM))
+        self.service.error = "Rate limit reached"
+        self.clock.set(ALARM - datetime.timedelta(minutes=40))
+        self.assertFalse(self.prefetcher.prefetch(ALARM))
+        self.assertEqual(self.prefetcher.get_snapshot()["temperature"], 11)
+
+    def test_snapshot_expires_after_max_age(self):
+        self.assertTrue(self.prefetcher.prefetch(ALARM))
+        self.clock.set(ALARM - datetime.timedelta(minutes=31))
+        self.assertIsNotNone(self.prefetcher.get_snapshot())
+        self.clock.set(ALARM - datetime.timedelta(minutes=29))
+        self.assertIsNone(self.prefetcher.get_snapshot())
+
+    def test_stop_then_start_runs_a_single_worker(self):
+        self.prefetcher.start()
+        first = self.prefetcher._thread
+        self.prefetcher.stop()
+        self.assertFalse(first.is_alive())
+
+        self.prefetcher.start()
+        self.assertIsNot(self.prefetcher._thread, first)
+        self.clock.set(ALARM - datetime.timedelta(minutes=2))
+        self.prefetcher.reschedule()
+        self.assertTrue(wait_for(lambda: self.service.calls == 1))
+        time.sleep(0.05)
+        self.assertEqual(self.service.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
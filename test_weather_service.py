@@ -0,0 +1,238 @@
+# test_weather_service.py - Tests for the weather response cache and weather service
+
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.forecast import SLOT_SECONDS
+from assistant.geocoding import LocationNotFoundError, normalize_location
+from assistant.rate_limiter import ApiRateLimiter
+from assistant.weather_service import WeatherCache, WeatherService, CACHE_TTL, CACHE_MAX_STALE
+
+
+class FakeClock:
+    """Wall clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1700000000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingFetch:
+    """fetch() callable that returns numbered responses"""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("offline")
+        return {"response": self.calls}
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not condition():
+        time.sleep(0.01)
+    return condition()
+
+
+class WeatherCacheTests(unittest.TestCase):
+    """Freshness, stale-while-revalidate and offline fallback"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        cache_file = os.path.join(tempfile.mkdtemp(), "weather_cache.json")
+        self.cache = WeatherCache(cache_file, clock=self.clock)
+
+    def test_fresh_entry_is_served_from_cache(self):
+        """Within the TTL the network isn't touched"""
+        fetch = CountingFetch()
+        self.assertEqual(self.cache.get("weather:1,2", "weather", fetch), ({"response": 1}, 0.0))
+
+        self.clock.now += CACHE_TTL["weather"] - 1
+        data, age = self.cache.get("weather:1,2", "weather", fetch)
+        self.assertEqual((data, age, fetch.calls), ({"response": 1}, CACHE_TTL["weather"] - 1, 1))
+
+        self.cache.get("weather:1,2", "weather", fetch, refresh=True)
+        self.assertEqual(fetch.calls, 2)
+
+    def test_stale_entry_is_served_while_one_refresh_runs(self):
+        """A stale entry comes back at once and a single background fetch replaces it"""
+        self.cache.get("forecast:1,2", "forecast", CountingFetch())
+        self.clock.now += CACHE_TTL["forecast"] + 1
+
+        release = threading.Event()
+        fetch = CountingFetch()
+
+        def slow_fetch():
+            release.wait(2)
+            return fetch()
+
+        for _ in range(3):
+            data, age = self.cache.get("forecast:1,2", "forecast", slow_fetch)
+            self.assertEqual(data, {"response": 1})
+        release.set()
+
+        self.assertTrue(wait_for(lambda: self.cache.get_entry("forecast:1,2")["fetched_at"] == self.clock.now))
+        self.assertEqual(fetch.calls, 1)
+
+    def test_too_stale_entry_fetches_first_and_falls_back_offline(self):
+        """Past the stale limit the network is tried first, but old data beats none"""
+        self.cache.get("weather:1,2", "weather", CountingFetch())
+        self.clock.now += CACHE_MAX_STALE["weather"] + 1
+
+        offline = CountingFetch(fail=True)
+        data, age = self.cache.get("weather:1,2", "weather", offline)
+        self.assertEqual((data, offline.calls), ({"response": 1}, 1))
+        self.assertEqual(age, CACHE_MAX_STALE["weather"] + 1)
+
+        with self.assertRaises(ConnectionError):
+            self.cache.get("weather:3,4", "weather", offline)
+        with self.assertRaises(LookupError):
+            self.cache.get("weather:3,4", "weather", offline, cached_only=True)
+
+    def test_cache_survives_reload(self):
+        """Responses are persisted and reloaded from the cache file"""
+        self.cache.get("weather:1,2", "weather", CountingFetch())
+        reloaded = WeatherCache(self.cache.cache_file, clock=self.clock)
+        self.assertEqual(reloaded.get("weather:1,2", "weather", CountingFetch(fail=True)), ({"response": 1}, 0.0))
+
+
+PLACES = {
+    "london": {"lat": 51.5073, "lon": -0.1277, "name": "London", "country": "GB", "state": ""},
+    "paris": {"lat": 48.8589, "lon": 2.32, "name": "Paris", "country": "FR", "state": ""},
+}
+
+
+class FakeResolver:
+    """LocationResolver that knows a fixed set of places"""
+
+    def lookup(self, name):
+        return PLACES.get(normalize_location(name))
+
+    def resolve(self, name, api_key, session, timeout, rate_limiter=None):
+        place = self.lookup(name)
+        if place is None:
+            raise LocationNotFoundError(name)
+        return place
+
+
+def weather_payload(temp):
+    return {
+        "main": {"temp": temp, "humidity": 80},
+        "weather": [{"main": "Clouds", "description": "broken clouds", "icon": "04d"}],
+        "wind": {"speed": 4.1},
+    }
+
+
+def forecast_payload(rain):
+    """Two days of slots starting with the one in progress; optionally rain in the third"""
+    start = int(time.time()) // SLOT_SECONDS * SLOT_SECONDS
+    items = []
+    for index in range(16):
+        item = {
+            "dt": start + index * SLOT_SECONDS,
+            "main": {"temp": 10 + index % 4},
+            "weather": [{"id": 803, "description": "broken clouds"}],
+        }
+        if rain and index == 2:
+            item["rain"] = {"3h": 0.6}
+        items.append(item)
+    return {"list": items, "city": {"timezone": 0}}
+
+
+class WeatherServiceTests(unittest.TestCase):
+    """Bundled current weather and forecast over a stubbed API"""
+
+    def setUp(self):
+        patcher = patch.object(WeatherService, '__init__', return_value=None)
+        patcher.start()
+        self.service = WeatherService()
+        patcher.stop()
+
+        self.service.api_key = "test-key"
+        self.service.location = "London"
+        self.service.locations = {}
+        self.service.cache = WeatherCache(os.path.join(tempfile.mkdtemp(), "weather_cache.json"))
+        self.service.resolver = FakeResolver()
+        self.service.rate_limiter = ApiRateLimiter(state_file=None)
+        self.service._forecast_tables = {}
+
+        self.fetches = []
+        self.fetch_lock = threading.Lock()
+        self.barrier = None
+        self.service._fetch = self.fake_fetch
+
+    def fake_fetch(self, endpoint, place):
+        with self.fetch_lock:
+            self.fetches.append((endpoint, place["name"]))
+        if self.barrier is not None:
+            self.barrier.wait()
+        if endpoint == "weather":
+            return weather_payload(12.4 if place["name"] == "London" else 17.0)
+        return forecast_payload(rain=place["name"] == "London")
+
+    def test_bundle_fetches_both_endpoints_concurrently(self):
+        """Current weather and forecast are requested in parallel, then served from the cache"""
+        # Each fetch waits for the other one, so this only passes if both are in flight together
+        self.barrier = threading.Barrier(2, timeout=2)
+        bundle = self.service.get_weather_bundle()
+        self.barrier = None
+
+        self.assertTrue(bundle["success"])
+        self.assertEqual((bundle["location"], bundle["temperature"]), ("London", 12))
+        self.assertTrue(bundle["forecast"]["success"])
+        self.assertTrue(bundle["forecast"]["rain_expected"])
+        self.assertEqual(sorted(self.fetches), [("forecast", "London"), ("weather", "London")])
+
+        self.assertEqual(self.service.get_weather_bundle()["temperature"], 12)
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_cached_only_bundle_never_fetches(self):
+        bundle = self.service.get_weather_bundle(cached_only=True)
+        self.assertFalse(bundle["success"])
+        self.assertFalse(bundle["forecast"]["success"])
+        self.assertEqual(self.fetches, [])
+
+    def test_bundles_for_several_locations(self):
+        """Every location is fetched together and reported in order, failures included"""
+        # Four fetches at once: weather and forecast for both known places
+        self.barrier = threading.Barrier(4, timeout=2)
+        result = self.service.get_weather_bundles(["Paris", "Atlantis", "London"])
+        self.barrier = None
+
+        self.assertTrue(result["success"])
+        bundles = result["locations"]
+        self.assertEqual([bundle["location"] for bundle in bundles], ["Paris", "Atlantis", "London"])
+        self.assertEqual([bundle["success"] for bundle in bundles], [True, False, True])
+        self.assertEqual(bundles[0]["temperature"], 17)
+        self.assertEqual(len(self.fetches), 4)
+        self.assertEqual(result["summary"],
+                         "Paris: 17 degrees with broken clouds. Atlantis: weather unavailable. "
+                         "London: 12 degrees with broken clouds, rain expected later.")
+
+    def test_bundles_default_to_named_locations(self):
+        self.service.locations = {"Home": "London", "Work": "Paris"}
+        result = self.service.get_weather_bundles()
+        self.assertEqual([bundle["location"] for bundle in result["locations"]], ["London", "Paris"])
+
+        self.service.api_key = ""
+        result = self.service.get_weather_bundles()
+        self.assertFalse(result["success"])
+        self.assertEqual([bundle["location"] for bundle in result["locations"]], ["London", "Paris"])
+
+
+if __name__ == '__main__':
+    unittest.main()
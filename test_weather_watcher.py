@@ -0,0 +1,98 @@
+# test_weather_watcher.py - Tests for change-only weather alerts
+
+import unittest
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.forecast import ForecastTable, SLOT_SECONDS
+from assistant.weather_watcher import WeatherWatcher
+
+
+def forecast_table(rain_slot=None, low=10, high=14):
+    """A day of slots from the current one on, temperatures between low and high"""
+    start = int(time.time()) // SLOT_SECONDS * SLOT_SECONDS
+    items = []
+    for index in range(9):
+        item = {
+            "dt": start + index * SLOT_SECONDS,
+            "main": {"temp": low if index % 2 else high},
+            "weather": [{"id": 803, "description": "broken clouds"}],
+        }
+        if index == rain_slot:
+            item["rain"] = {"3h": 1.0}
+        items.append(item)
+    return ForecastTable.from_payload({"list": items, "city": {"timezone": 0}})
+
+
+class FakeWeatherService:
+    def __init__(self):
+        self.table = forecast_table()
+
+    def get_forecast_table(self):
+        return self.table
+
+
+class WeatherWatcherTests(unittest.TestCase):
+    """Alerts are sent on state transitions, never repeated while nothing changes"""
+
+    def setUp(self):
+        self.service = FakeWeatherService()
+        self.spoken = []
+        self.heard = []
+        self.watcher = WeatherWatcher(self.service, rain_within_hours=3, temp_swing=8, notify=self.spoken.append)
+        self.watcher.add_listener(self.heard.append)
+
+    def test_quiet_forecast_sends_nothing(self):
+        self.assertEqual(self.watcher.check(), [])
+        self.assertEqual(self.watcher.check(), [])
+        self.assertEqual(self.spoken, [])
+
+    def test_rain_arriving_and_clearing(self):
+        self.watcher.check()
+
+        self.service.table = forecast_table(rain_slot=1)
+        messages = self.watcher.check()
+        self.assertEqual(len(messages), 1)
+        self.assertTrue(messages[0].startswith("Heads up: rain is expected"))
+        self.assertEqual(self.watcher.check(), [])  # Still raining, already announced
+
+        self.service.table = forecast_table()
+        self.assertEqual(self.watcher.check(), ["The rain expected earlier is no longer in the forecast."])
+        self.assertEqual(len(self.spoken), 2)
+        self.assertEqual(self.heard, self.spoken)
+
+    def test_first_poll_only_sets_the_baseline(self):
+        """Rain or a swing already forecast at startup is not announced as a change"""
+        self.service.table = forecast_table(rain_slot=1, low=2, high=15)
+        self.assertEqual(self.watcher.check(), [])
+        self.assertEqual(self.watcher.check(), [])
+        self.assertEqual(self.spoken, [])
+
+        self.service.table = forecast_table(low=2, high=15)
+        self.assertEqual(self.watcher.check(), ["The rain expected earlier is no longer in the forecast."])
+
+    def test_rain_beyond_the_alert_window_is_ignored(self):
+        self.watcher.check()
+        self.service.table = forecast_table(rain_slot=4)  # 12 hours out
+        self.assertEqual(self.watcher.check(), [])
+
+    def test_temperature_swing(self):
+        self.watcher.check()
+
+        self.service.table = forecast_table(low=2, high=15)
+        self.assertEqual(self.watcher.check(),
+                         ["Temperatures will swing between 2 and 15 degrees Celsius over the next day."])
+        self.assertEqual(self.watcher.check(), [])
+
+        # A whole-day shift without a new swing is reported as a forecast change
+        self.service.table = forecast_table(low=12, high=25)
+        self.assertEqual(self.watcher.check(),
+                         ["The forecast changed: expect 12 to 25 degrees Celsius over the next day."])
+
+
+if __name__ == '__main__':
+    unittest.main()
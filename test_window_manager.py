@@ -0,0 +1,64 @@
+# test_window_manager.py - Tests for the cached window manager using the fake backend
+
+import unittest
+import sys
+import os
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from assistant.window_manager import WindowManager, FakeWindowBackend
+
+
+class WindowManagerTests(unittest.TestCase):
+    """Window lookup, focusing and cache refresh behaviour"""
+
+    def setUp(self):
+        """Create a manager over a fake backend with a few windows"""
+        self.backend = FakeWindowBackend()
+        self.backend.add_window(1, "Untitled - Notepad", pid=100, process="notepad.exe")
+        self.backend.add_window(2, "main.py - Visual Studio Code", pid=200, process="Code.exe")
+        self.backend.add_window(3, "", pid=200, process="Code.exe")
+        self.manager = WindowManager(self.backend, ttl=60)
+
+    def test_find_window_by_process(self):
+        """Process lookups ignore case and the .exe suffix and prefer titled windows"""
+        win = self.manager.find_window(process="code")
+        self.assertEqual(win["handle"], 2)
+
+    def test_find_window_by_title(self):
+        """Title lookups match normalized substrings"""
+        win = self.manager.find_window(title="visual  studio CODE")
+        self.assertEqual(win["handle"], 2)
+        self.assertIsNone(self.manager.find_window(title="spotify"))
+
+    def test_lookups_use_cached_list(self):
+        """Repeated lookups within the TTL enumerate windows only once"""
+        for _ in range(10):
+            self.manager.find_window(title="notepad")
+        self.assertEqual(self.backend.list_calls, 1)
+
+    def test_focus(self):
+        """Focusing an open application goes straight to the backend"""
+        self.assertTrue(self.manager.focus(title="Notepad", process="notepad"))
+        self.assertEqual(self.backend.focused, [1])
+        self.assertFalse(self.manager.focus(title="spotify"))
+
+    def test_background_refresh_on_change(self):
+        """The background thread picks up new windows when the backend reports a change"""
+        self.manager.start()
+        try:
+            self.manager.find_window(title="notepad")
+            self.backend.add_window(4, "Spotify Premium", pid=300, process="spotify.exe")
+
+            deadline = time.time() + 2
+            while time.time() < deadline and not self.manager.find_window(process="spotify"):
+                time.sleep(0.01)
+            self.assertEqual(self.manager.find_window(process="spotify")["handle"], 4)
+        finally:
+            self.manager.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()